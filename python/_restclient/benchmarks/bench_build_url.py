@@ -0,0 +1,73 @@
+"""
+URL building benchmark
+
+Compares building quoted USGS IV service urls with `(Url(url) + parameters).quote_url`,
+the previous `RestClient.build_url` implementation, against `UrlTemplate`, which
+`RestClient.build_url` now uses. "distinct" builds a url for each of `--n-urls` site
+parameter sets, "repeated" cycles over 100 parameter sets.
+
+Usage:
+    python benchmarks/bench_build_url.py [--n-urls 10000] [--repeat 3]
+"""
+import argparse
+import timeit
+
+from hydrotools._restclient import Url, UrlTemplate
+
+BASE_URL = Url(
+    "https://waterservices.usgs.gov/nwis/iv/",
+    safe="/:",
+    quote_overide_map={"+": "%2B"},
+)
+
+
+def parameter_sets(n: int):
+    return [
+        {
+            "format": "json",
+            "parameterCd": "00060",
+            "siteStatus": "active",
+            "sites": [f"{site:08d}" for site in range(idx, idx + 10)],
+            "startDT": "2021-01-01T00:00+0000",
+            "endDT": "2021-02-01T00:00+0000",
+        }
+        for idx in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-urls", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    distinct = parameter_sets(args.n_urls)
+    repeated = [distinct[idx % 100] for idx in range(args.n_urls)]
+
+    def url(parameters):
+        return [(Url(BASE_URL) + p).quote_url for p in parameters]
+
+    def template(parameters):
+        # new template per run, so "distinct" does not benefit from a warm cache
+        t = UrlTemplate(BASE_URL)
+        return [t.quote_url(p) for p in parameters]
+
+    assert url(distinct[:100]) == template(distinct[:100])
+
+    print(f"{args.n_urls} urls, best of {args.repeat}")
+    for name, parameters in (("distinct", distinct), ("repeated", repeated)):
+        baseline = None
+        for impl in (url, template):
+            seconds = min(
+                timeit.repeat(lambda: impl(parameters), number=1, repeat=args.repeat)
+            )
+            baseline = baseline or seconds
+            label = f"{name} {'Url' if impl is url else 'UrlTemplate'}"
+            print(
+                f"{label:>20}: {seconds * 1e3:8.1f} ms "
+                f"({seconds / args.n_urls * 1e6:5.1f} us/url, {baseline / seconds:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Hedged request benchmark
+
+Serves requests from a local server whose latencies have a heavy tail: a
+`--tail-fraction` of requests take `--tail` seconds, the rest take `--median`
+seconds. Times `AsyncRestClient.mget` batches of `--n-requests` requests without
+hedging and with a `HedgePolicy`, after a warm up batch that measures host latency.
+Reports wall clock time per batch and the number of extra (hedge) requests sent.
+Latencies are drawn from a generator seeded with `--seed` for each policy, so both
+policies see the same latency samples.
+
+Usage:
+    python benchmarks/bench_hedging.py [--n-requests 200] [--median 0.05]
+        [--tail 2.0] [--tail-fraction 0.03] [--percentile 95] [--max-hedge-ratio 0.1]
+        [--repeat 3] [--seed 0]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from aiohttp import web
+
+from hydrotools._restclient import AsyncRestClient, HedgePolicy
+
+
+async def start_server(args):
+    # "rng" is reseeded for each policy, so that policies are compared on the same
+    # latency samples
+    counts = {"requests": 0, "rng": random.Random(args.seed)}
+
+    async def handler(request):
+        counts["requests"] += 1
+        rng = counts["rng"]
+        if rng.random() < args.tail_fraction:
+            await asyncio.sleep(args.tail)
+        else:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.median)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/", counts
+
+
+async def run(args):
+    runner, url, counts = await start_server(args)
+    parameters = [{"id": idx} for idx in range(args.n_requests)]
+
+    print(f"{'policy':>8} {'batch (s)':>10} {'sent':>6} {'hedged':>7} {'won':>5}")
+    try:
+        for name in ["none", "hedged"]:
+            counts["rng"] = random.Random(args.seed)
+            policy = None
+            if name == "hedged":
+                policy = HedgePolicy(
+                    percentile=args.percentile, max_hedge_ratio=args.max_hedge_ratio
+                )
+
+            async with AsyncRestClient(
+                enable_cache=False, hedge_policy=policy
+            ) as client:
+                # warm up, measures host latency
+                await client.mget(url, parameters=parameters)
+
+                for _ in range(args.repeat):
+                    sent = counts["requests"]
+                    before = client.hedge_stats
+                    start = time.perf_counter()
+                    await client.mget(url, parameters=parameters)
+                    elapsed = time.perf_counter() - start
+
+                    after = client.hedge_stats
+                    hedged = won = 0
+                    if after is not None:
+                        hedged = after.hedged - before.hedged
+                        won = after.hedge_wins - before.hedge_wins
+                    print(
+                        f"{name:>8} {elapsed:10.3f} {counts['requests'] - sent:6d} "
+                        f"{hedged:7d} {won:5d}"
+                    )
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-requests", type=int, default=200)
+    parser.add_argument("--median", type=float, default=0.05)
+    parser.add_argument("--tail", type=float, default=2.0)
+    parser.add_argument("--tail-fraction", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    parser.add_argument("--max-hedge-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Query normalization cache hit rate benchmark
+
+Replays a stream of request urls against an empty, unbounded cache and reports the
+cache hit rate with and without `QueryNormalizer`, along with the per request cost
+of normalization. Urls are read from a recorded `HTTPArchive` (`--archive`) or from
+a log of urls, one per line (`--urls`). Without either, a synthetic stream of USGS IV
+queries is generated in which `--n-unique` logical queries are each requested
+`--n-requests / --n-unique` times with shuffled site and parameter code lists and
+randomly cased `siteStatus` values, as issued by independent callers.
+
+Usage:
+    python benchmarks/bench_query_normalization.py [--archive PATH | --urls FILE]
+        [--n-requests 10000] [--n-unique 500] [--repeat 3] [--seed 0]
+"""
+import argparse
+import random
+import timeit
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from hydrotools._restclient import (
+    HTTPArchive,
+    QueryNormalizer,
+    measure_normalization,
+)
+
+BASE_URL = "https://waterservices.usgs.gov/nwis/iv/"
+
+# same rules as hydrotools.nwis_client.iv.IV_QUERY_NORMALIZER
+NORMALIZER = QueryNormalizer(
+    unordered=["sites", "parameterCd", "huc", "countyCd"],
+    lowercase=["siteStatus"],
+)
+
+
+def synthetic_urls(n_requests: int, n_unique: int, rng: random.Random):
+    queries = [
+        (
+            [f"{site:08d}" for site in rng.sample(range(1000000), 10)],
+            rng.sample(["00060", "00065", "00010"], rng.randint(1, 3)),
+        )
+        for _ in range(n_unique)
+    ]
+
+    urls = []
+    for idx in range(n_requests):
+        sites, parameter_codes = queries[idx % n_unique]
+        sites = rng.sample(sites, len(sites))
+        parameter_codes = rng.sample(parameter_codes, len(parameter_codes))
+        query = {
+            "format": "json",
+            "parameterCd": ",".join(parameter_codes),
+            "siteStatus": rng.choice(["all", "ALL", "All"]),
+            "sites": ",".join(sites),
+        }
+        urls.append(f"{BASE_URL}?{urlencode(query)}")
+    rng.shuffle(urls)
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--archive", help="HTTPArchive directory")
+    source.add_argument("--urls", help="file of request urls, one per line")
+    parser.add_argument("--n-requests", type=int, default=10000)
+    parser.add_argument("--n-unique", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.archive:
+        urls = [url for _, url in HTTPArchive(args.archive)]
+        source = f"archive {args.archive}"
+    elif args.urls:
+        with open(args.urls) as f:
+            urls = [line.strip() for line in f if line.strip()]
+        source = f"url log {args.urls}"
+    else:
+        urls = synthetic_urls(args.n_requests, args.n_unique, random.Random(args.seed))
+        source = f"synthetic, {args.n_unique} logical queries"
+
+    report = measure_normalization(urls, NORMALIZER)
+    print(f"{report.requests} requests ({source})")
+    print(f"{'unique keys':>22}: {report.unique_keys:8d}")
+    print(f"{'normalized unique keys':>22}: {report.normalized_unique_keys:8d}")
+    print(f"{'hit rate':>22}: {report.hit_rate:8.1%}")
+    print(f"{'normalized hit rate':>22}: {report.normalized_hit_rate:8.1%}")
+
+    queries = [dict(parse_qsl(urlsplit(url).query)) for url in urls[:1000]]
+    seconds = min(
+        timeit.repeat(
+            lambda: [NORMALIZER(q) for q in queries], number=1, repeat=args.repeat
+        )
+    )
+    print(f"{'normalization cost':>22}: {seconds / len(queries) * 1e6:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
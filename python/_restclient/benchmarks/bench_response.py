@@ -0,0 +1,97 @@
+"""
+Response construction benchmark
+
+Compares the per-response cost of the previous `RestClient` response path, which
+cast each `CachedResponse` to an `aiohttp.ClientResponse` and re-signed its `text`
+and `json` coroutine wrappers with `forge`, against constructing a
+`hydrotools._restclient.Response`.
+
+Usage:
+    python benchmarks/bench_response.py [--n-responses 500] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import timeit
+
+import aiohttp
+import forge
+from aiohttp_client_cache.response import CachedResponse
+
+from hydrotools._restclient import Response
+from hydrotools._restclient._async_helpers import wrap_coro_in_callable
+from hydrotools._restclient.async_restclient import cached_response_to_client_response
+
+
+def cached_responses(n: int):
+    body = json.dumps({"value": {"timeSeries": [{"values": list(range(100))}]}})
+    return [
+        CachedResponse(
+            method="GET",
+            reason="OK",
+            status=200,
+            url=f"https://waterservices.usgs.gov/nwis/iv/?sites={idx}",
+            version="1.1",
+            body=body.encode(),
+            raw_headers=((b"Content-Type", b"application/json"),),
+        )
+        for idx in range(n)
+    ]
+
+
+def legacy(responses, loop):
+    """Previous path: ClientResponse construction and forge re-signing"""
+    out = []
+    for cached in responses:
+        resp = cached_response_to_client_response(cached, loop=loop)
+        text = wrap_coro_in_callable(resp.text)
+        json_ = wrap_coro_in_callable(resp.json)
+        resp.text = forge.copy(aiohttp.ClientResponse.text, exclude="self")(text)
+        resp.json = forge.copy(aiohttp.ClientResponse.json, exclude="self")(json_)
+        out.append(resp)
+    return out
+
+
+def slotted(responses):
+    """Current path: slotted Response"""
+    return [
+        Response(
+            cached.status,
+            cached._body,
+            headers=cached.headers,
+            reason=cached.reason,
+            url=str(cached.url),
+            method=cached.method,
+            from_cache=True,
+        )
+        for cached in responses
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-responses", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    responses = cached_responses(args.n_responses)
+
+    results = {
+        "ClientResponse + forge": min(
+            timeit.repeat(lambda: legacy(responses, loop), number=1, repeat=args.repeat)
+        ),
+        "Response": min(
+            timeit.repeat(lambda: slotted(responses), number=1, repeat=args.repeat)
+        ),
+    }
+    loop.close()
+
+    print(f"{args.n_responses} responses, best of {args.repeat}")
+    for name, seconds in results.items():
+        per_response = seconds / args.n_responses * 1e6
+        print(f"{name:>24}: {seconds * 1e3:8.2f} ms ({per_response:6.1f} us/response)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Concurrent writer cache benchmark
+
+Starts `--writers` processes that share one cache directory, as cron jobs or pool
+workers pointed at the same cache do. Each process writes `--n-writes` responses of
+`--body-bytes` bytes and reads each one back. The shared cache is either a single
+`BoundedSQLiteBackend` database or a `ShardedSQLiteBackend`. Reports aggregate
+operations per second and the number of operations that failed with "database is
+locked".
+
+Usage:
+    python benchmarks/bench_sharded_cache.py [--writers 8 16 32] [--n-writes 200]
+        [--body-bytes 20000] [--n-shards 16] [--batch-size 64] [--dir PATH]
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+from pathlib import Path
+import sqlite3
+import tempfile
+import time
+
+from aiohttp_client_cache.response import CachedResponse
+
+from hydrotools._restclient import BoundedSQLiteBackend, ShardedSQLiteBackend
+
+
+def make_backend(kind: str, path: Path, args):
+    if kind == "sqlite":
+        return BoundedSQLiteBackend(str(path / "cache.sqlite"))
+    return ShardedSQLiteBackend(
+        path / "cache", n_shards=args.n_shards, batch_size=args.batch_size
+    )
+
+
+async def work(kind: str, path: Path, worker: int, args):
+    backend = make_backend(kind, path, args)
+    body = b"x" * args.body_bytes
+    ops = errors = 0
+    keys = [f"{worker:08x}{idx:056x}" for idx in range(args.n_writes)]
+
+    for key in keys:
+        response = CachedResponse(
+            method="GET", reason="OK", status=200, url="http://test", version="1.1", body=body
+        )
+        try:
+            await backend.responses.write(key, response)
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+
+    for key in keys:
+        try:
+            await backend.responses.read(key)
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+
+    try:
+        await backend.close()
+    except sqlite3.OperationalError:
+        errors += 1
+    return ops, errors
+
+
+async def create(kind: str, path: Path, args):
+    backend = make_backend(kind, path, args)
+    await backend.responses.size()
+    await backend.close()
+
+
+def worker_main(kind, path, worker, args, barrier, results):
+    barrier.wait()
+    results.put(asyncio.run(work(kind, path, worker, args)))
+
+
+def run(kind: str, n_writers: int, args):
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = Path(tmp)
+        # create databases before timing
+        asyncio.run(create(kind, path, args))
+
+        barrier = mp.Barrier(n_writers + 1)
+        results = mp.Queue()
+        processes = [
+            mp.Process(target=worker_main, args=(kind, path, idx, args, barrier, results))
+            for idx in range(n_writers)
+        ]
+        for p in processes:
+            p.start()
+
+        barrier.wait()
+        start = time.perf_counter()
+        outcomes = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - start
+        for p in processes:
+            p.join()
+
+    ops = sum(o for o, _ in outcomes)
+    errors = sum(e for _, e in outcomes)
+    return ops / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--n-writes", type=int, default=200)
+    parser.add_argument("--body-bytes", type=int, default=20000)
+    parser.add_argument("--n-shards", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--dir", help="directory for temporary caches")
+    args = parser.parse_args()
+    if args.dir is not None:
+        Path(args.dir).mkdir(parents=True, exist_ok=True)
+
+    print(f"{'writers':>8} {'backend':>8} {'ops/s':>10} {'locked':>8}")
+    for n_writers in args.writers:
+        for kind in ["sqlite", "sharded"]:
+            rate, errors = run(kind, n_writers, args)
+            print(f"{n_writers:8d} {kind:>8} {rate:10.0f} {errors:8d}")
+
+
+if __name__ == "__main__":
+    main()
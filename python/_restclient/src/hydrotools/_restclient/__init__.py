@@ -2,7 +2,43 @@
 from ._version import __version__
 
 from ._restclient import RestClient
+from .async_restclient import AsyncRestClient, RequestStats
 from .utilities import Alias, AliasGroup
-from .urllib import Url, Variadic
+from .urllib import Url, UrlTemplate, Variadic, compile_url
 from .urllib_types import Quote
 from .async_client import ClientSession
+from .scheduler import RequestScheduler, SchedulerStats
+from .cache_backends import (
+    BODY_CODECS,
+    BoundedCacheBackend,
+    BoundedSQLiteBackend,
+    CacheStats,
+    CompressedCachedResponse,
+    MemoryLRUBackend,
+    RecompressReport,
+    ShardedFileBackend,
+    ShardedSQLiteBackend,
+)
+from .response import JSONDecoder, Response, SpilledBody, get_json_decoder
+from .retry import CircuitOpenError, RetryPolicy, RetryStats
+from .instrumentation import (
+    Instrumentation,
+    LatencySummary,
+    RequestTrace,
+    TraceSink,
+    TraceStats,
+)
+from .replay import ArchiveMissError, ArchivedResponse, HTTPArchive
+from .connection_pool import ConnectionPool, PoolStats
+from .rate_limit import RateLimiter, RateLimitStats, TokenBucket
+from .query_normalizer import (
+    NormalizationReport,
+    QueryNormalizer,
+    QueryNormalizerType,
+    measure_normalization,
+)
+from .results import MGetCheckpoint, MGetError, MGetResults
+from .memory_budget import MemoryBudget, MemoryBudgetStats
+from .hedging import HedgePolicy, HedgeStats
+from .timeouts import TimeoutPolicy
+from .prefetch import PREFETCH_PRIORITY, Prefetch, PrefetchProgress
@@ -1,5 +1,6 @@
 import asyncio
-from typing import Callable, Coroutine
+import threading
+from typing import Any, Callable, Coroutine, Optional
 from functools import partial, wraps
 
 
@@ -30,6 +31,75 @@ def add_to_loop(coro: Coroutine):
             raise ModuleNotFoundError(error_message) from e
 
 
+class EventLoopThread:
+    """Event loop running in a dedicated daemon thread. Coroutines are submitted from
+    any thread with `EventLoopThread.run`, which blocks the calling thread until the
+    coroutine completes. Unlike `add_to_loop`, this is safe to call from multiple
+    threads at once and from within a running event loop, without `nest_asyncio`.
+
+    Parameters
+    ----------
+    name: str, default "EventLoopThread"
+        Thread name
+    """
+
+    def __init__(self, name: str = "EventLoopThread") -> None:
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self._loop.is_closed()
+
+    def in_thread(self) -> bool:
+        """True if called from the event loop's thread"""
+        return threading.current_thread() is self._thread
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run coro in the event loop thread and return its result. If the calling
+        thread stops waiting (e.g. KeyboardInterrupt or timeout), coro is cancelled."""
+        if self.in_thread():
+            coro.close()
+            raise RuntimeError("EventLoopThread.run called from the event loop thread")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def submit(self, coro: Coroutine) -> None:
+        """Schedule coro in the event loop thread without waiting for it"""
+        asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self) -> None:
+        """Stop and close the event loop. Unless called from the event loop thread,
+        waits for the thread to exit."""
+        if not self.running:
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if not self.in_thread():
+            self._thread.join()
+
+
 def wrap_func_in_coro(func: Callable, *args, **kwargs):
     """Create partial func; wrap and call partial in coro; return coro"""
     part = partial(func, *args, **kwargs)
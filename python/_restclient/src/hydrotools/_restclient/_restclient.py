@@ -1,21 +1,41 @@
-from aiohttp.client_reqrep import ClientResponse
-from aiohttp_client_cache.response import CachedResponse
-from aiohttp_client_cache import SQLiteBackend
-import aiohttp
-import forge
-from functools import reduce
+from aiohttp_client_cache import CacheBackend
+from pathlib import Path
 
 # Type hints
-from typing import Any, Dict, List, Union
-import pandas as pd
-import numpy as np
+from typing import Dict, List, Optional, Union
 import asyncio
 
 # local imports
 from .async_client import ClientSession
-from ._async_helpers import add_to_loop, wrap_coro_in_callable, wrap_func_in_coro
+from ._async_helpers import EventLoopThread, add_to_loop
+# cached_response_to_client_response imported for backwards compatibility
+from .async_restclient import (
+    AsyncRestClient,
+    RequestStats,
+    cached_response_to_client_response,
+)
 from .urllib import PRIMITIVE, Url
-from ._restclient_sigs import GET_SIGNATURE, MGET_SIGNATURE
+from ._restclient_sigs import (
+    GET_SIGNATURE,
+    MGET_SIGNATURE,
+    MGET_RESULTS_SIGNATURE,
+    ITER_MGET_SIGNATURE,
+    PREFETCH_SIGNATURE,
+)
+from .scheduler import SchedulerStats
+from .cache_backends import CacheStats
+from .retry import RetryPolicy, RetryStats
+from .response import JSONDecoder, Response
+from .instrumentation import Instrumentation, TraceStats
+from .replay import HTTPArchive
+from .connection_pool import ConnectionPool, PoolStats
+from .rate_limit import RateLimiter, RateLimitStats
+from .query_normalizer import QueryNormalizerType
+from .results import MGetResults
+from .memory_budget import MemoryBudget, MemoryBudgetStats
+from .hedging import HedgePolicy, HedgeStats
+from .timeouts import TimeoutPolicy
+from .prefetch import Prefetch, PrefetchProgress
 
 __all__ = ["RestClient"]
 
@@ -24,14 +44,42 @@ class RestClient:
     """
     Class that simplifies writing RESTful client libraries and retrieval scripts. Behind
     the scenes requests are made asynchronously, however the API is exposed using serial
-    methods to simplify usage.
+    methods to simplify usage. `RestClient` is a synchronous wrapper around
+    `AsyncRestClient`; use `AsyncRestClient` directly from within a running event loop.
+
+    By default, requests run in the calling thread's event loop. With
+    `background_loop=True`, the client runs its own event loop in a dedicated thread
+    and request methods submit to it, so a single client, and its connection pool and
+    cache, can be shared by many threads (e.g. `concurrent.futures.ThreadPoolExecutor`
+    workers or web server request threads) and used from within running event loops
+    without `nest_asyncio`.
 
     Features
 
     - Base url
-    - SQLite request cache
-    - Retry exponential backoff
+    - Size bounded request cache with pluggable backends (see `cache_backends`)
+    - Expired cache entries revalidated using ETag / Last-Modified conditional requests
+    - Retries with jittered exponential backoff and optional per host circuit breakers
+    - Bounded, per host request concurrency with a priority request queue
     - Serial wrapper methods that make requests asynchronously (see `RestClient.mget`)
+    - Opt-in request timing and size instrumentation (see `Instrumentation`)
+    - Record / replay of HTTP exchanges for offline runs (see `HTTPArchive`)
+    - Connection pools shareable across clients (see `ConnectionPool`)
+    - Per host token bucket rate limits, optionally adapting to 429 responses (see
+      `RateLimiter`)
+    - Query parameter normalization, so equivalent queries share cache entries (see
+      `QueryNormalizer`)
+    - Streaming batch requests that yield responses as they complete (see
+      `RestClient.iter_mget`)
+    - Batch requests tolerant of partial failure, with retries of failed requests
+      and resumable checkpoints (see `RestClient.mget_results`)
+    - Memory budget for batch requests, so large backfills run in bounded memory
+      (see `MemoryBudget`)
+    - Hedged requests that cut tail latency by duplicating slow requests (see
+      `HedgePolicy`)
+    - Connect, read, per request, and batch time limits (see `TimeoutPolicy`)
+    - Background, low priority cache warm up (see `RestClient.prefetch`)
+    - Coalescing of concurrent, identical requests into a single request
 
     Parameters
     ----------
@@ -45,12 +93,90 @@ class RestClient:
         Cache filename with .sqlite filetype suffix
     cache_expire_after: int, default 43200
         Cached request life in seconds
+    cache_max_bytes: int, optional, default None
+        Maximum size of the default SQLite cache in bytes. Expired, then least
+        recently used, responses are evicted when exceeded. None is unlimited.
+    cache_compression: str, optional, default None
+        Compress response bodies stored in the default SQLite cache using "zlib",
+        "bz2", "lzma", or "zstd" (requires `zstandard`). None stores bodies
+        uncompressed. Existing caches are readable either way, see
+        `BoundedCacheBackend.recompress` to convert them.
+    cache_compression_level: int, optional, default None
+        Compression level. None is the codec's default.
+    cache_backend: aiohttp_client_cache.CacheBackend, optional, default None
+        Cache backend used instead of the default SQLite cache (e.g.
+        `MemoryLRUBackend`, `ShardedFileBackend`). When provided, `cache_filename`,
+        `cache_expire_after`, `cache_max_bytes`, and `cache_compression` are ignored.
     retry: bool, default True
         Enable exponential backoff
     n_retries: int, default 3
-        Attempt retries n times before failing
+        Attempt retries n times before failing. Ignored if `retry_policy` is provided.
+    retry_policy: RetryPolicy, optional, default None
+        Retryable statuses and exceptions, backoff, deadline, `Retry-After` handling,
+        and per host circuit breaker settings. Defaults to
+        `RetryPolicy(n_retries=n_retries)`. See `RestClient.retry_stats`.
+    max_in_flight: int, default 100
+        Maximum number of simultaneous requests. Requests beyond this limit wait in a
+        priority queue (see `RestClient.scheduler_stats`). Requests answered from the
+        cache do not count, and requests waiting to be retried give up their place.
+    max_in_flight_per_host: int, optional, default None
+        Maximum number of simultaneous requests to a single host. None is unlimited.
+    json_decoder: str or Callable[[bytes], Any], optional, default None
+        Decoder used by `Response.json`. "stdlib", "orjson" (requires `orjson`), or a
+        callable that deserializes json from bytes. None is "stdlib".
+    coalesce_requests: bool, default True
+        Concurrent requests with identical urls, headers, and keyword arguments share
+        a single in-flight request and `Response`. See `RestClient.request_stats`.
+    instrumentation: Instrumentation, optional, default None
+        Record per request timings, sizes, cache origin, and retries. An
+        `Instrumentation` may be shared by multiple clients. See
+        `RestClient.trace_stats`.
+    archive: HTTPArchive, optional, default None
+        In record mode, write each response to the archive. In replay mode, serve
+        responses from the archive without network access. Disable caching when
+        recording, otherwise cached responses are recorded with cache lookup
+        latencies.
+    connection_pool: ConnectionPool, optional, default None
+        Connection pool shared with other clients. Pool connection limits apply in
+        addition to `max_in_flight` and `max_in_flight_per_host`. Defaults to a pool
+        owned by this client, sized by `max_in_flight` and `max_in_flight_per_host`.
+        See `RestClient.pool_stats`.
+    rate_limiter: RateLimiter, optional, default None
+        Per host request rate limit. Requests wait for a token before they are sent.
+        Cached responses do not consume tokens. A `RateLimiter` may be shared by
+        multiple clients. See `RestClient.rate_limit_stats`.
+    query_normalizer: Callable[[Mapping[str, Any]], Dict[str, Any]], optional, default None
+        Canonicalizes request query parameters before the url is built, so that
+        equivalent queries share cache entries (e.g. `QueryNormalizer`). Applies to
+        requests not matched by a normalizer registered with
+        `RestClient.register_query_normalizer`.
+    spill_threshold: int, optional, default None
+        Response bodies larger than this many bytes are streamed to a temporary file
+        instead of being held in memory, see `Response.buffer` and `Response.open`.
+        None holds every body in memory.
+    spill_dir: str or pathlib.Path, optional, default None
+        Directory of spilled bodies. Defaults to the system temporary directory.
+    memory_budget: int or MemoryBudget, optional, default None
+        Bound, in bytes, on the response bodies held by outstanding requests and
+        responses not yet delivered by `RestClient.iter_mget`, `RestClient.mget`, and
+        `RestClient.mget_results`. Once reached, no new requests are sent until
+        delivered responses are consumed. Use `RestClient.iter_mget` to process
+        large batches in bounded memory, `RestClient.mget` retains every response.
+        Spilled bodies (see `spill_threshold`) are not counted. A `MemoryBudget` may
+        be shared by multiple clients. None is unbounded. See
+        `RestClient.memory_budget_stats`.
+    hedge_policy: HedgePolicy, optional, default None
+        Send a duplicate of requests slower than a per host latency percentile and
+        use the first response, cutting tail latency at the cost of bounded extra
+        load. None disables hedging. See `RestClient.hedge_stats`.
+    timeout_policy: TimeoutPolicy, optional, default None
+        Connect, socket read, and per request time limits, and the default deadline
+        of batch requests. Defaults to `TimeoutPolicy()`.
     loop: asyncio.AbstractEventLoop, default None
-        Async event loop
+        Async event loop. Cannot be combined with `background_loop`.
+    background_loop: bool, default False
+        Run requests in an event loop owned by the client, in a dedicated thread.
+        Request methods are thread safe. The thread is stopped by `RestClient.close`.
 
     Examples
     --------
@@ -63,6 +189,16 @@ class RestClient:
     >>> print(resp.text())
 
 
+    Thread safe client
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from hydrotools._restclient import RestClient
+    >>>
+    >>> client = RestClient(base_url="https://www.weather.gov", background_loop=True)
+    >>> with ThreadPoolExecutor(8) as pool:
+    ...     responses = list(pool.map(client.get, ["/", "/about", "/contact"]))
+    >>> client.close()
+
+
     USGS NLDI Requests
     >>> from hydrotools._restclient import RestClient
     >>>
@@ -84,34 +220,79 @@ class RestClient:
         enable_cache: bool = True,
         cache_filename: str = "cache",
         cache_expire_after: int = 43200,
+        cache_max_bytes: Optional[int] = None,
+        cache_compression: Optional[str] = None,
+        cache_compression_level: Optional[int] = None,
+        cache_backend: Optional[CacheBackend] = None,
         retry: bool = True,
         n_retries: int = 3,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_in_flight: int = 100,
+        max_in_flight_per_host: Optional[int] = None,
+        json_decoder: Union[str, JSONDecoder, None] = None,
+        coalesce_requests: bool = True,
+        instrumentation: Optional[Instrumentation] = None,
+        archive: Optional[HTTPArchive] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        query_normalizer: Optional[QueryNormalizerType] = None,
+        spill_threshold: Optional[int] = None,
+        spill_dir: Union[str, Path, None] = None,
+        memory_budget: Union[int, MemoryBudget, None] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout_policy: Optional[TimeoutPolicy] = None,
         loop: asyncio.AbstractEventLoop = None,
+        background_loop: bool = False,
     ):
-        self._loop = loop or asyncio.get_event_loop()
-        self._base_url = Url(base_url) if base_url is not None else None
-        self._headers = headers
-        self._retires = n_retries
-        self._cache_enabled = enable_cache
-
-        cache = None
-        if enable_cache is True:
-            cache = SQLiteBackend(
-                cache_name=cache_filename,
-                expire_after=cache_expire_after,
-                allowed_codes=[200],
-                allowed_methods=["GET"],
-            )
+        if background_loop and loop is not None:
+            raise ValueError("loop and background_loop are mutually exclusive")
+
+        # futures of outstanding prefetches
+        self._prefetches = set()
+
+        if background_loop:
+            self._loop_thread = EventLoopThread(name="RestClient")
+            self._loop = self._loop_thread.loop
+            self._run = self._loop_thread.run
+        else:
+            self._loop_thread = None
+            self._loop = loop or asyncio.get_event_loop()
+            self._run = add_to_loop
+
+        self._client = AsyncRestClient(
+            base_url=base_url,
+            headers=headers,
+            enable_cache=enable_cache,
+            cache_filename=cache_filename,
+            cache_expire_after=cache_expire_after,
+            cache_max_bytes=cache_max_bytes,
+            cache_compression=cache_compression,
+            cache_compression_level=cache_compression_level,
+            cache_backend=cache_backend,
+            retry=retry,
+            n_retries=n_retries,
+            retry_policy=retry_policy,
+            max_in_flight=max_in_flight,
+            max_in_flight_per_host=max_in_flight_per_host,
+            json_decoder=json_decoder,
+            coalesce_requests=coalesce_requests,
+            instrumentation=instrumentation,
+            archive=archive,
+            connection_pool=connection_pool,
+            rate_limiter=rate_limiter,
+            query_normalizer=query_normalizer,
+            spill_threshold=spill_threshold,
+            spill_dir=spill_dir,
+            memory_budget=memory_budget,
+            hedge_policy=hedge_policy,
+            timeout_policy=timeout_policy,
+        )
 
-        # wrap ClientSession in coroutine and call in event loop
-        self._session = add_to_loop(
-            wrap_func_in_coro(
-                ClientSession, cache=cache, retry=retry, n_retries=n_retries
-            )()
-        )  # type: ClientSession
+        # create ClientSession in event loop
+        self._run(self._client._ensure_session())
 
     @GET_SIGNATURE
-    def get(self, url, *, parameters, headers, **kwargs):
+    def get(self, url, *, parameters, headers, priority, **kwargs):
         """Make GET request. If base url is set, url is appended to the base url.
         Passed headers are given precedent over instance headers(if present), meaning
         passed headers replace instance headers with matching keys.
@@ -124,18 +305,22 @@ class RestClient:
             Query parameters
         headers : Dict[str, str]
             Request headers, if RestClient headers set provided headers are appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
 
         Returns
         -------
-        aiohttp.ClientResponse
+        Response
         """
 
-        return add_to_loop(
-            self._get(url, parameters=parameters, headers=headers, **kwargs)
+        return self._run(
+            self._client.get(
+                url, parameters=parameters, headers=headers, priority=priority, **kwargs
+            )
         )
 
     @MGET_SIGNATURE
-    def mget(self, urls, *, parameters, headers, **kwargs):
+    def mget(self, urls, *, parameters, headers, priority, batch_timeout, **kwargs):
         """Make multiple asynchronous GET requests. If base url is set, each url is
         appended to the base url. Passed headers are given precedent over instance
         headers(if present), meaning passed headers replace instance headers with
@@ -149,148 +334,405 @@ class RestClient:
             Query parameters
         headers : Dict[str, str]
             Request headers, if RestClient headers set provided headers are appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
 
         Returns
         -------
-        List[aiohttp.ClientResponse]
+        List[Response]
         """
-        return add_to_loop(
-            self._mget(urls, parameters=parameters, headers=headers, **kwargs)
+        return self._run(
+            self._client.mget(
+                urls,
+                parameters=parameters,
+                headers=headers,
+                priority=priority,
+                batch_timeout=batch_timeout,
+                **kwargs,
+            )
         )
 
-    @GET_SIGNATURE
-    async def _get(
-        self,
-        url: str = None,
-        *,
-        parameters,
-        headers,
-        **kwargs,
-    ) -> aiohttp.ClientResponse:
-        # quote and build url
-        url = self.build_url(url, parameters)
+    @ITER_MGET_SIGNATURE
+    def iter_mget(
+        self, urls, *, parameters, headers, priority, batch_timeout, **kwargs
+    ):
+        """Make multiple asynchronous GET requests, yielding each response as soon as
+        it is received. Responses are yielded in completion order, not request order,
+        paired with the index of the request that produced them. Arguments are handled
+        identically to `RestClient.mget`.
 
-        # Fast way to merge dicts https://stackoverflow.com/a/1784128
-        # Create copy of instance headers, merge headers with instance header copy.
-        # Headers passed to _get have precedent over instance headers
-        _headers = dict(self.headers)
-        _headers.update(headers)
+        Unlike `RestClient.mget`, responses are not retained after they are yielded.
+        This allows callers to process and release response bodies incrementally
+        rather than holding every body in memory at once.
 
-        resp = await self._session.get(url, headers=_headers, **kwargs)
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if RestClient headers set provided headers are appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
+
+        Yields
+        ------
+        Tuple[int, Response]
+            Request index and response
+
+        Examples
+        --------
+        >>> from hydrotools._restclient import RestClient
+        >>>
+        >>> client = RestClient(base_url="https://www.weather.gov")
+        >>> paths = ["/", "/about", "/contact"]
+        >>> for idx, resp in client.iter_mget(paths):
+        ...     print(paths[idx], resp.status)
+        """
+        responses = self._client.iter_mget(
+            urls,
+            parameters=parameters,
+            headers=headers,
+            priority=priority,
+            batch_timeout=batch_timeout,
+            **kwargs,
+        )
+        try:
+            while True:
+                try:
+                    idx, resp = self._run(responses.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield idx, resp
+        finally:
+            # cancel outstanding requests if iteration stopped early
+            self._run(responses.aclose())
+
+    @MGET_RESULTS_SIGNATURE
+    def mget_results(
+        self, urls, *, parameters, headers, priority, batch_timeout, checkpoint, **kwargs
+    ):
+        """Make multiple asynchronous GET requests, recording the outcome of each
+        request rather than failing on the first error. Arguments are handled
+        identically to `RestClient.mget`.
 
-        # Verify origin of response. Attr not in aiohttp.ClientSession, thus default None.
-        from_cache = getattr(resp, "from_cache", None)
+        A request fails if it raises or its response status is 429 or 5xx (after
+        retries). Failures do not discard other responses and can be reissued with
+        `RestClient.retry_failed`. Requests outstanding when the batch deadline
+        passes are cancelled and left pending.
 
-        # CachedResponses implement __slots__ and thus cannot be monkeypatched.
-        # see https://www.attrs.org/en/stable/glossary.html#term-slotted-classes
-        # Theirfore, wrapping coro's json() and text() cannot be achieved.
-        if from_cache:
-            resp = cached_response_to_client_response(resp, loop=self._loop)
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if RestClient headers set provided headers are appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
+        checkpoint : str, pathlib.Path, or MGetCheckpoint, optional
+            File recording completed requests. Requests recorded as completed by a
+            previous call with the same requests are skipped (see
+            `MGetResults.skipped`).
 
-        # implicitly sets resp._body which contains response data
-        await resp.read()
+        Returns
+        -------
+        MGetResults
+
+        Examples
+        --------
+        >>> from hydrotools._restclient import RestClient
+        >>>
+        >>> client = RestClient(base_url="https://waterservices.usgs.gov/nwis/iv/")
+        >>> parameters = [{"sites": site, "format": "json"} for site in sites]
+        >>> results = client.mget_results(
+        ...     parameters=parameters, checkpoint="backfill.checkpoint"
+        ... )
+        >>> if results.failed:
+        ...     results = client.retry_failed(results)
+        >>> for idx, response in results.items():
+        ...     print(idx, response.json())
+        """
+        return self._run(
+            self._client.mget_results(
+                urls,
+                parameters=parameters,
+                headers=headers,
+                priority=priority,
+                batch_timeout=batch_timeout,
+                checkpoint=checkpoint,
+                **kwargs,
+            )
+        )
 
-        # release the resource
-        # note, resp is "locked" until released meaning it cannot be patched until post-release
-        resp.release()
-        # Patch and wrap resp's, text and json methods with run_until_complete and forge their signatures
-        resp = self._patch_get(resp)
-        return resp
+    def retry_failed(
+        self, results: MGetResults, batch_timeout: Optional[float] = None
+    ) -> MGetResults:
+        """Reissue the failed and pending requests of `results`, updating it in
+        place. Returns `results`. `batch_timeout` defaults to the client's
+        `TimeoutPolicy.batch`."""
+        return self._run(self._client.retry_failed(results, batch_timeout))
 
-    @MGET_SIGNATURE
-    async def _mget(
+    @PREFETCH_SIGNATURE
+    def prefetch(
         self,
         urls,
         *,
         parameters,
         headers,
-        **kwargs: Any,
-    ) -> List[aiohttp.ClientResponse]:
-        ACCEPTED_MRO = (list, tuple, pd.Series, np.ndarray)
-        if urls is None and not parameters and not headers:
-            raise ValueError("Must provide urls, parameters, and/or headers.")
-
-        collection = None
-        _collections = []
-        for arg in [urls, parameters, headers]:
-            if isinstance(arg, ACCEPTED_MRO):
-                collection = arg
-                _collections.append(arg)
-
-        if collection is None:
-            raise ValueError("Must provide list of urls, parameters, and/or headers.")
-
-        # ensure if collection of args passed, their lengths' are equal
-        assert reduce(lambda x, y: x == y, map(len, _collections))
-
-        return await asyncio.gather(
-            *[
-                self._get(
-                    url=urls[idx] if isinstance(urls, ACCEPTED_MRO) else urls,
-                    parameters=parameters[idx]
-                    if isinstance(parameters, ACCEPTED_MRO)
-                    else parameters,
-                    headers=headers[idx]
-                    if isinstance(headers, ACCEPTED_MRO)
-                    else headers,
-                )
-                for idx in range(len((collection)))
-            ]
-        )
+        priority,
+        batch_timeout,
+        on_progress,
+        **kwargs,
+    ):
+        """Make multiple GET requests in the background to fill the cache, discarding
+        their responses. Returns immediately. Arguments are handled identically to
+        `RestClient.mget`. Later requests for the same urls are answered from the
+        cache, or share the prefetch's request if it is still in flight.
+
+        Requests are queued at a low priority, so that requests made with the default
+        priority are sent first, and are subject to the client's rate limiter and
+        memory budget. Requests that fail are counted, not raised.
+
+        With `background_loop=True` the prefetch runs in the client's event loop
+        thread. Otherwise it runs while the client's event loop does, that is, during
+        other requests made with this client and `Prefetch.wait`. Closing the client
+        cancels outstanding prefetches.
+
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if RestClient headers set provided headers are appended
+        priority : int, default 10
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`. Requests outstanding at the deadline are
+            cancelled and left pending.
+        on_progress : Callable[[PrefetchProgress], None], optional
+            Called with the prefetch's progress as each request completes or fails.
+            Called from the client's event loop thread.
 
-    def _patch_get(
-        self, client_response: aiohttp.ClientResponse
-    ) -> aiohttp.ClientResponse:
-        """Wrap aiohttp.ClientResponse text and json coros in run_until_complete. Monkeypatch text and json with wrappers."""
-        # May iter through methods and wrap all coro's in the future
-        # however that may not work if a non-coro returns a async context manager for example
-        text = wrap_coro_in_callable(client_response.text)
-        json = wrap_coro_in_callable(client_response.json)
-        # resign signatures
-        text = forge.copy(aiohttp.ClientResponse.text, exclude="self")(text)
-        json = forge.copy(aiohttp.ClientResponse.json, exclude="self")(json)
-
-        client_response.text = text
-        client_response.json = json
-        return client_response
+        Returns
+        -------
+        Prefetch
+            Handle reporting the prefetch's progress
+
+        Examples
+        --------
+        >>> from hydrotools._restclient import RestClient
+        >>>
+        >>> client = RestClient(background_loop=True)
+        >>> prefetch = client.prefetch(urls)
+        >>> # answered from the cache once prefetched
+        >>> resp = client.get(urls[0])
+        >>> prefetch.wait()
+        PrefetchProgress(total=4, completed=4, failed=0, cached=0)
+        """
+        total = len(self._client._expand_mget_args(urls, parameters, headers))
+        handle = Prefetch(total)
+
+        def update(progress: PrefetchProgress) -> None:
+            handle._update(progress)
+            if on_progress is not None:
+                on_progress(progress)
+
+        coro = self._client.prefetch(
+            urls,
+            parameters=parameters,
+            headers=headers,
+            priority=priority,
+            batch_timeout=batch_timeout,
+            on_progress=update,
+            **kwargs,
+        )
+        if self._loop_thread is not None:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            wait = future.result
+        else:
+            future = self._loop.create_task(coro)
+
+            def wait(timeout: Optional[float] = None) -> PrefetchProgress:
+                # shielded, a timed out wait does not cancel the prefetch
+                return self._run(asyncio.wait_for(asyncio.shield(future), timeout))
+
+        handle._attach(future, wait)
+        self._prefetches.add(future)
+        future.add_done_callback(self._prefetches.discard)
+        return handle
+
+    def register_query_normalizer(
+        self, url_prefix: str, normalizer: Optional[QueryNormalizerType]
+    ) -> None:
+        """Normalize the query parameters of requests whose url (including base url,
+        excluding query) starts with `url_prefix` using `normalizer`. The longest
+        matching prefix wins. A `normalizer` of None removes the registration."""
+        self._client.register_query_normalizer(url_prefix, normalizer)
 
     def build_url(
         self,
         url: Union[str, None] = None,
         parameters: Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]] = {},
     ):
-        if url is None:
-            if self.base_url is None:
-                raise ValueError("no url provided and no base url set")
-            # only base url
-            url = self._base_url
-
-        elif self.base_url is not None:
-            url = self._base_url / url
-
-        # add query parameters and get quoted representation
-        return (Url(url) + parameters).quote_url
+        return self._client.build_url(url, parameters)
 
     @property
     def base_url(self) -> str:
         """Base url"""
-        return self._base_url
+        return self._client.base_url
 
     @property
     def headers(self) -> dict:
         """GET request headers"""
-        return self._headers
+        return self._client.headers
+
+    @property
+    def scheduler_stats(self) -> SchedulerStats:
+        """Snapshot of request queue depth and in-flight request counts"""
+        return self._client.scheduler_stats
+
+    @property
+    def request_stats(self) -> RequestStats:
+        """Snapshot of request and coalesced request counts"""
+        return self._client.request_stats
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Snapshot of retry and circuit breaker counts"""
+        return self._client.retry_stats
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """Request instrumentation, None if not enabled"""
+        return self._client.instrumentation
+
+    @property
+    def trace_stats(self) -> Optional[TraceStats]:
+        """Snapshot of request latency percentiles, throughput, sizes, and cache
+        origin counts. None if instrumentation is not enabled."""
+        return self._client.trace_stats
+
+    @property
+    def connection_pool(self) -> Optional[ConnectionPool]:
+        """Shared connection pool, None if the client owns its connection pool"""
+        return self._client.connection_pool
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Snapshot of shared connection pool reuse counts. None if the client owns
+        its connection pool."""
+        return self._client.pool_stats
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Per host request rate limit, None if requests are not rate limited"""
+        return self._client.rate_limiter
+
+    @property
+    def rate_limit_stats(self) -> Optional[RateLimitStats]:
+        """Snapshot of rate limit waits, 429 responses, and per host rates. None if
+        requests are not rate limited."""
+        return self._client.rate_limit_stats
+
+    @property
+    def query_normalizer(self) -> Optional[QueryNormalizerType]:
+        """Default query parameter normalizer"""
+        return self._client.query_normalizer
+
+    @property
+    def spill_threshold(self) -> Optional[int]:
+        """Body size in bytes above which responses are spilled to disk, None if
+        disabled"""
+        return self._client.spill_threshold
+
+    @property
+    def memory_budget(self) -> Optional[MemoryBudget]:
+        """Memory budget of batch requests, None if unbounded"""
+        return self._client.memory_budget
+
+    @property
+    def memory_budget_stats(self) -> Optional[MemoryBudgetStats]:
+        """Snapshot of bytes held by outstanding and undelivered batch responses.
+        None if batch requests are unbounded."""
+        return self._client.memory_budget_stats
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        """Hedged request policy, None if requests are not hedged"""
+        return self._client.hedge_policy
+
+    @property
+    def hedge_stats(self) -> Optional[HedgeStats]:
+        """Snapshot of hedged and won request counts and per host hedge delays. None
+        if requests are not hedged."""
+        return self._client.hedge_stats
+
+    @property
+    def timeout_policy(self) -> TimeoutPolicy:
+        """Request and batch time limits"""
+        return self._client.timeout_policy
+
+    @property
+    def archive(self) -> Optional[HTTPArchive]:
+        """Record / replay archive, None if not enabled"""
+        return self._client.archive
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Snapshot of cache hit, miss, and eviction counts. None if caching is disabled
+        or the cache backend does not report statistics."""
+        return self._client.cache_stats
+
+    @property
+    def background_loop(self) -> bool:
+        """True if requests run in an event loop thread owned by the client"""
+        return self._loop_thread is not None
+
+    @property
+    def _session(self) -> Optional[ClientSession]:
+        return self._client._session
 
     def close(self) -> None:
         """Release aiohttp.ClientSession"""
-        # Session never instantiated, thus cannot be closed
-        session = getattr(self, "_session", None)
-        if session is None:
+        # Client never instantiated, thus cannot be closed
+        client = getattr(self, "_client", None)
+        if client is None:
             return
 
-        if not self._session.closed:
+        if not self._loop.is_closed():
+            for future in list(self._prefetches):
+                future.cancel()
+
+        loop_thread = getattr(self, "_loop_thread", None)
+        if loop_thread is not None:
+            if not loop_thread.running:
+                return
+            if loop_thread.in_thread():
+                # e.g. garbage collected in the loop thread, which cannot block on it
+                loop_thread.submit(client.close())
+            elif not client.closed:
+                loop_thread.run(client.close())
+            loop_thread.stop()
+            return
+
+        if not client.closed:
             if not self._loop.is_closed():
-                add_to_loop(self._session.close())
+                add_to_loop(client.close())
 
     def __del__(self) -> None:
         self.close()
@@ -301,27 +743,3 @@ class RestClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
-
-def cached_response_to_client_response(
-    cached_response: CachedResponse, *, loop: asyncio.AbstractEventLoop
-):
-    """Translation from aiohttp_client_cache.CachedResponse to aiohttp.ClientResponse"""
-    # Naive 'casting' to ClientResponse. Likely needs work to cover all cases.
-    inst = ClientResponse(
-        cached_response.method,
-        cached_response.url,
-        writer=None,
-        continue100=False,
-        timer=None,
-        traces=[],
-        session=None,
-        request_info=cached_response.request_info,
-        loop=loop,
-    )
-    inst._body = cached_response._body
-    inst.version = cached_response.version
-    inst.status = cached_response.status
-    inst.reason = cached_response.reason
-    inst._headers = cached_response.headers
-    inst._raw_headers = cached_response.raw_headers
-    return inst
@@ -1,17 +1,32 @@
 import forge
 import aiohttp
-from typing import Dict, List, Union
+from pathlib import Path
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .response import Response
+from .results import MGetCheckpoint, MGetResults
+from .prefetch import PREFETCH_PRIORITY, Prefetch, PrefetchProgress
 
 # RestClient signature decorators
 
 GET_SIGNATURE = forge.compose(
     forge.copy(aiohttp.ClientSession.get),
     forge.modify("url", default=None),
-    forge.returns(aiohttp.ClientResponse),
+    forge.returns(Response),
     forge.insert(
         [
             forge.kwo("parameters", default={}, type=Dict[str, Union[str, List[str]]]),
             forge.kwo("headers", default={}, type=Dict[str, str]),
+            forge.kwo("priority", default=0, type=int),
         ],
         before=lambda arg: arg.kind == forge.FParameter.VAR_KEYWORD,
     ),
@@ -19,7 +34,7 @@ GET_SIGNATURE = forge.compose(
 
 MGET_SIGNATURE = forge.compose(
     forge.copy(aiohttp.ClientSession.get, exclude="url"),
-    forge.returns(List[aiohttp.ClientResponse]),
+    forge.returns(List[Response]),
     forge.insert(
         forge.pok(
             "urls",
@@ -34,7 +49,51 @@ MGET_SIGNATURE = forge.compose(
                 "parameters", default={}, type=List[Dict[str, Union[str, List[str]]]]
             ),
             forge.kwo("headers", default={}, type=List[Dict[str, str]]),
+            forge.kwo("priority", default=0, type=int),
+            forge.kwo("batch_timeout", default=None, type=Optional[float]),
         ],
         before=lambda arg: arg.kind == forge.FParameter.VAR_KEYWORD,
     ),
 )
+
+ITER_MGET_SIGNATURE = forge.compose(
+    MGET_SIGNATURE,
+    forge.returns(Iterator[Tuple[int, Response]]),
+)
+
+ASYNC_ITER_MGET_SIGNATURE = forge.compose(
+    MGET_SIGNATURE,
+    forge.returns(AsyncIterator[Tuple[int, Response]]),
+)
+
+MGET_RESULTS_SIGNATURE = forge.compose(
+    MGET_SIGNATURE,
+    forge.returns(MGetResults),
+    forge.insert(
+        forge.kwo(
+            "checkpoint",
+            default=None,
+            type=Optional[Union[str, Path, MGetCheckpoint]],
+        ),
+        before=lambda arg: arg.kind == forge.FParameter.VAR_KEYWORD,
+    ),
+)
+
+ASYNC_PREFETCH_SIGNATURE = forge.compose(
+    MGET_SIGNATURE,
+    forge.returns(PrefetchProgress),
+    forge.modify("priority", default=PREFETCH_PRIORITY),
+    forge.insert(
+        forge.kwo(
+            "on_progress",
+            default=None,
+            type=Optional[Callable[[PrefetchProgress], None]],
+        ),
+        before=lambda arg: arg.kind == forge.FParameter.VAR_KEYWORD,
+    ),
+)
+
+PREFETCH_SIGNATURE = forge.compose(
+    ASYNC_PREFETCH_SIGNATURE,
+    forge.returns(Prefetch),
+)
@@ -1,14 +1,27 @@
+import aiohttp
+from aiohttp.helpers import sentinel
 from aiohttp_client_cache import CachedSession
+from aiohttp_client_cache.session import CacheMixin
 import asyncio
+import attr
+from collections import defaultdict
 import forge
-from functools import partial
 from inspect import Parameter
 from random import random
+from typing import Dict, Optional
 import warnings
+from yarl import URL
 
-__all__ = ["ClientSession"]
+from .retry import (
+    RETRY_STATUS_CODES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    RetryStats,
+)
+from .rate_limit import RateLimiter
 
-RETRY_STATUS_CODES = frozenset({503, 429, 301})
+__all__ = ["ClientSession"]
 
 
 def forge_client_session(init):
@@ -19,6 +32,8 @@ def forge_client_session(init):
             [
                 forge.kwarg("retry", default=True, type=bool),
                 forge.kwarg("n_retries", default=3, type=int),
+                forge.kwarg("retry_policy", default=None, type=Optional[RetryPolicy]),
+                forge.kwarg("rate_limiter", default=None, type=Optional[RateLimiter]),
             ],
             before=lambda x: x.kind == Parameter.KEYWORD_ONLY,
         ),
@@ -35,27 +50,240 @@ with warnings.catch_warnings():
         "ignore", category=DeprecationWarning, message="Inheritance class"
     )
 
-    class ClientSession(CachedSession):
+    class _RateLimitedSession(aiohttp.ClientSession):
+        """`aiohttp.ClientSession` that waits for a `RateLimiter` token before sending
+        each request. Placed below `CacheMixin` in the method resolution order, so
+        only requests that reach the network consume tokens."""
+
+        _rate_limiter = None  # type: Optional[RateLimiter]
+
+        async def _request(self, method, str_or_url, **kwargs):
+            limiter = self._rate_limiter
+            if limiter is None:
+                return await super()._request(method, str_or_url, **kwargs)
+
+            host = URL(str(str_or_url)).host or ""
+            sent_at = await limiter.acquire(host)
+            resp = await super()._request(method, str_or_url, **kwargs)
+            limiter.record(host, resp.status, sent_at)
+            return resp
+
+    class _CircuitBreakingSession(aiohttp.ClientSession):
+        """`aiohttp.ClientSession` that fails fast with `CircuitOpenError` while the
+        circuit breaker of a request's host is open. Placed below `CacheMixin` in the
+        method resolution order, so cached responses are served regardless of
+        circuit state, and only requests that reach the network are counted.
+        Responses with a status in `RetryPolicy.statuses` and retryable exceptions
+        count as failures, other responses as successes."""
+
+        _retry_policy = None  # type: Optional[RetryPolicy]
+
+        def _circuit_breaker(self, host: str) -> Optional[CircuitBreaker]:
+            policy = self._retry_policy
+            if policy is None or policy.circuit_breaker_threshold is None:
+                return None
+
+            breaker = self._circuit_breakers.get(host)
+            if breaker is None:
+                breaker = self._circuit_breakers[host] = CircuitBreaker(
+                    policy.circuit_breaker_threshold, policy.circuit_breaker_reset
+                )
+            return breaker
+
+        async def _request(self, method, str_or_url, **kwargs):
+            host = URL(str(str_or_url)).host or ""
+            breaker = self._circuit_breaker(host)
+            if breaker is None:
+                return await super()._request(method, str_or_url, **kwargs)
+
+            if not breaker.allow():
+                self._retry_counts["rejections"] += 1
+                raise CircuitOpenError(host, breaker.retry_in())
+
+            try:
+                resp = await super()._request(method, str_or_url, **kwargs)
+            except Exception as e:
+                if self._retry_policy.is_retryable_exception(e):
+                    breaker.record_failure()
+                raise
+
+            if resp.status in self._retry_policy.statuses:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return resp
+
+    class _ScheduledSession(aiohttp.ClientSession):
+        """`aiohttp.ClientSession` that takes the request slot passed as the
+        `request_slot` keyword argument (see `RequestScheduler`) before sending a
+        request. Placed below `CacheMixin` in the method resolution order, so cached
+        responses neither wait for nor hold a slot."""
+
+        async def _request(self, method, str_or_url, **kwargs):
+            slot = kwargs.pop("request_slot", None)
+            if slot is not None:
+                await slot.acquire()
+            return await super()._request(method, str_or_url, **kwargs)
+
+    # same composition as `CachedSession`, with circuit breaking, request slots, and
+    # rate limiting below the cache
+    class ClientSession(
+        CacheMixin, _CircuitBreakingSession, _ScheduledSession, _RateLimitedSession
+    ):
+        """`aiohttp_client_cache.CachedSession` that retries failed requests according
+        to a `RetryPolicy` and optionally paces requests with a `RateLimiter`.
+
+        Parameters
+        ----------
+        retry: bool, default True
+            Enable retries. If False, requests are attempted once and the circuit
+            breaker is disabled.
+        n_retries: int, default 3
+            Number of retries when `retry_policy` is not provided
+        retry_policy: RetryPolicy, optional, default None
+            Retry policy. Defaults to `RetryPolicy(n_retries=n_retries)`.
+        rate_limiter: RateLimiter, optional, default None
+            Per host request rate limit. Cached responses do not consume tokens.
+
+        The `total` of the session or request `timeout` bounds a request including
+        its retries and backoff delays, in addition to `RetryPolicy.deadline`. Each
+        attempt is given the time that remains. A request slot passed as the
+        `request_slot` keyword argument is released while waiting to retry, and time
+        spent waiting for it is excluded.
+        """
+
         @forge_client_session
-        def __init__(self, *, retry: bool = True, n_retries: int = 3, **kwargs):
+        def __init__(
+            self,
+            *,
+            retry: bool = True,
+            n_retries: int = 3,
+            retry_policy: Optional[RetryPolicy] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            **kwargs,
+        ):
 
             self._retry = retry
             self._n_retries = n_retries
+            self._retry_policy = (
+                (retry_policy or RetryPolicy(n_retries=n_retries)) if retry else None
+            )
+            self._circuit_breakers = {}  # type: Dict[str, CircuitBreaker]
+            self._retry_counts = defaultdict(int)  # type: Dict[str, int]
+            self._rate_limiter = rate_limiter
             super().__init__(**kwargs)
 
+        @property
+        def retry_policy(self) -> Optional[RetryPolicy]:
+            """Retry policy, None if retries are disabled"""
+            return self._retry_policy
+
+        @property
+        def rate_limiter(self) -> Optional[RateLimiter]:
+            """Per host request rate limit, None if requests are not rate limited"""
+            return self._rate_limiter
+
+        @property
+        def retry_stats(self) -> RetryStats:
+            """Snapshot of retry and circuit breaker counts"""
+            return RetryStats(
+                retries=self._retry_counts["retries"],
+                retried_requests=self._retry_counts["retried_requests"],
+                exhausted=self._retry_counts["exhausted"],
+                circuit_breaker_rejections=self._retry_counts["rejections"],
+                open_circuits=tuple(
+                    host
+                    for host, breaker in self._circuit_breakers.items()
+                    if breaker.state != CircuitBreaker.CLOSED
+                ),
+            )
+
         @forge.copy(CachedSession._request)
-        async def _request(self, *args, **kwargs):
-            bound_resp = partial(super()._request, *args, **kwargs)
-            resp = await bound_resp()
+        async def _request(self, method, str_or_url, **kwargs):
+            policy = self._retry_policy
+            if policy is None:
+                return await super()._request(method, str_or_url, **kwargs)
 
-            if (
-                self._retry is True
-                and resp.status in RETRY_STATUS_CODES
-                and self._n_retries > 0
-            ):
-                resp = await backoff(bound_resp, self._n_retries)
+            slot = kwargs.get("request_slot")
+            # request deadline, the earliest of the retry deadline and total timeout
+            timeout = kwargs.get("timeout", sentinel)
+            if timeout is sentinel:
+                timeout = self.timeout
+            elif not isinstance(timeout, aiohttp.ClientTimeout):
+                # deprecated numeric timeout, total seconds per attempt
+                timeout = aiohttp.ClientTimeout(total=timeout)
+            limits = [t for t in (policy.deadline, timeout.total) if t is not None]
+            loop = asyncio.get_event_loop()
+            deadline = loop.time() + min(limits) if limits else None
 
-            return resp
+            def time_left() -> float:
+                # time queued for a request slot does not count against the deadline
+                queued = slot.queued if slot is not None else 0.0
+                return deadline + queued - loop.time()
+
+            def bound_resp():
+                if deadline is None:
+                    return super(ClientSession, self)._request(
+                        method, str_or_url, **kwargs
+                    )
+                # attempt may use the remaining time. A total of 0 disables the
+                # aiohttp timeout, so an exhausted deadline times out here.
+                remaining = time_left()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                return super(ClientSession, self)._request(
+                    method,
+                    str_or_url,
+                    **{**kwargs, "timeout": attr.evolve(timeout, total=remaining)},
+                )
+
+            attempt = 0
+            while True:
+                resp = error = None
+                try:
+                    resp = await bound_resp()
+                except Exception as e:
+                    if not policy.is_retryable_exception(e):
+                        raise
+                    error = e
+
+                if error is None and resp.status not in policy.statuses:
+                    return resp
+
+                delay = policy.delay(attempt, resp)
+                out_of_time = deadline is not None and delay > time_left()
+                if attempt >= policy.n_retries or out_of_time:
+                    self._retry_counts["exhausted"] += 1
+                    if error is not None:
+                        raise error
+                    return resp
+
+                if resp is not None:
+                    resp.release()
+                if slot is not None:
+                    # let other requests send while this one waits
+                    slot.release()
+
+                await asyncio.sleep(delay)
+                self._retry_counts["retries"] += 1
+                if not attempt:
+                    self._retry_counts["retried_requests"] += 1
+                attempt += 1
+
+        async def _refresh_cached_response(
+            self, method, str_or_url, cached_response, actions, **kwargs
+        ):
+            expired = cached_response.is_expired
+            from_cache, resp = await super()._refresh_cached_response(
+                method, str_or_url, cached_response, actions, **kwargs
+            )
+
+            # expired response confirmed unchanged by server (304), renew it
+            save_revalidated = getattr(self.cache, "save_revalidated", None)
+            if from_cache and expired and save_revalidated is not None:
+                await save_revalidated(actions.key, resp, actions.expires)
+
+            return from_cache, resp
 
 
 async def backoff(request, n: int = 3):
@@ -0,0 +1,1188 @@
+from aiohttp.client_reqrep import ClientResponse
+from aiohttp_client_cache.response import CachedResponse
+from aiohttp_client_cache import CacheBackend
+import aiohttp
+from dataclasses import dataclass, replace
+from functools import reduce
+from pathlib import Path
+
+# Type hints
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+import pandas as pd
+import numpy as np
+import asyncio
+import time
+import warnings
+
+# local imports
+from .async_client import ClientSession
+from .urllib import PRIMITIVE, Url, compile_url
+from ._restclient_sigs import (
+    GET_SIGNATURE,
+    MGET_SIGNATURE,
+    MGET_RESULTS_SIGNATURE,
+    ASYNC_ITER_MGET_SIGNATURE,
+    ASYNC_PREFETCH_SIGNATURE,
+)
+from .scheduler import RequestScheduler, SchedulerStats, _RequestSlot
+from .cache_backends import BoundedSQLiteBackend, CacheStats
+from .retry import RetryPolicy, RetryStats
+from .response import JSONDecoder, Response, get_json_decoder
+from .instrumentation import Instrumentation, TraceStats, _TraceContext
+from .replay import HTTPArchive
+from .connection_pool import ConnectionPool, PoolStats
+from .rate_limit import RateLimiter, RateLimitStats
+from .query_normalizer import QueryNormalizerType
+from .results import MGetCheckpoint, MGetResults
+from .memory_budget import MemoryBudget, MemoryBudgetStats
+from .hedging import HedgePolicy, HedgeStats
+from .timeouts import TimeoutPolicy
+from .prefetch import PrefetchProgress
+
+__all__ = ["AsyncRestClient", "RequestStats"]
+
+
+@dataclass(frozen=True)
+class RequestStats:
+    """Point in time snapshot of `AsyncRestClient` request counts.
+
+    Attributes
+    ----------
+    requests: int
+        Number of `get` calls, including those made by `mget` and `iter_mget`
+    coalesced: int
+        Number of requests answered by an identical in-flight request rather than
+        being sent
+    """
+
+    requests: int = 0
+    coalesced: int = 0
+
+
+class AsyncRestClient:
+    """
+    Asynchronous counterpart of `RestClient`. All request methods are coroutines (or
+    asynchronous iterators) that run in the caller's event loop, making this class
+    suitable for use within running event loops (e.g. aiohttp web services or jupyter
+    notebooks). `RestClient` is a synchronous wrapper around this class.
+
+    Requests return `Response` objects whose bodies have been read and connections
+    released, so `text()` and `json()` are synchronous.
+
+    Features
+
+    - Base url
+    - Size bounded request cache with pluggable backends (see `cache_backends`)
+    - Expired cache entries revalidated using ETag / Last-Modified conditional requests
+    - Retries with jittered exponential backoff and optional per host circuit breakers
+    - Bounded, per host request concurrency with a priority request queue
+    - Streaming batch requests that yield responses as they complete (see
+      `AsyncRestClient.iter_mget`)
+    - Batch requests tolerant of partial failure, with retries of failed requests
+      and resumable checkpoints (see `AsyncRestClient.mget_results`)
+    - Coalescing of concurrent, identical requests into a single request
+    - Opt-in request timing and size instrumentation (see `Instrumentation`)
+    - Record / replay of HTTP exchanges for offline runs (see `HTTPArchive`)
+    - Connection pools shareable across clients (see `ConnectionPool`)
+    - Per host token bucket rate limits, optionally adapting to 429 responses (see
+      `RateLimiter`)
+    - Query parameter normalization, so equivalent queries share cache entries (see
+      `QueryNormalizer`)
+    - Low priority cache warm up (see `AsyncRestClient.prefetch`)
+
+    Parameters
+    ----------
+    base_url: Union[str, Url, None], default None
+        Request base url
+    headers: dict, default {}
+        Headers included in every request
+    enable_cache: bool, default True
+        Enable or disable caching
+    cache_filename: str, default "cache"
+        Cache filename with .sqlite filetype suffix
+    cache_expire_after: int, default 43200
+        Cached request life in seconds
+    cache_max_bytes: int, optional, default None
+        Maximum size of the default SQLite cache in bytes. Expired, then least
+        recently used, responses are evicted when exceeded. None is unlimited.
+    cache_compression: str, optional, default None
+        Compress response bodies stored in the default SQLite cache using "zlib",
+        "bz2", "lzma", or "zstd" (requires `zstandard`). None stores bodies
+        uncompressed. Existing caches are readable either way, see
+        `BoundedCacheBackend.recompress` to convert them.
+    cache_compression_level: int, optional, default None
+        Compression level. None is the codec's default.
+    cache_backend: aiohttp_client_cache.CacheBackend, optional, default None
+        Cache backend used instead of the default SQLite cache (e.g.
+        `MemoryLRUBackend`, `ShardedFileBackend`). When provided, `cache_filename`,
+        `cache_expire_after`, `cache_max_bytes`, and `cache_compression` are ignored.
+    retry: bool, default True
+        Enable exponential backoff
+    n_retries: int, default 3
+        Attempt retries n times before failing. Ignored if `retry_policy` is provided.
+    retry_policy: RetryPolicy, optional, default None
+        Retryable statuses and exceptions, backoff, deadline, `Retry-After` handling,
+        and per host circuit breaker settings. Defaults to
+        `RetryPolicy(n_retries=n_retries)`. See `AsyncRestClient.retry_stats`.
+    max_in_flight: int, default 100
+        Maximum number of simultaneous requests. Requests beyond this limit wait in a
+        priority queue (see `AsyncRestClient.scheduler_stats`). Requests answered from the
+        cache do not count, and requests waiting to be retried give up their place.
+    max_in_flight_per_host: int, optional, default None
+        Maximum number of simultaneous requests to a single host. None is unlimited.
+    json_decoder: str or Callable[[bytes], Any], optional, default None
+        Decoder used by `Response.json`. "stdlib", "orjson" (requires `orjson`), or a
+        callable that deserializes json from bytes. None is "stdlib".
+    coalesce_requests: bool, default True
+        Concurrent requests with identical urls, headers, and keyword arguments share
+        a single in-flight request and `Response`. See `AsyncRestClient.request_stats`.
+    instrumentation: Instrumentation, optional, default None
+        Record per request timings, sizes, cache origin, and retries. An
+        `Instrumentation` may be shared by multiple clients. See
+        `AsyncRestClient.trace_stats`.
+    archive: HTTPArchive, optional, default None
+        In record mode, write each response to the archive. In replay mode, serve
+        responses from the archive without network access. Disable caching when
+        recording, otherwise cached responses are recorded with cache lookup
+        latencies.
+    connection_pool: ConnectionPool, optional, default None
+        Connection pool shared with other clients. Pool connection limits apply in
+        addition to `max_in_flight` and `max_in_flight_per_host`. Defaults to a pool
+        owned by this client, sized by `max_in_flight` and `max_in_flight_per_host`.
+        See `AsyncRestClient.pool_stats`.
+    rate_limiter: RateLimiter, optional, default None
+        Per host request rate limit. Requests wait for a token before they are sent.
+        Cached responses do not consume tokens. A `RateLimiter` may be shared by
+        multiple clients. See `AsyncRestClient.rate_limit_stats`.
+    query_normalizer: Callable[[Mapping[str, Any]], Dict[str, Any]], optional, default None
+        Canonicalizes request query parameters before the url is built, so that
+        equivalent queries share cache entries (e.g. `QueryNormalizer`). Applies to
+        requests not matched by a normalizer registered with
+        `AsyncRestClient.register_query_normalizer`.
+    spill_threshold: int, optional, default None
+        Response bodies larger than this many bytes are streamed to a temporary file
+        instead of being held in memory, see `Response.buffer` and `Response.open`.
+        None holds every body in memory.
+    spill_dir: str or pathlib.Path, optional, default None
+        Directory of spilled bodies. Defaults to the system temporary directory.
+    memory_budget: int or MemoryBudget, optional, default None
+        Bound, in bytes, on the response bodies held by outstanding requests and
+        responses not yet delivered by `AsyncRestClient.iter_mget`,
+        `AsyncRestClient.mget`, and `AsyncRestClient.mget_results`. Once reached, no
+        new requests are sent until delivered responses are consumed. Spilled bodies
+        (see `spill_threshold`) are not counted. A `MemoryBudget` may be shared by
+        multiple clients. None is unbounded. See `AsyncRestClient.memory_budget_stats`.
+    hedge_policy: HedgePolicy, optional, default None
+        Send a duplicate of requests slower than a per host latency percentile and
+        use the first response, cutting tail latency at the cost of bounded extra
+        load. None disables hedging. See `AsyncRestClient.hedge_stats`.
+    timeout_policy: TimeoutPolicy, optional, default None
+        Connect, socket read, and per request time limits, and the default deadline
+        of batch requests. Defaults to `TimeoutPolicy()`.
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import AsyncRestClient
+    >>>
+    >>> async with AsyncRestClient() as client:
+    ...     resp = await client.get("weather.gov")
+    ...     print(resp.text())
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Union[str, Url, None] = None,
+        headers: dict = {},
+        enable_cache: bool = True,
+        cache_filename: str = "cache",
+        cache_expire_after: int = 43200,
+        cache_max_bytes: Optional[int] = None,
+        cache_compression: Optional[str] = None,
+        cache_compression_level: Optional[int] = None,
+        cache_backend: Optional[CacheBackend] = None,
+        retry: bool = True,
+        n_retries: int = 3,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_in_flight: int = 100,
+        max_in_flight_per_host: Optional[int] = None,
+        json_decoder: Union[str, JSONDecoder, None] = None,
+        coalesce_requests: bool = True,
+        instrumentation: Optional[Instrumentation] = None,
+        archive: Optional[HTTPArchive] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        query_normalizer: Optional[QueryNormalizerType] = None,
+        spill_threshold: Optional[int] = None,
+        spill_dir: Union[str, Path, None] = None,
+        memory_budget: Union[int, MemoryBudget, None] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout_policy: Optional[TimeoutPolicy] = None,
+    ):
+        self._base_url = Url(base_url) if base_url is not None else None
+        # parsed once, joined paths and quoted urls are cached by the template
+        self._base_template = (
+            compile_url(self._base_url) if base_url is not None else None
+        )
+        self._headers = headers
+        self._retry = retry
+        self._retires = n_retries
+        self._retry_policy = retry_policy
+        self._cache_enabled = enable_cache
+        self._json_decoder = get_json_decoder(json_decoder)
+        self._coalesce_requests = coalesce_requests
+        self._instrumentation = instrumentation
+        self._archive = archive
+        self._connection_pool = connection_pool
+        self._rate_limiter = rate_limiter
+        self._query_normalizer = query_normalizer
+        self._spill_threshold = spill_threshold
+        self._spill_dir = spill_dir
+        if memory_budget is not None and not isinstance(memory_budget, MemoryBudget):
+            memory_budget = MemoryBudget(memory_budget)
+        self._memory_budget = memory_budget
+        self._hedge_policy = hedge_policy
+        self._timeout_policy = timeout_policy or TimeoutPolicy()
+        # url prefix: normalizer, see register_query_normalizer
+        self._query_normalizers = {}  # type: Dict[str, QueryNormalizerType]
+        # (url, headers, kwargs): [shared request task, number of waiting callers]
+        self._in_flight = {}  # type: Dict[Tuple[str, Tuple, Tuple], List]
+        self._requests = 0
+        self._coalesced = 0
+        self._max_in_flight = max_in_flight
+        self._max_in_flight_per_host = max_in_flight_per_host
+        self._scheduler = RequestScheduler(
+            max_in_flight=max_in_flight, max_in_flight_per_host=max_in_flight_per_host
+        )
+
+        if enable_cache is not True:
+            # CachedSession falls back to an unbounded in-memory cache if no backend is
+            # provided, so explicitly disable caching.
+            self._cache = CacheBackend()
+            self._cache.disabled = True
+        elif cache_backend is not None:
+            self._cache = cache_backend
+        else:
+            self._cache = BoundedSQLiteBackend(
+                cache_name=cache_filename,
+                max_bytes=cache_max_bytes,
+                compression=cache_compression,
+                compression_level=cache_compression_level,
+                expire_after=cache_expire_after,
+                allowed_codes=[200],
+                allowed_methods=["GET"],
+            )
+
+        # ClientSession must be created in a running event loop. Created on first use.
+        self._session = None  # type: Optional[ClientSession]
+
+    async def _ensure_session(self) -> ClientSession:
+        """Return ClientSession, creating it if it does not exist"""
+        if self._session is None:
+            trace_configs = []
+            if self._instrumentation is not None:
+                trace_configs.append(self._instrumentation.trace_config())
+
+            pool = self._connection_pool
+            if pool is not None:
+                connector = pool.connector()
+                trace_configs.append(pool.trace_config())
+            else:
+                # match connection pool limits to scheduler limits
+                connector = aiohttp.TCPConnector(
+                    limit=self._max_in_flight,
+                    limit_per_host=self._max_in_flight_per_host or 0,
+                )
+
+            self._session = ClientSession(
+                cache=self._cache,
+                retry=self._retry,
+                n_retries=self._retires,
+                retry_policy=self._retry_policy,
+                rate_limiter=self._rate_limiter,
+                connector=connector,
+                connector_owner=pool is None,
+                timeout=self._timeout_policy.client_timeout(),
+                trace_configs=trace_configs or None,
+            )
+            if pool is not None:
+                pool.acquire(self._session)
+        return self._session
+
+    @GET_SIGNATURE
+    async def get(
+        self,
+        url: str = None,
+        *,
+        parameters,
+        headers,
+        priority,
+        **kwargs,
+    ) -> Response:
+        """Make GET request. If base url is set, url is appended to the base url.
+        Passed headers are given precedent over instance headers(if present), meaning
+        passed headers replace instance headers with matching keys.
+
+        Parameters
+        ----------
+        url : str, Url
+            Request url
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if AsyncRestClient headers set provided headers are
+            appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+
+        Returns
+        -------
+        Response
+        """
+        if parameters and (self._query_normalizer or self._query_normalizers):
+            parameters = self._normalize_query(url, parameters)
+
+        # quote and build url
+        url = self.build_url(url, parameters)
+
+        # Fast way to merge dicts https://stackoverflow.com/a/1784128
+        # Create copy of instance headers, merge headers with instance header copy.
+        # Headers passed to get have precedent over instance headers
+        _headers = dict(self.headers)
+        _headers.update(headers)
+
+        self._requests += 1
+        if not self._coalesce_requests:
+            return await self._get(url, _headers, priority, **kwargs)
+
+        key = (url, tuple(sorted(_headers.items())), tuple(sorted(kwargs.items())))
+        try:
+            entry = self._in_flight.get(key)
+        except TypeError:
+            # unhashable keyword argument, do not coalesce
+            return await self._get(url, _headers, priority, **kwargs)
+
+        if entry is None:
+            task = asyncio.ensure_future(self._get(url, _headers, priority, **kwargs))
+            entry = self._in_flight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._discard_in_flight(key, entry))
+        else:
+            self._coalesced += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # shield shared request from cancellation of a single caller
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                # every caller was cancelled, later identical requests start anew
+                task.cancel()
+                self._discard_in_flight(key, entry)
+
+    def _discard_in_flight(self, key: Tuple[str, Tuple, Tuple], entry: List) -> None:
+        """Stop sharing the in-flight request `entry` with new callers"""
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    async def _get(
+        self, url: str, headers: Dict[str, str], priority: int, **kwargs
+    ) -> Response:
+        session = await self._ensure_session()
+
+        ctx = None
+        instrumentation = self._instrumentation
+        if instrumentation is not None and "trace_request_ctx" not in kwargs:
+            ctx = instrumentation.context(url)
+
+        policy = self._hedge_policy
+        archive = self._archive
+        try:
+            if policy is None or (archive is not None and archive.replaying):
+                response = await self._attempt(
+                    session, url, headers, priority, ctx, **kwargs
+                )
+            else:
+                response, ctx = await self._hedged_get(
+                    session, policy, url, headers, priority, ctx, **kwargs
+                )
+        except Exception as e:
+            if ctx is not None:
+                instrumentation.record(ctx, error=e)
+            raise
+
+        if ctx is not None:
+            instrumentation.record(ctx, response)
+        return response
+
+    async def _attempt(
+        self,
+        session: ClientSession,
+        url: str,
+        headers: Dict[str, str],
+        priority: int,
+        ctx: Optional[_TraceContext],
+        sent: Optional[asyncio.Future] = None,
+        **kwargs,
+    ) -> Response:
+        """Send a request. A request slot is taken once the request misses the cache
+        and held until its response body is read and connection released, except
+        while waiting to retry. `sent` is resolved once a slot is first acquired."""
+        if ctx is not None:
+            kwargs["trace_request_ctx"] = ctx
+
+        def acquired() -> None:
+            if ctx is not None:
+                ctx.acquired()
+            if sent is not None and not sent.done():
+                sent.set_result(None)
+
+        host = urlsplit(url).netloc
+        slot = _RequestSlot(self._scheduler, host, priority, acquired)
+        try:
+            response = await self._send(
+                session, url, headers, request_slot=slot, **kwargs
+            )
+        finally:
+            slot.release()
+
+        if (
+            self._hedge_policy is not None
+            and not response.from_cache
+            and slot.acquired_at is not None
+        ):
+            # latency of the last attempt, excluding queued time and retry delays
+            self._hedge_policy.observe(host, time.perf_counter() - slot.acquired_at)
+        return response
+
+    async def _send(
+        self, session: ClientSession, url: str, headers: Dict[str, str], **kwargs
+    ) -> Response:
+        """Send request and read response body, or replay it from the archive"""
+        archive = self._archive
+        if archive is not None and archive.replaying:
+            archived = await archive.replay("GET", url)
+            return archived.to_response(json_decoder=self._json_decoder)
+
+        start = time.perf_counter()
+        resp = await session.get(url, headers=headers, **kwargs)
+        response = await Response.from_client_response(
+            resp,
+            json_decoder=self._json_decoder,
+            spill_threshold=self._spill_threshold,
+            spill_dir=self._spill_dir,
+        )
+        if archive is not None:
+            archive.save_response(
+                response, url=url, elapsed=time.perf_counter() - start
+            )
+        return response
+
+    async def _hedged_get(
+        self,
+        session: ClientSession,
+        policy: HedgePolicy,
+        url: str,
+        headers: Dict[str, str],
+        priority: int,
+        ctx: Optional[_TraceContext],
+        **kwargs,
+    ) -> Tuple[Response, Optional[_TraceContext]]:
+        """Send a request and, if it is slower than the host's hedge delay, a
+        duplicate request. Returns the first successful response and the trace context
+        of the request that produced it."""
+        sent = asyncio.get_event_loop().create_future()
+        primary = asyncio.ensure_future(
+            self._attempt(session, url, headers, priority, ctx, sent, **kwargs)
+        )
+        # attempt: trace context
+        attempts = {primary: ctx}
+
+        try:
+            # hedge delay starts once the request is sent, not while it is queued
+            await asyncio.wait([primary, sent], return_when=asyncio.FIRST_COMPLETED)
+            delay = policy.delay(urlsplit(url).netloc)
+            if delay is not None and not primary.done():
+                await asyncio.wait([primary], timeout=delay)
+
+            if primary.done() or delay is None or not policy.try_hedge():
+                return await primary, ctx
+
+            hedge_ctx = ctx.hedge() if ctx is not None else None
+            hedge = asyncio.ensure_future(
+                self._attempt(session, url, headers, priority, hedge_ctx, **kwargs)
+            )
+            attempts[hedge] = hedge_ctx
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in sorted(done, key=lambda a: a is hedge):
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            policy.hedge_won()
+                        return attempt.result(), attempts[attempt]
+
+            # both requests failed
+            return await primary, ctx
+        finally:
+            # cancel the losing request
+            for attempt in attempts:
+                attempt.cancel()
+
+    def register_query_normalizer(
+        self, url_prefix: str, normalizer: Optional[QueryNormalizerType]
+    ) -> None:
+        """Normalize the query parameters of requests whose url (including base url,
+        excluding query) starts with `url_prefix` using `normalizer`. The longest
+        matching prefix wins. A `normalizer` of None removes the registration.
+
+        Examples
+        --------
+        >>> from hydrotools._restclient import AsyncRestClient, QueryNormalizer
+        >>>
+        >>> client = AsyncRestClient()
+        >>> client.register_query_normalizer(
+        ...     "https://waterservices.usgs.gov/nwis/",
+        ...     QueryNormalizer(unordered=["sites", "parameterCd"]),
+        ... )
+        """
+        if normalizer is None:
+            self._query_normalizers.pop(url_prefix, None)
+            return
+
+        self._query_normalizers[url_prefix] = normalizer
+        # longest prefix first
+        self._query_normalizers = dict(
+            sorted(self._query_normalizers.items(), key=lambda item: -len(item[0]))
+        )
+
+    def _normalize_query(
+        self, url: Optional[str], parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        normalizer = self._query_normalizer
+        if self._query_normalizers:
+            target = self.build_url(url)
+            for prefix, registered in self._query_normalizers.items():
+                if target.startswith(prefix):
+                    normalizer = registered
+                    break
+
+        if normalizer is None:
+            return parameters
+        return normalizer(parameters)
+
+    @MGET_SIGNATURE
+    async def mget(
+        self,
+        urls,
+        *,
+        parameters,
+        headers,
+        priority,
+        batch_timeout,
+        **kwargs: Any,
+    ) -> List[Response]:
+        """Make multiple asynchronous GET requests. If base url is set, each url is
+        appended to the base url. Passed headers are given precedent over instance
+        headers(if present), meaning passed headers replace instance headers with
+        matching keys.
+
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if AsyncRestClient headers set provided headers are
+            appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
+
+        Returns
+        -------
+        List[Response]
+        """
+        responses = {}
+        async for idx, resp in self.iter_mget(
+            urls,
+            parameters=parameters,
+            headers=headers,
+            priority=priority,
+            batch_timeout=batch_timeout,
+            **kwargs,
+        ):
+            responses[idx] = resp
+
+        # return in request order
+        return [responses[idx] for idx in range(len(responses))]
+
+    @ASYNC_ITER_MGET_SIGNATURE
+    async def iter_mget(
+        self,
+        urls,
+        *,
+        parameters,
+        headers,
+        priority,
+        batch_timeout,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[int, Response]]:
+        """Make multiple asynchronous GET requests, yielding each response as soon as
+        it is received. Responses are yielded in completion order, not request order,
+        paired with the index of the request that produced them. Arguments are handled
+        identically to `AsyncRestClient.mget`.
+
+        Unlike `AsyncRestClient.mget`, responses are not retained after they are
+        yielded. This allows callers to process and release response bodies
+        incrementally rather than holding every body in memory at once.
+
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if AsyncRestClient headers set provided headers are
+            appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
+
+        Yields
+        ------
+        Tuple[int, Response]
+            Request index and response
+        """
+        requests = self._expand_mget_args(urls, parameters, headers)
+        completed = self._iter_completed(
+            enumerate(requests), priority, kwargs, self._batch_deadline(batch_timeout)
+        )
+        try:
+            async for idx, task in completed:
+                yield idx, task.result()
+        finally:
+            await completed.aclose()
+
+    def _batch_deadline(self, batch_timeout: Optional[float]) -> Optional[float]:
+        """Event loop time by which a batch must complete, None if unbounded"""
+        if batch_timeout is None:
+            batch_timeout = self._timeout_policy.batch
+        if batch_timeout is None:
+            return None
+        return asyncio.get_event_loop().time() + batch_timeout
+
+    async def _iter_completed(
+        self,
+        requests,
+        priority: int,
+        kwargs: Dict[str, Any],
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[int, asyncio.Future]]:
+        """Issue `(index, get keyword arguments)` requests concurrently, yielding each
+        completed request task in completion order. Outstanding requests are cancelled
+        if iteration stops early. Raises `asyncio.TimeoutError` if requests are
+        outstanding at event loop time `deadline`.
+
+        If the client has a memory budget, requests wait for the budget before they
+        are sent. The bytes held by a yielded response are released when the caller
+        resumes iteration."""
+        budget = self._memory_budget
+        # request index: bytes held by its received, but undelivered, response
+        held = {}  # type: Dict[int, int]
+
+        # map of request task to its request index. tasks wait in the scheduler's
+        # queue until a request slot is available
+        tasks = {
+            asyncio.ensure_future(
+                self.get(**request, priority=priority, **kwargs)
+                if budget is None
+                else self._budgeted_get(budget, held, idx, request, priority, kwargs)
+            ): idx
+            for idx, request in requests
+        }
+
+        loop = asyncio.get_event_loop()
+        timeout = None
+        try:
+            while tasks:
+                if deadline is not None:
+                    timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError(
+                        f"{len(tasks)} requests outstanding at batch deadline"
+                    )
+                # yield simultaneously completed requests in request order
+                for task in sorted(done, key=tasks.get):
+                    # drop reference to task so its response can be released by caller
+                    idx = tasks.pop(task)
+                    try:
+                        yield idx, task
+                    finally:
+                        if budget is not None:
+                            budget.release(held.pop(idx, 0))
+        finally:
+            for task in tasks:
+                task.cancel()
+            if budget is not None:
+                # received responses that were never delivered
+                budget.release(sum(held.values()))
+                held.clear()
+
+    async def _budgeted_get(
+        self,
+        budget: MemoryBudget,
+        held: Dict[int, int],
+        idx: int,
+        request: Dict[str, Any],
+        priority: int,
+        kwargs: Dict[str, Any],
+    ) -> Response:
+        """`get` that waits for `budget` before it is sent. Records the bytes held by
+        its response in `held`, to be released once the response is delivered."""
+        reserved = await budget.acquire()
+        try:
+            response = await self.get(**request, priority=priority, **kwargs)
+        except BaseException:
+            budget.release(reserved)
+            raise
+
+        # spilled bodies are not held in memory
+        nbytes = response.size if response.spill_path is None else 0
+        held[idx] = nbytes
+        budget.settle(reserved, nbytes)
+        return response
+
+    @MGET_RESULTS_SIGNATURE
+    async def mget_results(
+        self,
+        urls,
+        *,
+        parameters,
+        headers,
+        priority,
+        batch_timeout,
+        checkpoint,
+        **kwargs: Any,
+    ) -> MGetResults:
+        """Make multiple asynchronous GET requests, recording the outcome of each
+        request rather than failing on the first error. Arguments are handled
+        identically to `AsyncRestClient.mget`.
+
+        A request fails if it raises or its response status is 429 or 5xx (after
+        retries). Failures do not discard other responses and can be reissued with
+        `AsyncRestClient.retry_failed`. Requests outstanding when the batch deadline
+        passes are cancelled and left pending.
+
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if AsyncRestClient headers set provided headers are
+            appended
+        priority : int
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`.
+        checkpoint : str, pathlib.Path, or MGetCheckpoint, optional
+            File recording completed requests. Requests recorded as completed by a
+            previous call with the same requests are skipped (see
+            `MGetResults.skipped`).
+
+        Returns
+        -------
+        MGetResults
+
+        Examples
+        --------
+        >>> results = await client.mget_results(urls, checkpoint="backfill.checkpoint")
+        >>> while results.failed and attempts < 3:
+        ...     results = await client.retry_failed(results)
+        """
+        requests = self._expand_mget_args(urls, parameters, headers)
+
+        skipped = ()
+        if checkpoint is not None:
+            if not isinstance(checkpoint, MGetCheckpoint):
+                checkpoint = MGetCheckpoint(checkpoint)
+            fingerprint = MGetCheckpoint.fingerprint(
+                self.build_url(r["url"], r["parameters"])
+                + repr(sorted(r["headers"].items()))
+                for r in requests
+            )
+            skipped = checkpoint.load(fingerprint, len(requests))
+
+        results = MGetResults(
+            requests,
+            priority=priority,
+            kwargs=kwargs,
+            checkpoint=checkpoint,
+            skipped=skipped,
+        )
+        await self._fill_results(
+            results,
+            [idx for idx in range(len(requests)) if idx not in skipped],
+            self._batch_deadline(batch_timeout),
+        )
+        return results
+
+    async def retry_failed(
+        self, results: MGetResults, batch_timeout: Optional[float] = None
+    ) -> MGetResults:
+        """Reissue the failed and pending requests of `results`, updating it in
+        place. Returns `results`. `batch_timeout` defaults to the client's
+        `TimeoutPolicy.batch`."""
+        indices = results.failed + results.pending
+        await self._fill_results(results, indices, self._batch_deadline(batch_timeout))
+        return results
+
+    async def _fill_results(
+        self, results: MGetResults, indices: List[int], deadline: Optional[float]
+    ) -> None:
+        requests = results.requests
+        completed = self._iter_completed(
+            ((idx, requests[idx]) for idx in indices),
+            results._priority,
+            results._kwargs,
+            deadline,
+        )
+        try:
+            async for idx, task in completed:
+                try:
+                    results._set_response(idx, task.result())
+                except Exception as e:
+                    results._set_error(idx, e)
+        except asyncio.TimeoutError:
+            # batch deadline passed, outstanding requests remain pending
+            pass
+        finally:
+            await completed.aclose()
+            if results.checkpoint is not None:
+                results.checkpoint.flush()
+
+    @ASYNC_PREFETCH_SIGNATURE
+    async def prefetch(
+        self,
+        urls,
+        *,
+        parameters,
+        headers,
+        priority,
+        batch_timeout,
+        on_progress,
+        **kwargs: Any,
+    ) -> PrefetchProgress:
+        """Make multiple GET requests to fill the cache, discarding their responses.
+        Arguments are handled identically to `AsyncRestClient.mget`. Later requests
+        for the same urls are answered from the cache, or share the prefetch's request
+        if it is still in flight.
+
+        Requests are queued at a low priority, so that requests made with the default
+        priority are sent first, and are subject to the client's rate limiter and
+        memory budget. Requests that fail are counted, not raised. Run a prefetch in
+        the background with `asyncio.ensure_future`; cancelling it cancels
+        outstanding requests.
+
+        Parameters
+        ----------
+        urls : List[Union[str, Url]]
+            Request urls
+        parameters : Dict[str, Union[str, List[str, int, float]]]
+            Query parameters
+        headers : Dict[str, str]
+            Request headers, if AsyncRestClient headers set provided headers are
+            appended
+        priority : int, default 10
+            Request queue priority. Lower values are scheduled first
+        batch_timeout : float, optional
+            Seconds all requests may take. Defaults to the client's
+            `TimeoutPolicy.batch`. Requests outstanding at the deadline are
+            cancelled and left pending.
+        on_progress : Callable[[PrefetchProgress], None], optional
+            Called with the prefetch's progress as each request completes or fails
+
+        Returns
+        -------
+        PrefetchProgress
+            Final progress
+
+        Examples
+        --------
+        >>> from hydrotools._restclient import AsyncRestClient
+        >>>
+        >>> async with AsyncRestClient() as client:
+        ...     prefetch = asyncio.ensure_future(client.prefetch(urls, on_progress=print))
+        ...     # answered from the cache once prefetched
+        ...     resp = await client.get(urls[0])
+        """
+        if not self._cache_enabled:
+            warnings.warn("prefetching with caching disabled", RuntimeWarning)
+
+        requests = self._expand_mget_args(urls, parameters, headers)
+        progress = PrefetchProgress(total=len(requests))
+        completed = self._iter_completed(
+            enumerate(requests), priority, kwargs, self._batch_deadline(batch_timeout)
+        )
+        try:
+            async for _, task in completed:
+                # bodies are not closed, callers coalesced onto a prefetch request
+                # share its response
+                response = None if task.exception() else task.result()
+                if response is not None and response.ok:
+                    progress = replace(
+                        progress,
+                        completed=progress.completed + 1,
+                        cached=progress.cached + response.from_cache,
+                    )
+                else:
+                    progress = replace(progress, failed=progress.failed + 1)
+                if on_progress is not None:
+                    on_progress(progress)
+        except asyncio.TimeoutError:
+            # batch deadline passed, outstanding requests remain pending
+            pass
+        finally:
+            await completed.aclose()
+        return progress
+
+    @staticmethod
+    def _expand_mget_args(urls, parameters, headers) -> List[Dict[str, Any]]:
+        """Expand `mget` arguments into a list of `get` keyword arguments, one per
+        request. Arguments passed as collections are indexed per request, otherwise
+        they are shared by all requests."""
+        ACCEPTED_MRO = (list, tuple, pd.Series, np.ndarray)
+        if urls is None and not parameters and not headers:
+            raise ValueError("Must provide urls, parameters, and/or headers.")
+
+        collection = None
+        _collections = []
+        for arg in [urls, parameters, headers]:
+            if isinstance(arg, ACCEPTED_MRO):
+                collection = arg
+                _collections.append(arg)
+
+        if collection is None:
+            raise ValueError("Must provide list of urls, parameters, and/or headers.")
+
+        # ensure if collection of args passed, their lengths' are equal
+        assert reduce(lambda x, y: x == y, map(len, _collections))
+
+        return [
+            {
+                "url": urls[idx] if isinstance(urls, ACCEPTED_MRO) else urls,
+                "parameters": parameters[idx]
+                if isinstance(parameters, ACCEPTED_MRO)
+                else parameters,
+                "headers": headers[idx]
+                if isinstance(headers, ACCEPTED_MRO)
+                else headers,
+            }
+            for idx in range(len((collection)))
+        ]
+
+    def build_url(
+        self,
+        url: Union[str, None] = None,
+        parameters: Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]] = {},
+    ):
+        """Quoted url including query parameters. If base url is set, url is appended
+        to the base url. Equivalent to `(Url(url) + parameters).quote_url`, but urls are
+        parsed once and quoted urls cached (see `UrlTemplate`)."""
+        if url is None:
+            if self.base_url is None:
+                raise ValueError("no url provided and no base url set")
+            # only base url
+            template = self._base_template
+
+        elif self.base_url is not None:
+            template = self._base_template.joinurl(url)
+
+        else:
+            template = compile_url(url)
+
+        # add query parameters and get quoted representation
+        return template.quote_url(parameters)
+
+    @property
+    def base_url(self) -> str:
+        """Base url"""
+        return self._base_url
+
+    @property
+    def headers(self) -> dict:
+        """GET request headers"""
+        return self._headers
+
+    @property
+    def scheduler_stats(self) -> SchedulerStats:
+        """Snapshot of request queue depth and in-flight request counts"""
+        return self._scheduler.stats()
+
+    @property
+    def request_stats(self) -> RequestStats:
+        """Snapshot of request and coalesced request counts"""
+        return RequestStats(requests=self._requests, coalesced=self._coalesced)
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        """Snapshot of retry and circuit breaker counts"""
+        if self._session is None:
+            return RetryStats()
+        return self._session.retry_stats
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        """Request instrumentation, None if not enabled"""
+        return self._instrumentation
+
+    @property
+    def trace_stats(self) -> Optional[TraceStats]:
+        """Snapshot of request latency percentiles, throughput, sizes, and cache
+        origin counts. None if instrumentation is not enabled."""
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.stats()
+
+    @property
+    def connection_pool(self) -> Optional[ConnectionPool]:
+        """Shared connection pool, None if the client owns its connection pool"""
+        return self._connection_pool
+
+    @property
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Snapshot of shared connection pool reuse counts. None if the client owns
+        its connection pool."""
+        if self._connection_pool is None:
+            return None
+        return self._connection_pool.stats()
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Per host request rate limit, None if requests are not rate limited"""
+        return self._rate_limiter
+
+    @property
+    def rate_limit_stats(self) -> Optional[RateLimitStats]:
+        """Snapshot of rate limit waits, 429 responses, and per host rates. None if
+        requests are not rate limited."""
+        if self._rate_limiter is None:
+            return None
+        return self._rate_limiter.stats()
+
+    @property
+    def query_normalizer(self) -> Optional[QueryNormalizerType]:
+        """Default query parameter normalizer"""
+        return self._query_normalizer
+
+    @property
+    def spill_threshold(self) -> Optional[int]:
+        """Body size in bytes above which responses are spilled to disk, None if
+        disabled"""
+        return self._spill_threshold
+
+    @property
+    def memory_budget(self) -> Optional[MemoryBudget]:
+        """Memory budget of batch requests, None if unbounded"""
+        return self._memory_budget
+
+    @property
+    def memory_budget_stats(self) -> Optional[MemoryBudgetStats]:
+        """Snapshot of bytes held by outstanding and undelivered batch responses.
+        None if batch requests are unbounded."""
+        if self._memory_budget is None:
+            return None
+        return self._memory_budget.stats()
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        """Hedged request policy, None if requests are not hedged"""
+        return self._hedge_policy
+
+    @property
+    def hedge_stats(self) -> Optional[HedgeStats]:
+        """Snapshot of hedged and won request counts and per host hedge delays. None
+        if requests are not hedged."""
+        if self._hedge_policy is None:
+            return None
+        return self._hedge_policy.stats()
+
+    @property
+    def timeout_policy(self) -> TimeoutPolicy:
+        """Request and batch time limits"""
+        return self._timeout_policy
+
+    @property
+    def archive(self) -> Optional[HTTPArchive]:
+        """Record / replay archive, None if not enabled"""
+        return self._archive
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Snapshot of cache hit, miss, and eviction counts. None if caching is disabled
+        or the cache backend does not report statistics."""
+        if self._cache.disabled or not hasattr(self._cache, "stats"):
+            return None
+        return self._cache.stats()
+
+    @property
+    def closed(self) -> bool:
+        """True if the underlying session has been closed or was never opened"""
+        return self._session is None or self._session.closed
+
+    async def close(self) -> None:
+        """Release aiohttp.ClientSession"""
+        if not self.closed:
+            if self._connection_pool is not None:
+                await self._connection_pool.release(self._session)
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncRestClient":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+def cached_response_to_client_response(
+    cached_response: CachedResponse, *, loop: asyncio.AbstractEventLoop
+):
+    """Translation from aiohttp_client_cache.CachedResponse to aiohttp.ClientResponse.
+    No longer used by `AsyncRestClient`, retained for backwards compatibility."""
+    # Naive 'casting' to ClientResponse. Likely needs work to cover all cases.
+    inst = ClientResponse(
+        cached_response.method,
+        cached_response.url,
+        writer=None,
+        continue100=False,
+        timer=None,
+        traces=[],
+        session=None,
+        request_info=cached_response.request_info,
+        loop=loop,
+    )
+    inst._body = cached_response._body
+    inst.version = cached_response.version
+    inst.status = cached_response.status
+    inst.reason = cached_response.reason
+    inst._headers = cached_response.headers
+    inst._raw_headers = cached_response.raw_headers
+    return inst
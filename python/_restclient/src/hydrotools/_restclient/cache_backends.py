@@ -0,0 +1,1363 @@
+"""
+==============
+Cache Backends
+==============
+Size bounded `aiohttp_client_cache` backends that report hit, miss, and eviction
+counts. Any backend can be passed to `RestClient` or `AsyncRestClient` using the
+`cache_backend` keyword argument. Persistent backends optionally store response
+bodies compressed (see `BODY_CODECS`).
+
+Classes
+-------
+- CacheStats
+- RecompressReport
+- CompressedCachedResponse
+- BoundedCacheBackend
+- MemoryLRUBackend
+- BoundedSQLiteBackend
+- ShardedFileBackend
+- ShardedSQLiteBackend
+
+"""
+from aiohttp_client_cache.backends import BaseCache, CacheBackend, ResponseOrKey
+from aiohttp_client_cache.backends.sqlite import SQLiteCache, SQLitePickleCache
+from aiohttp_client_cache.response import CachedResponse
+import asyncio
+import attr
+import bz2
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
+import lzma
+import os
+import pickle
+from pathlib import Path
+import re
+import time
+import warnings
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+import zlib
+
+__all__ = [
+    "BODY_CODECS",
+    "CacheStats",
+    "RecompressReport",
+    "CompressedCachedResponse",
+    "BoundedCacheBackend",
+    "MemoryLRUBackend",
+    "BoundedSQLiteBackend",
+    "ShardedFileBackend",
+    "ShardedSQLiteBackend",
+]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point in time snapshot of cache backend usage.
+
+    Attributes
+    ----------
+    hits: int
+        Number of lookups answered from the cache
+    misses: int
+        Number of lookups not found in the cache or found expired
+    evictions: int
+        Number of entries removed to keep the cache within its size bounds
+    revalidations: int
+        Number of expired entries renewed by a `304 Not Modified` response instead of
+        being downloaded again. Revalidated lookups are also counted as misses.
+    entries: int
+        Number of stored responses
+    size_bytes: int
+        Approximate size of stored responses in bytes
+    compression_ratio: float, optional
+        Uncompressed to stored size of the response bodies written since the cache
+        was opened. Bodies that do not compress are stored as is. None if compression
+        is disabled or no bodies were written.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    revalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+    compression_ratio: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class RecompressReport:
+    """Outcome of `BoundedCacheBackend.recompress`.
+
+    Attributes
+    ----------
+    entries: int
+        Number of responses rewritten
+    bytes_before: int
+        Stored size of the cache before it was rewritten
+    bytes_after: int
+        Stored size of the cache after it was rewritten
+    """
+
+    entries: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """`bytes_before / bytes_after`, None if the cache is empty"""
+        return self.bytes_before / self.bytes_after if self.bytes_after else None
+
+
+class _BodyCodec(NamedTuple):
+    compress: Callable[[bytes, Optional[int]], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _zstd_codec() -> _BodyCodec:
+    try:
+        import zstandard
+    except ModuleNotFoundError as e:
+        error_message = (
+            "zstandard package not found. Install using `pip install zstandard` or "
+            "`pip install hydrotools._restclient[zstd]`."
+        )
+        raise ModuleNotFoundError(error_message) from e
+
+    def compress(data: bytes, level: Optional[int]) -> bytes:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(
+            data
+        )
+
+    return _BodyCodec(compress, zstandard.ZstdDecompressor().decompress)
+
+
+def _stdlib_codec(module, default_level: int) -> Callable[[], _BodyCodec]:
+    def compress(data: bytes, level: Optional[int]) -> bytes:
+        level = default_level if level is None else level
+        if module is lzma:
+            return lzma.compress(data, preset=level)
+        return module.compress(data, level)
+
+    return lambda: _BodyCodec(compress, module.decompress)
+
+
+# codec name: codec factory. Codec names are stored with each compressed response.
+BODY_CODECS = {
+    "zlib": _stdlib_codec(zlib, 6),
+    "bz2": _stdlib_codec(bz2, 9),
+    "lzma": _stdlib_codec(lzma, 6),
+    "zstd": _zstd_codec,
+}  # type: Dict[str, Callable[[], _BodyCodec]]
+
+
+def _get_codec(codec: str) -> _BodyCodec:
+    try:
+        factory = BODY_CODECS[codec]
+    except KeyError:
+        raise ValueError(
+            f"unknown compression codec {codec!r}. Options: {list(BODY_CODECS)}"
+        ) from None
+    return factory()
+
+
+@attr.s(slots=True)
+class CompressedCachedResponse(CachedResponse):
+    """`CachedResponse` with a compressed body. The body is decompressed on first
+    read, so responses that are found expired or are revalidated by a new download
+    are never decompressed."""
+
+    codec: Optional[str] = attr.ib(default=None)
+
+    @classmethod
+    def compress(
+        cls, response: CachedResponse, codec: str, level: Optional[int] = None
+    ) -> CachedResponse:
+        """Copy of `response` with its body compressed by `codec`. Returns `response`
+        if compression does not reduce the body size."""
+        body = _body(response)
+        compressed = _get_codec(codec).compress(body, level)
+        if len(compressed) >= len(body):
+            return response
+
+        fields = {
+            a.name.lstrip("_"): getattr(response, a.name)
+            for a in attr.fields(CachedResponse)
+        }
+        fields.update(body=compressed, content=None, codec=codec)
+        return cls(**fields)
+
+    def _decompress(self) -> None:
+        if self.codec is not None:
+            self._body = _get_codec(self.codec).decompress(self._body)
+            self.codec = None
+
+    @property
+    def content(self):
+        self._decompress()
+        return CachedResponse.content.fget(self)
+
+    @content.setter
+    def content(self, value):
+        self._decompress()
+        self._content = value
+
+    async def text(self, *args, **kwargs):
+        self._decompress()
+        return await super().text(*args, **kwargs)
+
+    async def json(self, *args, **kwargs):
+        self._decompress()
+        return await super().json(*args, **kwargs)
+
+
+def _body(response: CachedResponse) -> bytes:
+    """Uncompressed body of `response`"""
+    if isinstance(response, CompressedCachedResponse):
+        response._decompress()
+    return response._body or b""
+
+
+class _CompressedStorage:
+    """Compresses the bodies of responses serialized by a `BaseCache`. Responses are
+    read back regardless of how they were stored."""
+
+    def _init_compression(
+        self, compression: Optional[str] = None, compression_level: Optional[int] = None
+    ) -> None:
+        if compression is not None:
+            # fail early on unknown or unavailable codecs
+            _get_codec(compression)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.body_bytes = 0
+        self.compressed_body_bytes = 0
+
+    def serialize(self, item: ResponseOrKey = None) -> Optional[bytes]:
+        if isinstance(item, CachedResponse):
+            stored = getattr(item, "codec", None)
+            if stored is not None and stored == self.compression:
+                # already compressed, e.g. a revalidated response that was not read
+                pass
+            elif self.compression is not None:
+                body = _body(item)
+                item = CompressedCachedResponse.compress(
+                    item, self.compression, self.compression_level
+                )
+                self.body_bytes += len(body)
+                self.compressed_body_bytes += len(item._body or b"")
+            elif stored is not None:
+                _body(item)
+        return super().serialize(item)
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.compressed_body_bytes:
+            return None
+        return self.body_bytes / self.compressed_body_bytes
+
+
+class _BoundedStorage:
+    """Bookkeeping shared by the size bounded `BaseCache` implementations"""
+
+    def _init_bounds(
+        self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be >= 1 or None")
+
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1 or None")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.entries = 0
+        self.size_bytes = 0
+
+    def _over_bounds(self, entries: int, size_bytes: int) -> bool:
+        if self.max_entries is not None and entries > self.max_entries:
+            return True
+        return self.max_bytes is not None and size_bytes > self.max_bytes
+
+
+def _expires_timestamp(item: ResponseOrKey) -> Optional[float]:
+    """Return POSIX timestamp a CachedResponse expires, None if it does not expire"""
+    expires = getattr(item, "expires", None)
+    if expires is None:
+        return None
+    # aiohttp_client_cache stores naive utc datetimes
+    return expires.replace(tzinfo=timezone.utc).timestamp()
+
+
+class BoundedCacheBackend(CacheBackend):
+    """Base class for cache backends that count hits and misses. Subclasses store
+    responses in a size bounded `BaseCache` exposing `evictions`, `entries`, and
+    `size_bytes` counters.
+
+    Expired responses that carry an `ETag` or `Last-Modified` header are kept and
+    revalidated using a conditional request (`If-None-Match` / `If-Modified-Since`).
+    If the server responds `304 Not Modified`, the stored response's expiration is
+    renewed rather than transferring the response body again.
+
+    Parameters
+    ----------
+    revalidate_expired: bool, default True
+        Revalidate expired responses with conditional requests. If False, expired
+        responses are deleted and requested again.
+    kwargs:
+        Keyword arguments for `aiohttp_client_cache.CacheBackend`
+    """
+
+    def __init__(self, *args, revalidate_expired: bool = True, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.revalidate_expired = revalidate_expired
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+
+    async def request(self, *args, **kwargs) -> Tuple[Optional[CachedResponse], Any]:
+        response, actions = await super().request(*args, **kwargs)
+        if response is not None and response.is_expired:
+            # CachedSession sends a conditional request when revalidate is set
+            actions.revalidate = True
+        return response, actions
+
+    async def get_response(self, key: str) -> Optional[CachedResponse]:
+        try:
+            response = await self.responses.read(key) or await self._get_redirect_response(
+                str(key)
+            )
+            # catch "quiet" deserialization errors
+            if response is not None:
+                assert response.method
+        except (AssertionError, AttributeError, KeyError, TypeError, pickle.PickleError):
+            response = None
+
+        if response is None:
+            self._misses += 1
+            return None
+
+        if self._is_revalidatable(response):
+            # body is only reused if the server confirms it is unchanged
+            self._misses += 1
+            return response
+
+        if not await self.is_cacheable(response):
+            self._misses += 1
+            await self.delete(key)
+            return None
+
+        self._hits += 1
+        return response
+
+    def _is_revalidatable(self, response: CachedResponse) -> bool:
+        return (
+            self.revalidate_expired
+            and not self.disabled
+            and response.is_expired
+            and ("ETag" in response.headers or "Last-Modified" in response.headers)
+        )
+
+    async def save_revalidated(
+        self, key: str, response: CachedResponse, expires: Optional[datetime]
+    ) -> None:
+        """Renew the expiration of a stored response confirmed unchanged by the server
+        (i.e. `304 Not Modified`)"""
+        response.expires = expires
+        await self.responses.write(key, response)
+        self._revalidations += 1
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of cache usage"""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=getattr(self.responses, "evictions", 0),
+            revalidations=self._revalidations,
+            entries=getattr(self.responses, "entries", 0),
+            size_bytes=getattr(self.responses, "size_bytes", 0),
+            compression_ratio=getattr(self.responses, "compression_ratio", None),
+        )
+
+    async def recompress(self) -> RecompressReport:
+        """Rewrite every stored response using the backend's current compression
+        settings, e.g. to compress a cache written without compression, change codec,
+        or decompress a cache. Responses are rewritten in place and least recently
+        used order is not preserved. SQLite databases are vacuumed afterwards so the
+        file shrinks.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> from hydrotools._restclient import BoundedSQLiteBackend
+        >>>
+        >>> backend = BoundedSQLiteBackend("nwisiv_cache", compression="zlib")
+        >>> report = asyncio.run(backend.recompress())
+        >>> print(f"{report.ratio:.1f}x smaller")
+        """
+        responses = self.responses
+        # listing keys opens the storage, which loads its totals
+        keys = [key async for key in responses.keys()]
+        before = getattr(responses, "size_bytes", 0)
+        rewritten = 0
+        for key in keys:
+            item = await responses.read(key)
+            if isinstance(item, CachedResponse):
+                await responses.write(key, item)
+                rewritten += 1
+
+        for method in ("flush", "vacuum"):
+            func = getattr(responses, method, None)
+            if func is not None:
+                await func()
+        return RecompressReport(
+            entries=rewritten,
+            bytes_before=before,
+            bytes_after=getattr(responses, "size_bytes", 0),
+        )
+
+
+class LRUDictCache(_BoundedStorage, BaseCache):
+    """In-memory storage that evicts least recently used items once `max_entries`
+    items or `max_bytes` of response bodies are stored."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._init_bounds(max_entries, max_bytes)
+        # key: (item, size in bytes). Ordered least to most recently used.
+        self._data = OrderedDict()  # type: OrderedDict[str, Tuple[ResponseOrKey, int]]
+
+    @staticmethod
+    def _item_size(item: ResponseOrKey) -> int:
+        if isinstance(item, CachedResponse):
+            return len(item._body or b"")
+        if isinstance(item, str):
+            return len(item.encode())
+        return len(item or b"")
+
+    async def read(self, key: str) -> ResponseOrKey:
+        try:
+            item, _ = self._data[key]
+        except KeyError:
+            return None
+
+        self._data.move_to_end(key)
+
+        # body stream of in-memory responses is exhausted after first read
+        try:
+            item.reset()
+        except AttributeError:
+            pass
+        return item
+
+    async def write(self, key: str, item: ResponseOrKey) -> None:
+        await self.delete(key)
+
+        size = self._item_size(item)
+        self._data[key] = (item, size)
+        self.entries += 1
+        self.size_bytes += size
+
+        # evict least recently used items. An item larger than max_bytes evicts itself.
+        while self._data and self._over_bounds(self.entries, self.size_bytes):
+            _, (_, evicted_size) = self._data.popitem(last=False)
+            self.entries -= 1
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        try:
+            _, size = self._data.pop(key)
+        except KeyError:
+            return
+        self.entries -= 1
+        self.size_bytes -= size
+
+    async def bulk_delete(self, keys: set) -> None:
+        for key in keys:
+            await self.delete(key)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self.entries = 0
+        self.size_bytes = 0
+
+    async def contains(self, key: str) -> bool:
+        return key in self._data
+
+    async def keys(self) -> AsyncIterable[str]:
+        for key in list(self._data):
+            yield key
+
+    async def values(self) -> AsyncIterable[ResponseOrKey]:
+        for item, _ in list(self._data.values()):
+            yield item
+
+    async def size(self) -> int:
+        return len(self._data)
+
+
+class MemoryLRUBackend(BoundedCacheBackend):
+    """Non-persistent, in-memory cache backend with least recently used eviction.
+
+    Parameters
+    ----------
+    max_entries: int, optional, default None
+        Maximum number of cached responses. None is unlimited.
+    max_bytes: int, optional, default None
+        Maximum total size of cached response bodies in bytes. None is unlimited.
+    kwargs:
+        Additional keyword arguments for `BoundedCacheBackend` (e.g.
+        `revalidate_expired`, `expire_after`, `allowed_codes`)
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient, MemoryLRUBackend
+    >>>
+    >>> backend = MemoryLRUBackend(max_bytes=256 * 1024**2, expire_after=3600)
+    >>> client = RestClient(cache_backend=backend)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.responses = LRUDictCache(max_entries=max_entries, max_bytes=max_bytes)
+
+
+class BoundedSQLitePickleCache(_CompressedStorage, _BoundedStorage, SQLitePickleCache):
+    """SQLite storage that tracks the size, expiry, and last access time of each item.
+    Once `max_bytes` is exceeded, expired items are evicted first, followed by least
+    recently used items. Response bodies are optionally stored compressed.
+
+    Tables created by `aiohttp_client_cache.SQLiteBackend` are migrated in place.
+    Last access times only order evictions, so they are not recorded when `max_bytes`
+    is None. Otherwise they are buffered and written with the next write, once
+    `access_batch_size` are buffered, or when the cache is closed.
+    """
+
+    _COLUMNS = {"size": "INTEGER", "expires": "REAL", "accessed": "REAL"}
+    # bound on the number of placeholders in a statement
+    _MAX_VARIABLES = 500
+    access_batch_size = 64
+
+    def __init__(
+        self,
+        filename: str,
+        table_name: str = "responses",
+        max_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(filename, table_name, **kwargs)
+        self._init_bounds(max_bytes=max_bytes)
+        self._init_compression(compression, compression_level)
+        # key: last access time, not yet written
+        self._accessed = {}  # type: Dict[str, float]
+
+    async def _init_db(self):
+        await super()._init_db()
+        db = self._connection
+
+        # add bookkeeping columns to tables created without them
+        cursor = await db.execute(f"PRAGMA table_info(`{self.table_name}`)")
+        existing = {row[1] for row in await cursor.fetchall()}
+        for column, column_type in self._COLUMNS.items():
+            if column not in existing:
+                await db.execute(
+                    f"ALTER TABLE `{self.table_name}` ADD COLUMN {column} {column_type}"
+                )
+
+        await db.execute(
+            f"UPDATE `{self.table_name}` SET size=length(value), accessed=0 "
+            "WHERE size IS NULL"
+        )
+        await db.commit()
+        await self._update_totals(db)
+        return db
+
+    async def _update_totals(self, db) -> None:
+        cursor = await db.execute(
+            f"SELECT COUNT(key), COALESCE(SUM(size), 0) FROM `{self.table_name}`"
+        )
+        self.entries, self.size_bytes = await cursor.fetchone()
+
+    async def _sizes(self, db, keys: List[str]) -> List[int]:
+        """Stored sizes of the items of `keys` that exist"""
+        sizes = []
+        for idx in range(0, len(keys), self._MAX_VARIABLES):
+            chunk = keys[idx : idx + self._MAX_VARIABLES]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor = await db.execute(
+                f"SELECT COALESCE(size, 0) FROM `{self.table_name}` "
+                f"WHERE key IN ({placeholders})",
+                tuple(chunk),
+            )
+            sizes.extend(size for (size,) in await cursor.fetchall())
+        return sizes
+
+    async def read(self, key: str) -> ResponseOrKey:
+        item = await super().read(key)
+        if item is not None and self.max_bytes is not None:
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.access_batch_size:
+                async with self.get_connection(commit=True) as db:
+                    await self._write_accessed(db, self._take_accessed())
+        return item
+
+    def _take_accessed(self) -> Dict[str, float]:
+        accessed, self._accessed = self._accessed, {}
+        return accessed
+
+    async def _write_accessed(self, db, accessed: Dict[str, float]) -> None:
+        if accessed:
+            await db.executemany(
+                f"UPDATE `{self.table_name}` SET accessed=? WHERE key=?",
+                [(t, key) for key, t in accessed.items()],
+            )
+
+    async def write(self, key: str, item: ResponseOrKey) -> None:
+        value = self.serialize(item)
+        async with self.get_connection(commit=True) as db:
+            await self._write_rows(
+                db, [(key, value, _expires_timestamp(item))], self._take_accessed()
+            )
+
+    async def _write_rows(
+        self,
+        db,
+        rows: List[Tuple[str, bytes, Optional[float]]],
+        accessed: Dict[str, float],
+    ) -> None:
+        """Insert or replace `(key, serialized item, expires timestamp)` rows with
+        distinct keys and write buffered access times, then evict items if over
+        bounds. Entry and size totals are updated from the replaced and new sizes."""
+        replaced = await self._sizes(db, [key for key, _, _ in rows])
+        now = time.time()
+        await db.executemany(
+            f"INSERT OR REPLACE INTO `{self.table_name}` "
+            "(key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+            [(key, value, len(value), expires, now) for key, value, expires in rows],
+        )
+        self.entries += len(rows) - len(replaced)
+        self.size_bytes += sum(len(value) for _, value, _ in rows) - sum(replaced)
+
+        await self._write_accessed(db, accessed)
+        if self._over_bounds(self.entries, self.size_bytes):
+            await self._evict(db)
+
+    async def _evict(self, db) -> None:
+        """Delete expired, then least recently used, items until within bounds"""
+        excess = self.size_bytes - self.max_bytes
+        evict = []  # type: List[str]
+        freed = 0
+        async with db.execute(
+            f"SELECT key, COALESCE(size, 0) FROM `{self.table_name}` "
+            "ORDER BY (expires IS NOT NULL AND expires < ?) DESC, accessed ASC",
+            (time.time(),),
+        ) as cursor:
+            async for key, size in cursor:
+                if excess <= 0:
+                    break
+                evict.append(key)
+                excess -= size
+                freed += size
+
+        await self._delete_rows(db, evict)
+        self.evictions += len(evict)
+        self.entries -= len(evict)
+        self.size_bytes -= freed
+
+    async def _delete_rows(self, db, keys: List[str]) -> None:
+        for idx in range(0, len(keys), self._MAX_VARIABLES):
+            chunk = keys[idx : idx + self._MAX_VARIABLES]
+            placeholders = ", ".join("?" for _ in chunk)
+            await db.execute(
+                f"DELETE FROM `{self.table_name}` WHERE key IN ({placeholders})",
+                tuple(chunk),
+            )
+
+    async def delete(self, key: str) -> None:
+        await self.bulk_delete({key})
+
+    async def bulk_delete(self, keys: set) -> None:
+        keys = list(keys)
+        for key in keys:
+            self._accessed.pop(key, None)
+        async with self.get_connection(commit=True) as db:
+            deleted = await self._sizes(db, keys)
+            await self._delete_rows(db, keys)
+        self.entries -= len(deleted)
+        self.size_bytes -= sum(deleted)
+
+    async def clear(self) -> None:
+        await super().clear()
+        self._accessed.clear()
+        self.entries = 0
+        self.size_bytes = 0
+
+    async def vacuum(self) -> None:
+        """Rebuild the database file, returning space freed by deleted or shrunk
+        items to the filesystem"""
+        async with self.get_connection() as db:
+            await db.execute("VACUUM")
+
+    async def close(self) -> None:
+        if self._accessed and self._connection is not None:
+            async with self.get_connection(commit=True) as db:
+                await self._write_accessed(db, self._take_accessed())
+        await super().close()
+
+
+class BoundedSQLiteBackend(BoundedCacheBackend):
+    """Persistent SQLite cache backend with an optional byte cap. When the cap is
+    exceeded expired responses are evicted first, then least recently used responses.
+    Databases written by `aiohttp_client_cache.SQLiteBackend` can be reused.
+
+    Parameters
+    ----------
+    cache_name: str, default "cache"
+        Database filename. Suffix '.sqlite' will be added if the name has no suffix.
+    max_bytes: int, optional, default None
+        Maximum total size of serialized responses in bytes. None is unlimited.
+    compression: str, optional, default None
+        Store response bodies compressed using a codec of `BODY_CODECS` ("zlib",
+        "bz2", "lzma", or "zstd", which requires `zstandard`). None stores bodies
+        uncompressed. Compressed and uncompressed responses can be read regardless of
+        this setting. See `BoundedCacheBackend.recompress` to convert an existing
+        cache.
+    compression_level: int, optional, default None
+        Codec compression level. None is the codec's default.
+    kwargs:
+        Additional keyword arguments for `BoundedCacheBackend` (e.g.
+        `revalidate_expired`, `expire_after`, `allowed_codes`) or `sqlite3.connect`
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient, BoundedSQLiteBackend
+    >>>
+    >>> backend = BoundedSQLiteBackend("nwisiv_cache", max_bytes=2 * 1024**3)
+    >>> client = RestClient(cache_backend=backend)
+    """
+
+    def __init__(
+        self,
+        cache_name: str = "cache",
+        max_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        autoclose: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(cache_name=cache_name, autoclose=autoclose, **kwargs)
+        self.responses = BoundedSQLitePickleCache(
+            cache_name,
+            "responses",
+            max_bytes=max_bytes,
+            compression=compression,
+            compression_level=compression_level,
+            **kwargs,
+        )
+        self.redirects = SQLiteCache(cache_name, "redirects", **kwargs)
+
+
+class ShardedFileCache(_CompressedStorage, _BoundedStorage, BaseCache):
+    """Filesystem storage that spreads items across nested shard directories, keeping
+    directory listings small for large caches. Item paths are
+    ``<cache_dir>/<ab>/<cd>/<abcd...>`` where ``abcd...`` is the hexadecimal cache key.
+    File modification times record last access and are used for least recently used
+    eviction once `max_bytes` is exceeded.
+
+    Size and access order are indexed in memory when the cache is opened; items
+    written by other processes afterward are not counted until the cache is reopened.
+    """
+
+    _HEX_KEY = re.compile(r"[0-9a-f]+")
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        shard_depth: int = 2,
+        shard_width: int = 2,
+        max_bytes: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._init_bounds(max_bytes=max_bytes)
+        self._init_compression(compression, compression_level)
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._shard_depth = shard_depth
+        self._shard_width = shard_width
+
+        # filename: size in bytes. Ordered least to most recently used.
+        self._index = OrderedDict()  # type: OrderedDict[str, int]
+        files = [
+            (path.stat().st_mtime, path.name, path.stat().st_size)
+            for path in self._files()
+        ]
+        for _, name, size in sorted(files):
+            self._index[name] = size
+        self.entries = len(self._index)
+        self.size_bytes = sum(self._index.values())
+
+    def _files(self) -> Iterable[Path]:
+        pattern = "/".join(["*"] * (self._shard_depth + 1))
+        return (
+            p
+            for p in self.cache_dir.glob(pattern)
+            if p.is_file() and p.suffix != ".tmp"
+        )
+
+    def _name(self, key: str) -> str:
+        # cache keys are hex digests. Hash anything else to a safe filename.
+        if self._HEX_KEY.fullmatch(key):
+            return key
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _path(self, name: str) -> Path:
+        w = self._shard_width
+        shards = [name[i * w : (i + 1) * w] for i in range(self._shard_depth)]
+        return self.cache_dir.joinpath(*shards, name)
+
+    @staticmethod
+    async def _run(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    @staticmethod
+    def _read_file(path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # record access for lru eviction
+        os.utime(path)
+        return data
+
+    @staticmethod
+    def _write_file(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename so concurrent readers never see a partial file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    async def read(self, key: str) -> ResponseOrKey:
+        name = self._name(key)
+        data = await self._run(self._read_file, self._path(name))
+        if data is None:
+            return None
+
+        if name in self._index:
+            self._index.move_to_end(name)
+        return self.deserialize(data)
+
+    async def write(self, key: str, item: ResponseOrKey) -> None:
+        name = self._name(key)
+        data = self.serialize(item) or b""
+        await self._run(self._write_file, self._path(name), data)
+
+        self._forget(name)
+        self._index[name] = len(data)
+        self.entries += 1
+        self.size_bytes += len(data)
+
+        evict = []
+        while self._index and self._over_bounds(self.entries, self.size_bytes):
+            evicted, size = self._index.popitem(last=False)
+            self.entries -= 1
+            self.size_bytes -= size
+            evict.append(evicted)
+
+        for evicted in evict:
+            await self._run(self._unlink, self._path(evicted))
+        self.evictions += len(evict)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, name: str) -> None:
+        size = self._index.pop(name, None)
+        if size is not None:
+            self.entries -= 1
+            self.size_bytes -= size
+
+    async def delete(self, key: str) -> None:
+        name = self._name(key)
+        await self._run(self._unlink, self._path(name))
+        self._forget(name)
+
+    async def bulk_delete(self, keys: set) -> None:
+        for key in keys:
+            await self.delete(key)
+
+    async def clear(self) -> None:
+        for path in list(self._files()):
+            await self._run(self._unlink, path)
+        self._index.clear()
+        self.entries = 0
+        self.size_bytes = 0
+
+    async def contains(self, key: str) -> bool:
+        return self._path(self._name(key)).is_file()
+
+    async def keys(self) -> AsyncIterable[str]:
+        for path in list(self._files()):
+            yield path.name
+
+    async def values(self) -> AsyncIterable[ResponseOrKey]:
+        async for key in self.keys():
+            item = await self.read(key)
+            if item is not None:
+                yield item
+
+    async def size(self) -> int:
+        return sum(1 for _ in self._files())
+
+
+class ShardedFileBackend(BoundedCacheBackend):
+    """Persistent cache backend that stores each response as a file in a sharded
+    directory tree, with an optional byte cap and least recently used eviction.
+    Redirects are stored in ``<cache_dir>/redirects.sqlite``.
+
+    Parameters
+    ----------
+    cache_dir: Union[str, Path], default "cache"
+        Cache root directory. Created if it does not exist.
+    max_bytes: int, optional, default None
+        Maximum total size of serialized responses in bytes. None is unlimited.
+    shard_depth: int, default 2
+        Number of nested shard directories
+    shard_width: int, default 2
+        Number of key characters used to name each shard directory
+    compression: str, optional, default None
+        Store response bodies compressed, see `BoundedSQLiteBackend`
+    compression_level: int, optional, default None
+        Codec compression level. None is the codec's default.
+    kwargs:
+        Additional keyword arguments for `BoundedCacheBackend` (e.g.
+        `revalidate_expired`, `expire_after`, `allowed_codes`)
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient, ShardedFileBackend
+    >>>
+    >>> backend = ShardedFileBackend("svi_cache", max_bytes=10 * 1024**3)
+    >>> client = RestClient(cache_backend=backend)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "cache",
+        max_bytes: Optional[int] = None,
+        shard_depth: int = 2,
+        shard_width: int = 2,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        autoclose: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(cache_name=str(cache_dir), autoclose=autoclose, **kwargs)
+        self.responses = ShardedFileCache(
+            cache_dir,
+            shard_depth=shard_depth,
+            shard_width=shard_width,
+            max_bytes=max_bytes,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        self.redirects = SQLiteCache(
+            str(self.responses.cache_dir / "redirects.sqlite"), "redirects"
+        )
+
+
+class _WALSQLiteShard(BoundedSQLitePickleCache):
+    """`BoundedSQLitePickleCache` in write-ahead log mode that buffers writes and
+    access times, committing them in a single transaction once `batch_size` items are
+    buffered or `flush_interval` seconds after the first buffered item. Buffered
+    items are visible to readers in the same process only."""
+
+    def __init__(
+        self,
+        filename: str,
+        batch_size: int = 64,
+        flush_interval: float = 0.1,
+        busy_timeout: float = 30.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(filename, "responses", timeout=busy_timeout, **kwargs)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # key: (serialized item, expires timestamp)
+        self._pending = {}  # type: Dict[str, Tuple[bytes, Optional[float]]]
+        self._flush_handle = None  # type: Optional[asyncio.TimerHandle]
+        self._flush_lock = asyncio.Lock()
+
+    async def _init_db(self):
+        db = self._connection
+        # WAL lets readers proceed while another process writes. The mode is
+        # persistent, and changing it requires an exclusive lock, so only set it once.
+        cursor = await db.execute("PRAGMA journal_mode")
+        (mode,) = await cursor.fetchone()
+        await cursor.close()
+        if mode.lower() != "wal":
+            await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        # create bookkeeping columns up front, so concurrently starting processes do
+        # not race to add them
+        await db.execute(
+            f"CREATE TABLE IF NOT EXISTS `{self.table_name}` "
+            "(key PRIMARY KEY, value, size INTEGER, expires REAL, accessed REAL)"
+        )
+        return await super()._init_db()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._flush_interval,
+                lambda: asyncio.ensure_future(self._flush_later()),
+            )
+
+    async def _flush_later(self) -> None:
+        self._flush_handle = None
+        try:
+            await self.flush()
+        except Exception as e:
+            # buffered items are kept and retried by the next flush
+            warnings.warn(f"cache shard {self.filename} flush failed: {e!r}", RuntimeWarning)
+            self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Commit buffered writes and access times"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        async with self._flush_lock:
+            if not self._pending and not self._accessed:
+                return
+            pending, self._pending = self._pending, {}
+            accessed, self._accessed = self._accessed, {}
+
+            try:
+                async with self.get_connection() as db:
+                    await self._write_rows(
+                        db,
+                        [
+                            (key, value, expires)
+                            for key, (value, expires) in pending.items()
+                        ],
+                        accessed,
+                    )
+                    await db.commit()
+            except BaseException:
+                # buffer items again, unless they were replaced while flushing
+                for key, item in pending.items():
+                    self._pending.setdefault(key, item)
+                for key, t in accessed.items():
+                    self._accessed.setdefault(key, t)
+                if self._connection is not None:
+                    await self._connection.rollback()
+                    # totals were updated by the rolled back transaction
+                    await self._update_totals(self._connection)
+                raise
+
+    async def read(self, key: str) -> ResponseOrKey:
+        pending = self._pending.get(key)
+        if pending is not None:
+            return self.deserialize(pending[0])
+
+        item = await SQLitePickleCache.read(self, key)
+        if item is not None and self.max_bytes is not None:
+            self._accessed[key] = time.time()
+            self._schedule_flush()
+        return item
+
+    async def write(self, key: str, item: ResponseOrKey) -> None:
+        self._pending[key] = (self.serialize(item), _expires_timestamp(item))
+        self._accessed.pop(key, None)
+        if len(self._pending) >= self._batch_size:
+            await self.flush()
+        else:
+            self._schedule_flush()
+
+    def _discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._pending.pop(key, None)
+            self._accessed.pop(key, None)
+
+    async def delete(self, key: str) -> None:
+        self._discard([key])
+        await super().delete(key)
+
+    async def bulk_delete(self, keys: set) -> None:
+        self._discard(keys)
+        await super().bulk_delete(keys)
+
+    async def clear(self) -> None:
+        self._pending.clear()
+        self._accessed.clear()
+        await super().clear()
+
+    async def contains(self, key: str) -> bool:
+        return key in self._pending or await super().contains(key)
+
+    async def keys(self) -> AsyncIterable[str]:
+        await self.flush()
+        async for key in super().keys():
+            yield key
+
+    async def values(self) -> AsyncIterable[ResponseOrKey]:
+        await self.flush()
+        async for value in super().values():
+            yield value
+
+    async def size(self) -> int:
+        await self.flush()
+        return await super().size()
+
+    async def close(self) -> None:
+        await self.flush()
+        await super().close()
+
+
+class ShardedSQLiteCache(BaseCache):
+    """Storage that spreads items across `n_shards` SQLite databases by key hash.
+    Each database is in write-ahead log mode and commits writes in batches, so many
+    processes can share the cache without serializing on a single database lock."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        n_shards: int = 8,
+        max_bytes: Optional[int] = None,
+        batch_size: int = 64,
+        flush_interval: float = 0.1,
+        busy_timeout: float = 30.0,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        if n_shards < 1:
+            raise ValueError("n_shards must be >= 1")
+
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # keys map to different shards if the number of shards changes
+        existing = self._shard_count(n_shards)
+        if existing != n_shards:
+            raise ValueError(
+                f"{self.cache_dir} has {existing} shards, n_shards is {n_shards}"
+            )
+
+        shard_max_bytes = None if max_bytes is None else max(1, max_bytes // n_shards)
+        self.shards = [
+            _WALSQLiteShard(
+                str(self.cache_dir / f"shard-{idx:03d}.sqlite"),
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                busy_timeout=busy_timeout,
+                max_bytes=shard_max_bytes,
+                compression=compression,
+                compression_level=compression_level,
+                **kwargs,
+            )
+            for idx in range(n_shards)
+        ]
+        self.max_bytes = max_bytes
+
+    def _shard_count(self, n_shards: int) -> int:
+        """Number of shards recorded in ``<cache_dir>/shards``, recording `n_shards`
+        if the cache is new"""
+        path = self.cache_dir / "shards"
+        if not path.exists():
+            tmp = path.with_name(f"shards.{os.getpid()}.tmp")
+            tmp.write_text(str(n_shards))
+            try:
+                # fails if another process recorded a count first
+                os.link(tmp, path)
+            except FileExistsError:
+                pass
+            finally:
+                tmp.unlink()
+        return int(path.read_text())
+
+    def _shard(self, key: str) -> _WALSQLiteShard:
+        # stable across processes, unlike hash()
+        return self.shards[zlib.crc32(key.encode()) % len(self.shards)]
+
+    @property
+    def entries(self) -> int:
+        return sum(shard.entries for shard in self.shards)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(shard.size_bytes for shard in self.shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self.shards)
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        compressed = sum(shard.compressed_body_bytes for shard in self.shards)
+        if not compressed:
+            return None
+        return sum(shard.body_bytes for shard in self.shards) / compressed
+
+    async def flush(self) -> None:
+        """Commit buffered writes of every shard"""
+        for shard in self.shards:
+            await shard.flush()
+
+    async def vacuum(self) -> None:
+        for shard in self.shards:
+            await shard.vacuum()
+
+    async def read(self, key: str) -> ResponseOrKey:
+        return await self._shard(key).read(key)
+
+    async def write(self, key: str, item: ResponseOrKey) -> None:
+        await self._shard(key).write(key, item)
+
+    async def delete(self, key: str) -> None:
+        await self._shard(key).delete(key)
+
+    async def bulk_delete(self, keys: set) -> None:
+        by_shard = {}  # type: Dict[int, set]
+        for key in keys:
+            by_shard.setdefault(id(self._shard(key)), set()).add(key)
+        for shard in self.shards:
+            if id(shard) in by_shard:
+                await shard.bulk_delete(by_shard[id(shard)])
+
+    async def clear(self) -> None:
+        for shard in self.shards:
+            await shard.clear()
+
+    async def contains(self, key: str) -> bool:
+        return await self._shard(key).contains(key)
+
+    async def keys(self) -> AsyncIterable[str]:
+        for shard in self.shards:
+            async for key in shard.keys():
+                yield key
+
+    async def values(self) -> AsyncIterable[ResponseOrKey]:
+        for shard in self.shards:
+            async for value in shard.values():
+                yield value
+
+    async def size(self) -> int:
+        return sum([await shard.size() for shard in self.shards])
+
+    async def close(self) -> None:
+        for shard in self.shards:
+            await shard.close()
+
+
+class ShardedSQLiteBackend(BoundedCacheBackend):
+    """Persistent cache backend for many processes sharing one cache, e.g. cron jobs
+    or pool workers. Responses are spread across `n_shards` SQLite databases in
+    ``<cache_dir>/shard-NNN.sqlite`` by key hash. Databases use write-ahead logging,
+    so reads are not blocked by writers, and buffer writes, committing up to
+    `batch_size` responses per transaction. Redirects are stored in
+    ``<cache_dir>/redirects.sqlite``.
+
+    Writes are visible to other processes once committed, at most `flush_interval`
+    seconds after they are made. Buffered writes are committed when the backend is
+    closed.
+
+    Parameters
+    ----------
+    cache_dir: Union[str, Path], default "cache"
+        Cache root directory. Created if it does not exist.
+    n_shards: int, default 8
+        Number of databases. Must match the number of databases of an existing cache.
+    max_bytes: int, optional, default None
+        Maximum total size of serialized responses in bytes, divided evenly between
+        shards. None is unlimited.
+    batch_size: int, default 64
+        Commit once this many writes are buffered by a shard
+    flush_interval: float, default 0.1
+        Maximum seconds a write is buffered before it is committed
+    busy_timeout: float, default 30.0
+        Seconds to wait for another process's write transaction before raising
+        `sqlite3.OperationalError` ("database is locked")
+    compression: str, optional, default None
+        Store response bodies compressed, see `BoundedSQLiteBackend`
+    compression_level: int, optional, default None
+        Codec compression level. None is the codec's default.
+    kwargs:
+        Additional keyword arguments for `BoundedCacheBackend` (e.g.
+        `revalidate_expired`, `expire_after`, `allowed_codes`)
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import ShardedSQLiteBackend
+    >>> from hydrotools.nwis_client import IVDataService
+    >>>
+    >>> # in each worker process
+    >>> backend = ShardedSQLiteBackend("nwisiv_cache", n_shards=16)
+    >>> service = IVDataService(cache_backend=backend)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "cache",
+        n_shards: int = 8,
+        max_bytes: Optional[int] = None,
+        batch_size: int = 64,
+        flush_interval: float = 0.1,
+        busy_timeout: float = 30.0,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        autoclose: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(cache_name=str(cache_dir), autoclose=autoclose, **kwargs)
+        self.responses = ShardedSQLiteCache(
+            cache_dir,
+            n_shards=n_shards,
+            max_bytes=max_bytes,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            busy_timeout=busy_timeout,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        self.redirects = SQLiteCache(
+            str(self.responses.cache_dir / "redirects.sqlite"),
+            "redirects",
+            timeout=busy_timeout,
+        )
@@ -0,0 +1,203 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
+import weakref
+
+import aiohttp
+
+__all__ = ["ConnectionPool", "PoolStats"]
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point in time snapshot of `ConnectionPool` usage.
+
+    Attributes
+    ----------
+    connections_created: int
+        Number of new connections established
+    connections_reused: int
+        Number of requests sent on a pooled (kept alive) connection
+    dns_cache_hits: int
+        Number of host name lookups answered by the DNS cache
+    dns_cache_misses: int
+        Number of host name lookups that required resolution
+    sessions: int
+        Number of client sessions currently using the pool
+    """
+
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    sessions: int = 0
+
+    @property
+    def reuse_ratio(self) -> Optional[float]:
+        """Fraction of connection acquisitions that reused a pooled connection"""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else None
+
+
+class ConnectionPool:
+    """Connection pool (`aiohttp.TCPConnector`) shared by multiple clients.
+
+    By default each `RestClient` / `AsyncRestClient`, and so each service client built
+    on them (e.g. `IVDataService`, `SVIClient`), owns a connection pool. Clients
+    constructed with the same `ConnectionPool` share connections, kept alive
+    connections, and DNS cache. A pool's connections are closed when the last client
+    using it is closed.
+
+    Connectors are bound to an event loop, so one connector is created per event
+    loop the pool is used from.
+
+    Parameters
+    ----------
+    limit: int, default 100
+        Maximum number of simultaneous connections. 0 is unlimited.
+    limit_per_host: int, default 0
+        Maximum number of simultaneous connections to a single host. 0 is unlimited.
+    ttl_dns_cache: int, optional, default 10
+        Seconds host name resolutions are cached. None caches forever.
+    keepalive_timeout: float, default 15.0
+        Seconds idle connections are kept open for reuse
+    enable_cleanup_closed: bool, default False
+        Forcibly close transports of connections closed while an SSL shutdown is in
+        progress. Some servers do not complete the SSL shutdown.
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import ConnectionPool
+    >>> from hydrotools.nwis_client import IVDataService
+    >>> from hydrotools.svi_client import SVIClient
+    >>>
+    >>> pool = ConnectionPool(limit=50, keepalive_timeout=60)
+    >>> iv = IVDataService(connection_pool=pool)
+    >>> svi = SVIClient(connection_pool=pool)
+    >>> pool.stats().reuse_ratio
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        ttl_dns_cache: Optional[int] = 10,
+        keepalive_timeout: float = 15.0,
+        enable_cleanup_closed: bool = False,
+    ) -> None:
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._ttl_dns_cache = ttl_dns_cache
+        self._keepalive_timeout = keepalive_timeout
+        self._enable_cleanup_closed = enable_cleanup_closed
+
+        # event loop: connector
+        self._connectors = (
+            weakref.WeakKeyDictionary()
+        )  # type: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]
+        self._sessions = weakref.WeakSet()  # type: weakref.WeakSet[aiohttp.ClientSession]
+        self._counts = {
+            "created": 0,
+            "reused": 0,
+            "dns_hits": 0,
+            "dns_misses": 0,
+        }  # type: Dict[str, int]
+        self._trace_config = None  # type: Optional[aiohttp.TraceConfig]
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def limit_per_host(self) -> int:
+        return self._limit_per_host
+
+    @property
+    def ttl_dns_cache(self) -> Optional[int]:
+        return self._ttl_dns_cache
+
+    @property
+    def keepalive_timeout(self) -> float:
+        return self._keepalive_timeout
+
+    def connector(self) -> aiohttp.TCPConnector:
+        """Connector of the running event loop, created on first use. Sessions using
+        it must be created with `connector_owner=False` and passed to
+        `ConnectionPool.acquire`."""
+        loop = asyncio.get_running_loop()
+        connector = self._connectors.get(loop)
+        if connector is None or connector.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=self._ttl_dns_cache,
+                keepalive_timeout=self._keepalive_timeout,
+                enable_cleanup_closed=self._enable_cleanup_closed,
+            )
+            self._connectors[loop] = connector
+        return connector
+
+    def acquire(self, session: aiohttp.ClientSession) -> None:
+        """Register `session` as a user of the pool"""
+        self._sessions.add(session)
+
+    async def release(self, session: aiohttp.ClientSession) -> None:
+        """Unregister `session`. Closes the session's connector if no other open
+        session uses it."""
+        self._sessions.discard(session)
+        connector = session.connector
+        if connector is None:
+            # closed sessions drop their connector, fall back to the loop's connector
+            connector = self._connectors.get(asyncio.get_running_loop())
+
+        in_use = any(
+            s.connector is connector and not s.closed for s in self._sessions
+        )
+        if connector is not None and not in_use:
+            await connector.close()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """`aiohttp.TraceConfig` that counts connection reuse and DNS cache hits.
+        Sessions using the pool should include it in their `trace_configs`."""
+        if self._trace_config is None:
+            counts = self._counts
+
+            def counter(key):
+                async def count(session, ctx, params):
+                    counts[key] += 1
+
+                return count
+
+            config = aiohttp.TraceConfig()
+            config.on_connection_create_end.append(counter("created"))
+            config.on_connection_reuseconn.append(counter("reused"))
+            config.on_dns_cache_hit.append(counter("dns_hits"))
+            config.on_dns_cache_miss.append(counter("dns_misses"))
+            config.freeze()
+            self._trace_config = config
+        return self._trace_config
+
+    def stats(self) -> PoolStats:
+        """Snapshot of connection reuse and DNS cache counts"""
+        return PoolStats(
+            connections_created=self._counts["created"],
+            connections_reused=self._counts["reused"],
+            dns_cache_hits=self._counts["dns_hits"],
+            dns_cache_misses=self._counts["dns_misses"],
+            sessions=sum(1 for s in self._sessions if not s.closed),
+        )
+
+    async def close(self) -> None:
+        """Close the running event loop's connector and its connections, including
+        those of sessions still using the pool"""
+        connector = self._connectors.pop(asyncio.get_running_loop(), None)
+        if connector is not None:
+            await connector.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"ConnectionPool(limit={self._limit}, limit_per_host={self._limit_per_host}, "
+            f"ttl_dns_cache={self._ttl_dns_cache}, "
+            f"keepalive_timeout={self._keepalive_timeout})"
+        )
@@ -0,0 +1,147 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+__all__ = ["HedgePolicy", "HedgeStats"]
+
+
+@dataclass(frozen=True)
+class HedgeStats:
+    """Point in time snapshot of `HedgePolicy` activity.
+
+    Attributes
+    ----------
+    requests: int
+        Number of requests eligible for hedging
+    hedged: int
+        Number of requests for which a duplicate (hedge) request was sent
+    hedge_wins: int
+        Number of hedged requests answered by the duplicate request first
+    delay_by_host: Dict[str, float]
+        Current hedge delay in seconds per host. Hosts with too few observations to
+        hedge are omitted.
+    """
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    delay_by_host: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def hedge_ratio(self) -> Optional[float]:
+        """Fraction of requests that were hedged"""
+        return self.hedged / self.requests if self.requests else None
+
+
+class HedgePolicy:
+    """Hedged request settings and per host latency history.
+
+    A request that has not completed within the `percentile` latency of recent
+    requests to its host is duplicated. The first successful response is used and
+    the other request is cancelled. Latencies are measured from when a request
+    acquires a request slot (see `RequestScheduler`), so time spent queued does not
+    trigger hedges. Responses served from the cache are not observed.
+
+    Parameters
+    ----------
+    percentile: float, default 95.0
+        Latency percentile, measured per host, after which a duplicate request is sent
+    max_hedge_ratio: float, default 0.05
+        Maximum number of hedged requests as a fraction of all requests. Bounds the
+        extra load placed on services.
+    min_delay: float, default 0.05
+        Minimum seconds to wait before hedging
+    min_samples: int, default 20
+        Number of latencies observed for a host before its requests are hedged
+    window: int, default 1000
+        Number of recent latencies retained per host
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import HedgePolicy, RestClient
+    >>>
+    >>> client = RestClient(hedge_policy=HedgePolicy(percentile=90, max_hedge_ratio=0.1))
+    >>> responses = client.mget(urls)
+    >>> client.hedge_stats.hedged, client.hedge_stats.hedge_wins
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be > 0 and < 100")
+
+        if not 0 < max_hedge_ratio <= 1:
+            raise ValueError("max_hedge_ratio must be > 0 and <= 1")
+
+        if min_delay < 0:
+            raise ValueError("min_delay must be >= 0")
+
+        if min_samples < 1:
+            raise ValueError("min_samples must be >= 1")
+
+        if window < min_samples:
+            raise ValueError("window must be >= min_samples")
+
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._latencies = defaultdict(
+            lambda: deque(maxlen=window)
+        )  # type: Dict[str, Deque[float]]
+        # host: hedge delay, invalidated by new observations
+        self._delays = {}  # type: Dict[str, float]
+
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def observe(self, host: str, latency: float) -> None:
+        """Record the latency in seconds of a completed request to `host`"""
+        self._latencies[host].append(latency)
+        self._delays.pop(host, None)
+
+    def delay(self, host: str) -> Optional[float]:
+        """Seconds after which a request to `host` is hedged, None if too few
+        latencies have been observed. Counts a request towards `max_hedge_ratio`."""
+        self._requests += 1
+        return self._delay(host)
+
+    def _delay(self, host: str) -> Optional[float]:
+        delay = self._delays.get(host)
+        if delay is None:
+            latencies = self._latencies.get(host)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            delay = max(self.min_delay, float(np.percentile(latencies, self.percentile)))
+            self._delays[host] = delay
+        return delay
+
+    def try_hedge(self) -> bool:
+        """Count a hedged request, unless doing so would exceed `max_hedge_ratio`"""
+        if self._hedged + 1 > self.max_hedge_ratio * self._requests:
+            return False
+        self._hedged += 1
+        return True
+
+    def hedge_won(self) -> None:
+        """Count a hedged request answered by the duplicate request"""
+        self._hedge_wins += 1
+
+    def stats(self) -> HedgeStats:
+        """Return a snapshot of hedged request counts and per host hedge delays"""
+        delays = {host: self._delay(host) for host in list(self._latencies)}
+        return HedgeStats(
+            requests=self._requests,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+            delay_by_host={h: d for h, d in delays.items() if d is not None},
+        )
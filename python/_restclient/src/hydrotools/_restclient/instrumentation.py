@@ -0,0 +1,493 @@
+from collections import deque
+from dataclasses import dataclass
+import time
+from types import SimpleNamespace
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+import warnings
+
+import aiohttp
+import numpy as np
+
+from .response import Response
+
+__all__ = [
+    "Instrumentation",
+    "LatencySummary",
+    "RequestTrace",
+    "TraceSink",
+    "TraceStats",
+]
+
+
+@dataclass(frozen=True)
+class RequestTrace:
+    """Timings and metadata of a single completed (or failed) request.
+
+    Durations are in seconds. Network phases are None when they did not occur, for
+    example `dns` and `connect` are None if a pooled connection was reused and every
+    network phase is None for responses served from the cache.
+
+    Attributes
+    ----------
+    url: str
+        Request url
+    method: str
+        Request method
+    status: int, optional
+        Response status code, None if the request failed
+    origin: str
+        "network", "cache" (served from the cache without a request), or
+        "revalidated" (expired cache entry confirmed unchanged by the server)
+    started: float
+        Unix time the request was submitted
+    queued: float
+        Time spent waiting for a request slot (see `RequestScheduler`)
+    dns: float, optional
+        Time spent resolving host names
+    connect: float, optional
+        Time spent establishing new connections, excluding DNS resolution
+    ttfb: float, optional
+        Time from sending the final attempt until its response headers were received
+    total: float
+        Time from acquiring a request slot until the response body was read,
+        including retries and backoff delays. For hedged requests, measured from the
+        original request.
+    size: int
+        Response body size in bytes
+    retries: int
+        Number of retry attempts
+    connection_reused: bool, optional
+        True if the final attempt used a pooled connection
+    error: str, optional
+        Exception representation if the request failed
+    hedged: bool, default False
+        True if a duplicate (hedge) request was sent (see `HedgePolicy`)
+    hedge_won: bool, default False
+        True if the duplicate request's response was used. Network phase timings are
+        those of the duplicate request.
+    """
+
+    url: str
+    method: str
+    status: Optional[int]
+    origin: str
+    started: float
+    queued: float
+    dns: Optional[float]
+    connect: Optional[float]
+    ttfb: Optional[float]
+    total: float
+    size: int
+    retries: int
+    connection_reused: Optional[bool] = None
+    error: Optional[str] = None
+    hedged: bool = False
+    hedge_won: bool = False
+
+
+# Receives each `RequestTrace` as requests complete
+TraceSink = Callable[[RequestTrace], None]
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """Distribution of a request phase duration in seconds. Percentiles are None if
+    no observations were made.
+
+    Attributes
+    ----------
+    count: int
+        Number of observations
+    mean: float, optional
+    p50: float, optional
+    p95: float, optional
+    p99: float, optional
+    max: float, optional
+    """
+
+    count: int = 0
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+    max: Optional[float] = None
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[Optional[float]]) -> "LatencySummary":
+        values = np.fromiter((s for s in samples if s is not None), dtype=float)
+        if not values.size:
+            return cls()
+
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return cls(
+            count=int(values.size),
+            mean=float(values.mean()),
+            p50=float(p50),
+            p95=float(p95),
+            p99=float(p99),
+            max=float(values.max()),
+        )
+
+
+@dataclass(frozen=True)
+class TraceStats:
+    """Point in time snapshot of recorded requests.
+
+    Counts are cumulative since the `Instrumentation` was created or last reset.
+    Latency distributions and throughput are computed over the most recent
+    `Instrumentation.max_traces` requests.
+
+    Attributes
+    ----------
+    requests: int
+        Number of recorded requests
+    errors: int
+        Number of requests that raised an exception
+    cache_hits: int
+        Number of responses served from the cache, including revalidated responses
+    revalidated: int
+        Number of expired cache entries confirmed unchanged by the server
+    retries: int
+        Total number of retry attempts
+    bytes: int
+        Total response body bytes
+    hedged: int
+        Number of requests for which a duplicate (hedge) request was sent
+    hedge_wins: int
+        Number of hedged requests answered by the duplicate request
+    window: int
+        Number of requests latency distributions and throughput are computed over
+    throughput: float
+        Requests per second over the window
+    bytes_per_second: float
+        Response body bytes per second over the window
+    total: LatencySummary
+    ttfb: LatencySummary
+    dns: LatencySummary
+    connect: LatencySummary
+    queued: LatencySummary
+    """
+
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    revalidated: int = 0
+    retries: int = 0
+    bytes: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    window: int = 0
+    throughput: float = 0.0
+    bytes_per_second: float = 0.0
+    total: LatencySummary = LatencySummary()
+    ttfb: LatencySummary = LatencySummary()
+    dns: LatencySummary = LatencySummary()
+    connect: LatencySummary = LatencySummary()
+    queued: LatencySummary = LatencySummary()
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Fraction of successful requests served from the cache"""
+        successful = self.requests - self.errors
+        return self.cache_hits / successful if successful else None
+
+
+class _TraceContext:
+    """Mutable per request state passed to `aiohttp.TraceConfig` callbacks as
+    `trace_request_ctx`. Retries and redirects of a request share a context."""
+
+    __slots__ = (
+        "url",
+        "method",
+        "started",
+        "_submitted",
+        "_acquired",
+        "_dns_start",
+        "_connect_start",
+        "_request_start",
+        "dns",
+        "connect",
+        "ttfb",
+        "attempts",
+        "redirects",
+        "connection_reused",
+        "hedged",
+        "hedge_won",
+        "_original",
+    )
+
+    def __init__(self, url: str, method: str = "GET") -> None:
+        self.url = url
+        self.method = method
+        self.started = time.time()
+        self._submitted = self._acquired = time.perf_counter()
+        self._dns_start = self._connect_start = self._request_start = 0.0
+        self.dns = self.connect = self.ttfb = None  # type: Optional[float]
+        self.attempts = self.redirects = 0
+        self.connection_reused = None  # type: Optional[bool]
+        self.hedged = self.hedge_won = False
+        # context of the request duplicated by a hedge request
+        self._original = None  # type: Optional[_TraceContext]
+
+    def acquired(self) -> None:
+        """Mark that the request acquired a request slot"""
+        self._acquired = time.perf_counter()
+
+    def hedge(self) -> "_TraceContext":
+        """Mark the request as hedged and return the context of its duplicate"""
+        self.hedged = True
+        ctx = _TraceContext(self.url, self.method)
+        ctx.hedged = ctx.hedge_won = True
+        ctx._original = self
+        return ctx
+
+    def _add(self, phase: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        setattr(self, phase, (getattr(self, phase) or 0.0) + elapsed)
+
+    def finish(
+        self,
+        response: Optional[Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> RequestTrace:
+        now = time.perf_counter()
+
+        if response is None:
+            origin = "network"
+        elif response.from_cache:
+            origin = "revalidated" if self.attempts else "cache"
+        else:
+            origin = "network"
+
+        # hedge requests are timed from the original request
+        first = self._original or self
+
+        connect = self.connect
+        if connect is not None and self.dns is not None:
+            # connection creation includes host resolution
+            connect = max(0.0, connect - self.dns)
+
+        return RequestTrace(
+            url=self.url,
+            method=self.method,
+            status=response.status if response is not None else None,
+            origin=origin,
+            started=first.started,
+            queued=first._acquired - first._submitted,
+            dns=self.dns,
+            connect=connect,
+            ttfb=self.ttfb,
+            total=now - first._acquired,
+            size=response.size if response is not None else 0,
+            retries=max(0, self.attempts - self.redirects - 1),
+            connection_reused=self.connection_reused,
+            error=repr(error) if error is not None else None,
+            hedged=self.hedged,
+            hedge_won=self.hedge_won,
+        )
+
+
+def _context(params: SimpleNamespace) -> Optional[_TraceContext]:
+    ctx = params.trace_request_ctx
+    return ctx if isinstance(ctx, _TraceContext) else None
+
+
+async def _on_request_start(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx.attempts += 1
+        ctx._request_start = time.perf_counter()
+
+
+async def _on_request_redirect(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx.redirects += 1
+
+
+async def _on_request_end(session, params, event) -> None:
+    # fired once response headers are received
+    ctx = _context(params)
+    if ctx is not None:
+        ctx.ttfb = time.perf_counter() - ctx._request_start
+
+
+async def _on_dns_resolvehost_start(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx._dns_start = time.perf_counter()
+
+
+async def _on_dns_resolvehost_end(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx._add("dns", ctx._dns_start)
+
+
+async def _on_connection_create_start(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx._connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx._add("connect", ctx._connect_start)
+        ctx.connection_reused = False
+
+
+async def _on_connection_reuseconn(session, params, event) -> None:
+    ctx = _context(params)
+    if ctx is not None:
+        ctx.connection_reused = True
+
+
+class Instrumentation:
+    """Opt-in request instrumentation for `RestClient` and `AsyncRestClient`.
+
+    Records a `RequestTrace` for each request sent by a client, including DNS,
+    connect, time to first byte, and total durations (collected using an
+    `aiohttp.TraceConfig`), response size, cache origin, and retry count. Traces are
+    aggregated into `TraceStats` snapshots (see `Instrumentation.stats`) and passed to
+    registered sinks as requests complete. Coalesced requests (see `coalesce_requests`)
+    and hedged requests (see `HedgePolicy`) are recorded once.
+
+    Parameters
+    ----------
+    sinks: Iterable[Callable[[RequestTrace], None]], default ()
+        Callables called with each `RequestTrace`. Sinks are called in the event loop
+        and should not block. Exceptions raised by sinks are emitted as warnings.
+    max_traces: int, default 10000
+        Number of recent traces retained for latency percentiles and throughput
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import Instrumentation, RestClient
+    >>>
+    >>> instrumentation = Instrumentation(sinks=[print])
+    >>> client = RestClient(instrumentation=instrumentation)
+    >>> resp = client.get("https://waterservices.usgs.gov/nwis/iv/?sites=01646500")
+    >>> stats = instrumentation.stats()
+    >>> stats.total.p95, stats.cache_hit_ratio
+    """
+
+    def __init__(
+        self, *, sinks: Iterable[TraceSink] = (), max_traces: int = 10000
+    ) -> None:
+        if max_traces < 1:
+            raise ValueError("max_traces must be >= 1")
+
+        self._sinks = list(sinks)  # type: List[TraceSink]
+        self._traces = deque(maxlen=max_traces)  # type: Deque[RequestTrace]
+        self._trace_config = None  # type: Optional[aiohttp.TraceConfig]
+        self.reset()
+
+    @property
+    def max_traces(self) -> int:
+        """Number of recent traces retained"""
+        return self._traces.maxlen
+
+    @property
+    def traces(self) -> Tuple[RequestTrace, ...]:
+        """Most recent traces, oldest first"""
+        return tuple(self._traces)
+
+    def add_sink(self, sink: TraceSink) -> None:
+        """Register a callable called with each `RequestTrace`"""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: TraceSink) -> None:
+        """Unregister a sink added with `add_sink`"""
+        self._sinks.remove(sink)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """`aiohttp.TraceConfig` that collects network phase timings. Shared by all
+        sessions using this `Instrumentation`."""
+        if self._trace_config is None:
+            config = aiohttp.TraceConfig()
+            config.on_request_start.append(_on_request_start)
+            config.on_request_redirect.append(_on_request_redirect)
+            config.on_request_end.append(_on_request_end)
+            config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+            config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+            config.on_connection_create_start.append(_on_connection_create_start)
+            config.on_connection_create_end.append(_on_connection_create_end)
+            config.on_connection_reuseconn.append(_on_connection_reuseconn)
+            config.freeze()
+            self._trace_config = config
+        return self._trace_config
+
+    def context(self, url: str, method: str = "GET") -> _TraceContext:
+        """Start timing a request to `url`. Pass the returned context to a session
+        request as `trace_request_ctx` and to `Instrumentation.record` once complete."""
+        return _TraceContext(url, method)
+
+    def record(
+        self,
+        ctx: _TraceContext,
+        response: Optional[Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> RequestTrace:
+        """Complete a request started with `Instrumentation.context`, update counts,
+        and pass its `RequestTrace` to each sink"""
+        trace = ctx.finish(response, error)
+
+        self._requests += 1
+        self._errors += error is not None
+        self._cache_hits += trace.origin != "network"
+        self._revalidated += trace.origin == "revalidated"
+        self._retries += trace.retries
+        self._bytes += trace.size
+        self._hedged += trace.hedged
+        self._hedge_wins += trace.hedge_won
+        self._traces.append(trace)
+
+        for sink in self._sinks:
+            try:
+                sink(trace)
+            except Exception as e:
+                warnings.warn(f"instrumentation sink {sink!r} raised {e!r}", RuntimeWarning)
+        return trace
+
+    def stats(self) -> TraceStats:
+        """Snapshot of request counts, latency percentiles, and throughput"""
+        traces = self._traces
+        throughput = bytes_per_second = 0.0
+        if traces:
+            start = min(t.started for t in traces)
+            end = max(t.started + t.queued + t.total for t in traces)
+            if end > start:
+                throughput = len(traces) / (end - start)
+                bytes_per_second = sum(t.size for t in traces) / (end - start)
+
+        return TraceStats(
+            requests=self._requests,
+            errors=self._errors,
+            cache_hits=self._cache_hits,
+            revalidated=self._revalidated,
+            retries=self._retries,
+            bytes=self._bytes,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+            window=len(traces),
+            throughput=throughput,
+            bytes_per_second=bytes_per_second,
+            total=LatencySummary.from_samples(t.total for t in traces),
+            ttfb=LatencySummary.from_samples(t.ttfb for t in traces),
+            dns=LatencySummary.from_samples(t.dns for t in traces),
+            connect=LatencySummary.from_samples(t.connect for t in traces),
+            queued=LatencySummary.from_samples(t.queued for t in traces),
+        )
+
+    def reset(self) -> None:
+        """Clear recorded traces and counts"""
+        self._traces.clear()
+        self._requests = 0
+        self._errors = 0
+        self._cache_hits = 0
+        self._revalidated = 0
+        self._retries = 0
+        self._bytes = 0
+        self._hedged = 0
+        self._hedge_wins = 0
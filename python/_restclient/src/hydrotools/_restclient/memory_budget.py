@@ -0,0 +1,214 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import threading
+from typing import Deque, Optional
+
+__all__ = ["MemoryBudget", "MemoryBudgetStats"]
+
+
+@dataclass(frozen=True)
+class MemoryBudgetStats:
+    """Point in time snapshot of `MemoryBudget` state.
+
+    Attributes
+    ----------
+    max_bytes: int
+        Memory budget in bytes
+    held_bytes: int
+        Bytes currently reserved by outstanding requests and held by undelivered
+        responses
+    peak_held_bytes: int
+        Largest number of held bytes observed
+    estimated_response_bytes: int, optional
+        Mean observed response size used to reserve bytes for outstanding requests.
+        None until a response has been received.
+    waiting: int
+        Number of requests waiting for the budget
+    waits: int
+        Total number of requests that had to wait for the budget
+    """
+
+    max_bytes: int
+    held_bytes: int = 0
+    peak_held_bytes: int = 0
+    estimated_response_bytes: Optional[int] = None
+    waiting: int = 0
+    waits: int = 0
+
+
+class MemoryBudget:
+    """Bound the bytes held by outstanding requests and received, but not yet
+    delivered, responses. New requests wait while the budget is exhausted and start
+    as held bytes are released.
+
+    Response sizes are not known until a response is received, so each outstanding
+    request reserves the mean size of the responses observed so far and the
+    reservation is settled to the actual size once the response arrives. Until the
+    first response arrives, requests are admitted one at a time. A request is always
+    admitted when nothing is held, so a single response larger than the budget does
+    not block progress.
+
+    A `MemoryBudget` may be shared by multiple clients to bound their combined
+    memory use, including clients whose event loops run in different threads (e.g.
+    `RestClient(background_loop=True)`). Waiting requests are admitted on their own
+    event loop.
+
+    Parameters
+    ----------
+    max_bytes: int
+        Memory budget in bytes
+
+    Examples
+    --------
+    >>> budget = MemoryBudget(max_bytes=256 * 1024**2)
+    >>>
+    >>> async def get(session, url):
+    ...     reserved = await budget.acquire()
+    ...     body = await fetch(session, url)
+    ...     budget.settle(reserved, len(body))
+    ...     return body
+    >>>
+    >>> # once the body has been consumed
+    >>> budget.release(len(body))
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self._max_bytes = max_bytes
+        self._held = 0
+        self._peak_held = 0
+        # running mean of observed response sizes
+        self._observed = 0
+        self._observed_bytes = 0
+        self._waits = 0
+        # FIFO of requests waiting for the budget
+        self._waiters = deque()  # type: Deque[asyncio.Future]
+        # guards budget state shared by event loops in different threads. Reentrant,
+        # admitting a waiter may release its bytes.
+        self._lock = threading.RLock()
+
+    @property
+    def max_bytes(self) -> int:
+        """Memory budget in bytes"""
+        return self._max_bytes
+
+    @property
+    def held_bytes(self) -> int:
+        """Bytes currently reserved or held"""
+        return self._held
+
+    @property
+    def estimated_response_bytes(self) -> Optional[int]:
+        """Mean observed response size, None if no response has been observed"""
+        if not self._observed:
+            return None
+        return self._observed_bytes // self._observed
+
+    def _reservation(self) -> int:
+        estimate = self.estimated_response_bytes
+        return self._max_bytes if estimate is None else estimate
+
+    def _admits(self, nbytes: int) -> bool:
+        return not self._held or self._held + nbytes <= self._max_bytes
+
+    async def acquire(self) -> int:
+        """Wait until the budget admits another request and reserve bytes for its
+        response. Returns the number of bytes reserved, which must later be passed
+        to `MemoryBudget.settle` or `MemoryBudget.release`."""
+        with self._lock:
+            nbytes = self._reservation()
+            if not self._waiters and self._admits(nbytes):
+                self._hold(nbytes)
+                return nbytes
+
+            self._waits += 1
+            future = asyncio.get_event_loop().create_future()
+            self._waiters.append(future)
+            # admits the request if only cancelled waiters were ahead of it
+            self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # bytes were reserved, but the waiter was cancelled before it ran
+                self.release(future.result())
+            raise
+
+    def settle(self, reserved: int, nbytes: int) -> None:
+        """Replace a reservation of `reserved` bytes with the `nbytes` actually held
+        by a received response. `nbytes` counts towards the response size estimate."""
+        with self._lock:
+            self._observed += 1
+            self._observed_bytes += nbytes
+            self._hold(nbytes - reserved)
+            self._dispatch()
+
+    def release(self, nbytes: int) -> None:
+        """Return `nbytes` reserved or held bytes to the budget and admit waiting
+        requests."""
+        with self._lock:
+            self._held -= nbytes
+            self._dispatch()
+
+    def _hold(self, nbytes: int) -> None:
+        self._held += nbytes
+        self._peak_held = max(self._peak_held, self._held)
+
+    def _dispatch(self) -> None:
+        """Admit waiting requests in arrival order while the budget allows"""
+        waiters = self._waiters
+        while waiters:
+            future = waiters[0]
+            if future.cancelled():
+                waiters.popleft()
+                continue
+
+            # reserve the current estimate, it may have changed while waiting
+            nbytes = self._reservation()
+            if not self._admits(nbytes):
+                break
+
+            waiters.popleft()
+            self._hold(nbytes)
+            self._admit(future, nbytes)
+
+    def _admit(self, future: asyncio.Future, nbytes: int) -> None:
+        """Complete a waiter's future with its reserved bytes on the waiter's loop"""
+        loop = future.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if loop is running:
+            future.set_result(nbytes)
+            return
+
+        # futures are not thread safe, complete it in its own loop's thread
+        try:
+            loop.call_soon_threadsafe(self._resolve, future, nbytes)
+        except RuntimeError:
+            # loop closed, the waiter will never run
+            self._held -= nbytes
+
+    def _resolve(self, future: asyncio.Future, nbytes: int) -> None:
+        if future.cancelled():
+            # cancelled after it was admitted from another thread
+            self.release(nbytes)
+        else:
+            future.set_result(nbytes)
+
+    def stats(self) -> MemoryBudgetStats:
+        """Return a snapshot of the budget's held bytes and waiting requests"""
+        with self._lock:
+            return MemoryBudgetStats(
+                max_bytes=self._max_bytes,
+                held_bytes=self._held,
+                peak_held_bytes=self._peak_held,
+                estimated_response_bytes=self.estimated_response_bytes,
+                waiting=sum(not f.cancelled() for f in self._waiters),
+                waits=self._waits,
+            )
@@ -0,0 +1,121 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable, Optional
+import asyncio
+
+__all__ = ["PREFETCH_PRIORITY", "Prefetch", "PrefetchProgress"]
+
+# Default request queue priority of prefetched requests. Requests made with the
+# default priority, 0, are scheduled first.
+PREFETCH_PRIORITY = 10
+
+
+@dataclass(frozen=True)
+class PrefetchProgress:
+    """Point in time snapshot of a prefetch's progress.
+
+    Attributes
+    ----------
+    total: int
+        Number of requests to prefetch
+    completed: int
+        Number of requests answered with a successful response, including `cached`
+    failed: int
+        Number of requests that raised or were answered with an unsuccessful status.
+        Failed responses are not cached.
+    cached: int
+        Number of requests already present in the cache
+    """
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    cached: int = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of requests neither completed nor failed"""
+        return self.total - self.completed - self.failed
+
+    @property
+    def done(self) -> bool:
+        """True if no requests are pending"""
+        return self.pending == 0
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of requests completed or failed"""
+        return (self.completed + self.failed) / self.total if self.total else 1.0
+
+
+class Prefetch:
+    """Handle to a prefetch running in the background, returned by
+    `RestClient.prefetch`. Progress is updated as requests complete.
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient
+    >>>
+    >>> client = RestClient(background_loop=True)
+    >>> prefetch = client.prefetch(urls)
+    >>> prefetch.progress().fraction
+    0.25
+    >>> prefetch.wait()
+    PrefetchProgress(total=4, completed=4, failed=0, cached=0)
+    """
+
+    def __init__(self, total: int) -> None:
+        # `asyncio.Future` or `concurrent.futures.Future` of the prefetch, and the
+        # callable that blocks on it. Attached once the prefetch is scheduled.
+        self._future = None
+        self._wait = None
+        self._progress = PrefetchProgress(total=total)
+
+    def _attach(
+        self, future, wait: Callable[[Optional[float]], PrefetchProgress]
+    ) -> None:
+        """Attach the prefetch's future. The handle is created before the prefetch is
+        scheduled, so progress reported while it runs is never lost."""
+        self._future = future
+        self._wait = wait
+
+    def _update(self, progress: PrefetchProgress) -> None:
+        self._progress = progress
+
+    def progress(self) -> PrefetchProgress:
+        """Return a snapshot of the prefetch's progress"""
+        return self._progress
+
+    @property
+    def done(self) -> bool:
+        """True if the prefetch finished or was cancelled"""
+        return self._future.done()
+
+    def cancel(self) -> None:
+        """Cancel outstanding requests. Completed requests remain cached."""
+        self._future.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> PrefetchProgress:
+        """Block until the prefetch finishes and return its final progress.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Seconds to wait. The prefetch continues if the wait times out.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the prefetch does not finish within `timeout` seconds
+        asyncio.CancelledError
+            If the prefetch was cancelled
+        """
+        try:
+            return self._wait(timeout)
+        except FutureTimeoutError as e:
+            raise asyncio.TimeoutError(
+                f"{self._progress.pending} prefetch requests pending"
+            ) from e
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._progress})"
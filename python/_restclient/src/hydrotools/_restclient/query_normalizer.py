@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from aiohttp_client_cache.cache_keys import create_key
+
+from .urllib import Variadic
+
+__all__ = [
+    "NormalizationReport",
+    "QueryNormalizer",
+    "QueryNormalizerType",
+    "measure_normalization",
+]
+
+# maps request query parameters to equivalent, canonical query parameters
+QueryNormalizerType = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+class QueryNormalizer:
+    """Canonicalize request query parameters so that logically identical queries
+    produce identical urls, and so share cache entries, in-flight requests, and
+    archive records.
+
+    Parameters are ordered by key. Values of `unordered` parameters, given either as
+    lists or `delimiter` separated strings, are sorted and deduplicated (e.g.
+    `parameterCd=00065,00060` becomes `parameterCd=00060,00065`). Values of
+    `lowercase` and `uppercase` parameters are case folded (e.g. `siteStatus=ALL`
+    becomes `siteStatus=all`). Value types are preserved: lists stay lists and
+    strings stay strings.
+
+    Only normalize parameters whose order or case the service ignores; the
+    normalized query is the query that is sent.
+
+    Parameters
+    ----------
+    unordered: Iterable[str], default ()
+        Names of parameters whose values are unordered sets
+    lowercase: Iterable[str], default ()
+        Names of parameters whose values are case insensitive, sent lower case
+    uppercase: Iterable[str], default ()
+        Names of parameters whose values are case insensitive, sent upper case
+    delimiter: str, default ","
+        Separator of multiple values within a single string value
+    sort_keys: bool, default True
+        Order parameters by key
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import QueryNormalizer, RestClient
+    >>>
+    >>> normalizer = QueryNormalizer(unordered=["sites"], lowercase=["siteStatus"])
+    >>> normalizer({"siteStatus": "ALL", "sites": "02339495,01646500"})
+    {'siteStatus': 'all', 'sites': '01646500,02339495'}
+    >>>
+    >>> client = RestClient()
+    >>> client.register_query_normalizer("https://waterservices.usgs.gov/", normalizer)
+    """
+
+    def __init__(
+        self,
+        *,
+        unordered: Iterable[str] = (),
+        lowercase: Iterable[str] = (),
+        uppercase: Iterable[str] = (),
+        delimiter: str = ",",
+        sort_keys: bool = True,
+    ) -> None:
+        self._unordered = frozenset(unordered)
+        self._case = {
+            **{key: str.upper for key in uppercase},
+            **{key: str.lower for key in lowercase},
+        }  # type: Dict[str, Callable[[str], str]]
+        self._delimiter = delimiter
+        self._sort_keys = sort_keys
+
+    def __call__(self, parameters: Mapping[str, Any]) -> Dict[str, Any]:
+        items = parameters.items()
+        if self._sort_keys:
+            items = sorted(items, key=lambda item: str(item[0]))
+
+        normalized = {}
+        for key, value in items:
+            unordered = key in self._unordered
+            case = self._case.get(key)
+            if unordered or case is not None:
+                value = self._normalize_value(value, unordered, case)
+            normalized[key] = value
+        return normalized
+
+    def _normalize_value(
+        self, value: Any, unordered: bool, case: Optional[Callable[[str], str]]
+    ) -> Any:
+        def normalize(values: List[str]) -> List[str]:
+            if case is not None:
+                values = [case(v) for v in values]
+            if unordered:
+                values = sorted(dict.fromkeys(values))
+            return values
+
+        delimiter = self._delimiter
+        if type(value) is Variadic:
+            # Variadic's delimiter is not stored, so rejoin its data in place
+            normalized = Variadic([])
+            normalized.data = delimiter.join(normalize(value.data.split(delimiter)))
+            return normalized
+        if isinstance(value, str):
+            return delimiter.join(normalize(value.split(delimiter)))
+        if isinstance(value, (list, tuple)):
+            return normalize([str(v) for v in value])
+        if case is not None:
+            return case(str(value))
+        return value
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryNormalizer(unordered={sorted(self._unordered)}, "
+            f"case_insensitive={sorted(self._case)})"
+        )
+
+
+@dataclass(frozen=True)
+class NormalizationReport:
+    """Cache key counts of a request stream with and without query normalization.
+
+    Attributes
+    ----------
+    requests: int
+        Number of requests
+    unique_keys: int
+        Number of distinct cache keys without normalization
+    normalized_unique_keys: int
+        Number of distinct cache keys with normalization
+    """
+
+    requests: int = 0
+    unique_keys: int = 0
+    normalized_unique_keys: int = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Cache hit rate of the stream replayed against an empty, unbounded cache"""
+        if not self.requests:
+            return None
+        return 1 - self.unique_keys / self.requests
+
+    @property
+    def normalized_hit_rate(self) -> Optional[float]:
+        """`hit_rate` with normalized queries"""
+        if not self.requests:
+            return None
+        return 1 - self.normalized_unique_keys / self.requests
+
+
+def measure_normalization(
+    urls: Iterable[str], normalizer: QueryNormalizerType, *, method: str = "GET"
+) -> NormalizationReport:
+    """Count the distinct cache keys of recorded request urls with and without
+    `normalizer` applied to their queries. Recorded urls are available from
+    `HTTPArchive` and `Instrumentation.traces`.
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import HTTPArchive, measure_normalization
+    >>> from hydrotools.nwis_client.iv import IV_QUERY_NORMALIZER
+    >>>
+    >>> archive = HTTPArchive("nwis_archive")
+    >>> report = measure_normalization((url for _, url in archive), IV_QUERY_NORMALIZER)
+    >>> report.hit_rate, report.normalized_hit_rate
+    """
+    requests = 0
+    keys = set()
+    normalized_keys = set()
+    for url in urls:
+        requests += 1
+        keys.add(create_key(method, url))
+
+        parts = urlsplit(url)
+        query = {
+            k: v[0] if len(v) == 1 else v
+            for k, v in parse_qs(parts.query, keep_blank_values=True).items()
+        }
+        normalized_query = urlencode(normalizer(query), doseq=True)
+        normalized_keys.add(
+            create_key(method, urlunsplit(parts._replace(query=normalized_query)))
+        )
+
+    return NormalizationReport(
+        requests=requests,
+        unique_keys=len(keys),
+        normalized_unique_keys=len(normalized_keys),
+    )
@@ -0,0 +1,258 @@
+import asyncio
+from dataclasses import dataclass, field
+import time
+from typing import Dict, Optional
+
+__all__ = ["RateLimiter", "RateLimitStats", "TokenBucket"]
+
+TOO_MANY_REQUESTS = 429
+
+
+class TokenBucket:
+    """Token bucket holding up to `burst` tokens, refilled at `rate` tokens per second.
+
+    Tokens are reserved rather than taken, so the bucket balance may go negative.
+    A reservation's delay is the time until the balance it left behind is refilled,
+    which grants tokens in the order they were reserved.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens added per second
+    burst: float, default 1.0
+        Bucket capacity. The number of requests that may be sent at once after the
+        bucket has been idle.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+
+        self._rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second"""
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        # settle the balance accrued at the old rate
+        self._refill()
+        self._rate = rate
+
+    @property
+    def tokens(self) -> float:
+        """Current token balance. Negative if tokens are reserved ahead of refill."""
+        self._refill()
+        return self._tokens
+
+    def reserve(self) -> float:
+        """Reserve a token. Returns the seconds until the token is available."""
+        self._refill()
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._rate)
+
+    def refund(self) -> None:
+        """Return a reserved, unused token"""
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    """Point in time snapshot of `RateLimiter` activity.
+
+    Attributes
+    ----------
+    acquired: int
+        Number of requests that were granted a token
+    delayed: int
+        Number of requests that waited for a token
+    total_delay: float
+        Seconds requests spent waiting for tokens
+    throttled: int
+        Number of 429 (Too Many Requests) responses observed
+    rate_decreases: int
+        Number of times an adaptive limiter lowered a host's rate
+    rates: Dict[str, float]
+        Current rate (requests per second) of each host
+    """
+
+    acquired: int = 0
+    delayed: int = 0
+    total_delay: float = 0.0
+    throttled: int = 0
+    rate_decreases: int = 0
+    rates: Dict[str, float] = field(default_factory=dict)
+
+
+class RateLimiter:
+    """Client side, per host request rate limit. Each host gets a `TokenBucket` that
+    allows `burst` back to back requests, then paces requests at `rate` per second.
+    Requests wait for a token before they are sent, so batches of requests (e.g.
+    `mget`) are spread evenly over time rather than tripping the service's throttle.
+    Cached responses do not consume tokens. Retries do.
+
+    In adaptive mode, a 429 (Too Many Requests) response multiplies the host's rate by
+    `decrease_factor`, down to `min_rate`. Responses to requests sent before the
+    decrease do not lower it further, so a burst of 429s counts once. Every other
+    response raises the host's rate by `increase * rate`, up to `rate`.
+
+    A `RateLimiter` may be shared by multiple clients to apply a single limit to all
+    of their requests.
+
+    Parameters
+    ----------
+    rate: float
+        Maximum sustained requests per second, per host
+    burst: float, default 1.0
+        Number of requests that may be sent back to back after a host has been idle
+    adaptive: bool, default False
+        Lower a host's rate when it responds with 429
+    min_rate: float, optional, default None
+        Lower bound of an adaptive rate. Defaults to `rate / 16`.
+    decrease_factor: float, default 0.5
+        Multiplier applied to a host's rate after a 429 response
+    increase: float, default 0.05
+        Fraction of `rate` added to a host's adaptive rate after each non-429 response
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RateLimiter
+    >>> from hydrotools.nwis_client import IVDataService
+    >>>
+    >>> # at most 5 requests per second to waterservices.usgs.gov, slowing down on 429
+    >>> service = IVDataService(rate_limiter=RateLimiter(5, burst=10, adaptive=True))
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        *,
+        adaptive: bool = False,
+        min_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase: float = 0.05,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be in (0, 1)")
+
+        min_rate = rate / 16 if min_rate is None else min_rate
+        if not 0 < min_rate <= rate:
+            raise ValueError("min_rate must be in (0, rate]")
+
+        self._rate = rate
+        self._burst = burst
+        self._adaptive = adaptive
+        self._min_rate = min_rate
+        self._decrease_factor = decrease_factor
+        self._increase = increase
+
+        self._buckets = {}  # type: Dict[str, TokenBucket]
+        # host: monotonic time of the last rate decrease
+        self._decreased_at = {}  # type: Dict[str, float]
+
+        self._acquired = 0
+        self._delayed = 0
+        self._total_delay = 0.0
+        self._throttled = 0
+        self._rate_decreases = 0
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self._rate, self._burst)
+        return bucket
+
+    async def acquire(self, host: str) -> float:
+        """Wait for a `host` token. Returns the monotonic time the token was granted,
+        to be passed to `RateLimiter.record` with the response status."""
+        bucket = self._bucket(host)
+        delay = bucket.reserve()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                bucket.refund()
+                raise
+            self._delayed += 1
+            self._total_delay += delay
+
+        self._acquired += 1
+        return time.monotonic()
+
+    def record(self, host: str, status: int, sent_at: float) -> None:
+        """Report the response status of a request granted a token at `sent_at`"""
+        if status == TOO_MANY_REQUESTS:
+            self._throttled += 1
+
+        if not self._adaptive:
+            return
+
+        bucket = self._bucket(host)
+        if status == TOO_MANY_REQUESTS:
+            if sent_at < self._decreased_at.get(host, float("-inf")):
+                # sent at the old rate, already accounted for
+                return
+            bucket.rate = max(self._min_rate, bucket.rate * self._decrease_factor)
+            self._decreased_at[host] = time.monotonic()
+            self._rate_decreases += 1
+        elif bucket.rate < self._rate:
+            bucket.rate = min(self._rate, bucket.rate + self._increase * self._rate)
+
+    def rate_for(self, host: str) -> float:
+        """Current rate (requests per second) of `host`"""
+        bucket = self._buckets.get(host)
+        return self._rate if bucket is None else bucket.rate
+
+    def stats(self) -> RateLimitStats:
+        """Snapshot of token waits, 429 responses, and per host rates"""
+        return RateLimitStats(
+            acquired=self._acquired,
+            delayed=self._delayed,
+            total_delay=self._total_delay,
+            throttled=self._throttled,
+            rate_decreases=self._rate_decreases,
+            rates={host: bucket.rate for host, bucket in self._buckets.items()},
+        )
+
+    @property
+    def rate(self) -> float:
+        """Maximum sustained requests per second, per host"""
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """Number of back to back requests allowed after a host has been idle"""
+        return self._burst
+
+    @property
+    def adaptive(self) -> bool:
+        """True if 429 responses lower a host's rate"""
+        return self._adaptive
+
+    def __repr__(self) -> str:
+        return (
+            f"RateLimiter(rate={self._rate}, burst={self._burst}, "
+            f"adaptive={self._adaptive})"
+        )
@@ -0,0 +1,331 @@
+import asyncio
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from .response import JSONDecoder, Response
+
+__all__ = ["ArchiveMissError", "ArchivedResponse", "HTTPArchive"]
+
+
+class ArchiveMissError(LookupError):
+    """Raised in replay mode when a request has no recorded exchange"""
+
+    def __init__(self, method: str, url: str) -> None:
+        self.method = method
+        self.url = url
+        super().__init__(f"no recorded exchange for {method} {url}")
+
+
+@dataclass(frozen=True)
+class ArchivedResponse:
+    """Recorded HTTP exchange.
+
+    Attributes
+    ----------
+    method: str
+        Request method
+    url: str
+        Request url
+    status: int
+        Response status code
+    reason: str, optional
+        Response status reason
+    headers: Tuple[Tuple[str, str], ...]
+        Response headers
+    elapsed: float
+        Seconds the original request took, from sending the request until the body
+        was read
+    body_path: pathlib.Path
+        File holding the response body
+    """
+
+    method: str
+    url: str
+    status: int
+    reason: Optional[str]
+    headers: Tuple[Tuple[str, str], ...]
+    elapsed: float
+    body_path: Path
+
+    @property
+    def body(self) -> bytes:
+        """Response body"""
+        return self.body_path.read_bytes()
+
+    def to_response(self, *, json_decoder: Optional[JSONDecoder] = None) -> Response:
+        """`Response` representation of recorded exchange"""
+        kwargs = {"json_decoder": json_decoder} if json_decoder is not None else {}
+        return Response(
+            self.status,
+            self.body,
+            headers=self.headers,
+            reason=self.reason,
+            url=self.url,
+            method=self.method,
+            **kwargs,
+        )
+
+
+class HTTPArchive:
+    """Directory of recorded HTTP exchanges for offline, deterministic runs.
+
+    In "record" mode, clients send requests normally and write each exchange (status,
+    headers, body, and elapsed time) to the archive. In "replay" mode, clients serve
+    requests from the archive without network access. A request without a recorded
+    exchange raises `ArchiveMissError`. Exchanges are keyed by request method and
+    url; request headers are not considered.
+
+    Bodies are stored byte for byte, so replayed payload sizes match the recorded
+    responses. Exchanges are stored as `<path>/<key[:2]>/<key>.json` metadata and
+    `<key>.body` files, written atomically, so an archive may be shared by concurrent
+    recording processes.
+
+    Parameters
+    ----------
+    path: str or pathlib.Path
+        Archive directory. Created in record mode if it does not exist.
+    mode: str, default "replay"
+        "record" or "replay"
+    simulate_latency: bool, default False
+        In replay mode, delay each response by its recorded elapsed time multiplied by
+        `latency_scale`
+    latency_scale: float, default 1.0
+        Simulated latency multiplier
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import HTTPArchive
+    >>> from hydrotools.nwis_client import IVDataService
+    >>>
+    >>> # record
+    >>> service = IVDataService(enable_cache=False, archive=HTTPArchive("nwis_archive", mode="record"))
+    >>> df = service.get(sites="01646500", startDT="2021-01-01", endDT="2021-02-01")
+    >>>
+    >>> # replay, no network access
+    >>> service = IVDataService(enable_cache=False, archive=HTTPArchive("nwis_archive"))
+    >>> df = service.get(sites="01646500", startDT="2021-01-01", endDT="2021-02-01")
+    """
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        mode: str = REPLAY,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+    ) -> None:
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(
+                f"invalid mode {mode!r}. Options: {[self.RECORD, self.REPLAY]}"
+            )
+
+        self._path = Path(path).expanduser()
+        self._mode = mode
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+
+        if mode == self.RECORD:
+            self._path.mkdir(parents=True, exist_ok=True)
+        elif not self._path.is_dir():
+            raise FileNotFoundError(f"archive {self._path} does not exist")
+
+    @property
+    def path(self) -> Path:
+        """Archive directory"""
+        return self._path
+
+    @property
+    def mode(self) -> str:
+        """Archive mode, `HTTPArchive.RECORD` or `HTTPArchive.REPLAY`"""
+        return self._mode
+
+    @property
+    def recording(self) -> bool:
+        """True if in record mode"""
+        return self._mode == self.RECORD
+
+    @property
+    def replaying(self) -> bool:
+        """True if in replay mode"""
+        return self._mode == self.REPLAY
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        """Archive key of a request"""
+        return hashlib.sha256(f"{method.upper()} {url}".encode()).hexdigest()
+
+    def _paths(self, method: str, url: str) -> Tuple[Path, Path]:
+        key = self.key(method, url)
+        shard = self._path / key[:2]
+        return shard / f"{key}.json", shard / f"{key}.body"
+
+    def __contains__(self, request: Tuple[str, str]) -> bool:
+        """`(method, url) in archive`"""
+        return self._paths(*request)[0].exists()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._path.glob("*/*.json"))
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Recorded `(method, url)` requests"""
+        for meta_path in self._path.glob("*/*.json"):
+            meta = json.loads(meta_path.read_text())
+            yield meta["method"], meta["url"]
+
+    def load(self, method: str, url: str) -> ArchivedResponse:
+        """Recorded exchange for a request.
+
+        Raises
+        ------
+        ArchiveMissError
+            If the request was not recorded
+        """
+        meta_path, body_path = self._paths(method, url)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except FileNotFoundError:
+            raise ArchiveMissError(method.upper(), url) from None
+
+        return ArchivedResponse(
+            method=meta["method"],
+            url=meta["url"],
+            status=meta["status"],
+            reason=meta["reason"],
+            headers=tuple((k, v) for k, v in meta["headers"]),
+            elapsed=meta["elapsed"],
+            body_path=body_path,
+        )
+
+    async def replay(self, method: str, url: str) -> ArchivedResponse:
+        """`HTTPArchive.load` a recorded exchange, waiting its recorded elapsed time if
+        `simulate_latency` is set"""
+        archived = self.load(method, url)
+        if self.simulate_latency:
+            await asyncio.sleep(archived.elapsed * self.latency_scale)
+        return archived
+
+    def save(
+        self,
+        method: str,
+        url: str,
+        *,
+        status: int,
+        body: bytes = b"",
+        headers: Iterable[Tuple[str, str]] = (),
+        reason: Optional[str] = None,
+        elapsed: float = 0.0,
+    ) -> None:
+        """Record an exchange, replacing any existing exchange for the request"""
+        self._save(method, url, status, headers, reason, elapsed, body=body)
+
+    def save_file(
+        self,
+        method: str,
+        url: str,
+        *,
+        status: int,
+        body_path: Union[str, Path],
+        headers: Iterable[Tuple[str, str]] = (),
+        reason: Optional[str] = None,
+        elapsed: float = 0.0,
+    ) -> None:
+        """Record an exchange whose body was written to `body_path`, copying the file
+        rather than reading it into memory"""
+        self._save(method, url, status, headers, reason, elapsed, body_path=body_path)
+
+    def save_response(
+        self, response: Response, *, url: Optional[str] = None, elapsed: float = 0.0
+    ) -> None:
+        """Record a `Response`. `url` is the request url, defaults to `response.url`
+        (which differs from the request url if the request was redirected). Spilled
+        bodies are copied from their temporary file."""
+        url = url if url is not None else response.url
+        spill_path = response.spill_path
+        if spill_path is not None:
+            self.save_file(
+                response.method,
+                url,
+                status=response.status,
+                body_path=spill_path,
+                headers=response.headers.items(),
+                reason=response.reason,
+                elapsed=elapsed,
+            )
+            return
+
+        self.save(
+            response.method,
+            url,
+            status=response.status,
+            body=response.content,
+            headers=response.headers.items(),
+            reason=response.reason,
+            elapsed=elapsed,
+        )
+
+    def _save(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Iterable[Tuple[str, str]],
+        reason: Optional[str],
+        elapsed: float,
+        *,
+        body: Optional[bytes] = None,
+        body_path: Union[str, Path, None] = None,
+    ) -> None:
+        if not self.recording:
+            raise RuntimeError("archive is not in record mode")
+
+        meta_path, archive_body_path = self._paths(method, url)
+        meta_path.parent.mkdir(exist_ok=True)
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "headers": [[k, v] for k, v in headers],
+            "elapsed": elapsed,
+        }
+
+        # body first, so a readable metadata file always has a complete body
+        if body_path is not None:
+            self._atomic_copy(Path(body_path), archive_body_path)
+        else:
+            self._atomic_write(archive_body_path, body)
+        self._atomic_write(meta_path, json.dumps(meta).encode())
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @staticmethod
+    def _atomic_copy(src: Path, path: Path) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def __repr__(self) -> str:
+        return f"HTTPArchive({str(self._path)!r}, mode={self._mode!r})"
@@ -0,0 +1,454 @@
+import codecs
+import io
+import json as _json
+import mmap
+import os
+from pathlib import Path
+import re
+import tempfile
+from typing import Any, AsyncIterator, BinaryIO, Callable, List, Optional, Union
+import weakref
+
+import aiohttp
+from aiohttp.helpers import parse_mimetype
+from aiohttp_client_cache.response import CachedResponse
+from multidict import CIMultiDict, CIMultiDictProxy
+
+__all__ = ["Response", "JSONDecoder", "SpilledBody", "get_json_decoder"]
+
+# Decode json from bytes
+JSONDecoder = Callable[[bytes], Any]
+
+# spilled bodies are streamed to disk in chunks of this size
+_SPILL_CHUNK_SIZE = 1 << 16
+
+_NON_WHITESPACE = re.compile(rb"\S")
+
+# matches application/json and structured syntax suffixes (e.g. application/geo+json)
+_JSON_CONTENT_TYPE = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+
+def _is_expected_content_type(content_type: str, expected: str) -> bool:
+    if expected == "application/json":
+        return _JSON_CONTENT_TYPE.match(content_type) is not None
+    return expected in content_type
+
+
+def _orjson_loads() -> JSONDecoder:
+    try:
+        import orjson
+    except ModuleNotFoundError as e:
+        error_message = (
+            "orjson package not found. Install using `pip install orjson` or "
+            "`pip install hydrotools._restclient[orjson]`."
+        )
+        raise ModuleNotFoundError(error_message) from e
+    return orjson.loads
+
+
+_JSON_DECODERS = {"stdlib": lambda: _json.loads, "orjson": _orjson_loads}
+
+
+def get_json_decoder(decoder: Union[str, JSONDecoder, None] = None) -> JSONDecoder:
+    """Return a json decoder that accepts bytes.
+
+    Parameters
+    ----------
+    decoder: str, callable, or None, default None
+        "stdlib" (`json.loads`), "orjson" (`orjson.loads`), or a callable that
+        deserializes json from bytes. None is "stdlib". Callables must also accept a
+        `memoryview`, which is passed for bodies spilled to disk (see `SpilledBody`).
+
+    Returns
+    -------
+    Callable[[bytes], Any]
+    """
+    if decoder is None:
+        decoder = "stdlib"
+
+    if callable(decoder):
+        return decoder
+
+    try:
+        return _JSON_DECODERS[decoder]()
+    except KeyError:
+        raise ValueError(
+            f"unknown json decoder {decoder!r}. Options: {list(_JSON_DECODERS)} or a callable"
+        ) from None
+
+
+def _remove_spill_file(path: Path, maps: List[mmap.mmap]) -> None:
+    for m in maps:
+        try:
+            m.close()
+        except BufferError:
+            # a memoryview of the body is still referenced
+            pass
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class SpilledBody:
+    """Response body written to a temporary file instead of being held in memory.
+    Created by `Response.from_client_response` for bodies larger than
+    `spill_threshold`. The file is removed by `SpilledBody.close` or when the body is
+    garbage collected.
+
+    Parameters
+    ----------
+    path: str or pathlib.Path
+        File holding the body. Owned, and removed, by the `SpilledBody`.
+    """
+
+    __slots__ = ("_path", "_size", "_maps", "_view", "_finalizer", "__weakref__")
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._path = Path(path)
+        self._size = self._path.stat().st_size
+        self._maps = []  # type: List[mmap.mmap]
+        self._view = None  # type: Optional[memoryview]
+        self._finalizer = weakref.finalize(
+            self, _remove_spill_file, self._path, self._maps
+        )
+
+    @classmethod
+    def write(cls, data: bytes, *, dir: Union[str, Path, None] = None) -> "SpilledBody":
+        """Write `data` to a new temporary file in `dir`"""
+        fd, path = tempfile.mkstemp(dir=dir, suffix=".body")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return cls(path)
+
+    @classmethod
+    async def from_chunks(
+        cls,
+        head: bytes,
+        chunks: AsyncIterator[bytes],
+        *,
+        dir: Union[str, Path, None] = None,
+    ) -> "SpilledBody":
+        """Write `head` followed by the remaining `chunks` to a new temporary file in
+        `dir`"""
+        fd, path = tempfile.mkstemp(dir=dir, suffix=".body")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(head)
+                async for chunk in chunks:
+                    f.write(chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return cls(path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def __len__(self) -> int:
+        return self._size
+
+    def buffer(self) -> memoryview:
+        """Read only, memory mapped view of the body. Pages are read from disk on
+        access and are not counted against the process heap."""
+        if self.closed:
+            raise ValueError("spilled body is closed")
+        if self._view is None:
+            with open(self._path, "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(m)
+            self._view = memoryview(m)
+        return self._view
+
+    def open(self) -> BinaryIO:
+        """New binary file object positioned at the start of the body"""
+        if self.closed:
+            raise ValueError("spilled body is closed")
+        return open(self._path, "rb")
+
+    def read(self) -> bytes:
+        """Copy of the body in memory"""
+        with self.open() as f:
+            return f.read()
+
+    def close(self) -> None:
+        """Unmap and remove the file"""
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                pass
+            self._view = None
+        self._finalizer()
+
+    def __repr__(self) -> str:
+        return f"SpilledBody({str(self._path)!r}, size={self._size})"
+
+
+async def _read_body(
+    response: aiohttp.ClientResponse,
+    spill_threshold: int,
+    spill_dir: Union[str, Path, None],
+) -> Union[bytes, SpilledBody]:
+    """Read `response` body, streaming it to a `SpilledBody` once more than
+    `spill_threshold` bytes are received"""
+    head = bytearray()
+    chunks = response.content.iter_chunked(_SPILL_CHUNK_SIZE).__aiter__()
+    async for chunk in chunks:
+        head += chunk
+        if len(head) > spill_threshold:
+            return await SpilledBody.from_chunks(bytes(head), chunks, dir=spill_dir)
+    return bytes(head)
+
+
+class Response:
+    """Lightweight, fully read HTTP response returned by `RestClient` and
+    `AsyncRestClient`. Network and cached responses are represented by the same type.
+    `text` and `json` are synchronous as the body is read before the response is
+    returned.
+
+    Bodies larger than the client's `spill_threshold` are held in a temporary file
+    (see `SpilledBody`) rather than in memory. `Response.buffer` and `Response.open`
+    provide access to the body without copying it onto the heap, `Response.content`
+    reads it into memory.
+
+    Attributes
+    ----------
+    status: int
+        HTTP status code
+    reason: str
+        HTTP status reason
+    url: str
+        Response url
+    method: str
+        Request method
+    headers: CIMultiDictProxy
+        Case insensitive response headers
+    from_cache: bool
+        True if response was retrieved from the cache
+    json_decoder: Callable[[bytes], Any]
+        Decoder `json` uses to deserialize the body, see `get_json_decoder`
+    """
+
+    __slots__ = (
+        "status",
+        "reason",
+        "url",
+        "method",
+        "headers",
+        "from_cache",
+        "json_decoder",
+        "_body",
+    )
+
+    def __init__(
+        self,
+        status: int,
+        body: Union[bytes, SpilledBody],
+        *,
+        headers: Union[CIMultiDict, CIMultiDictProxy, None] = None,
+        reason: Optional[str] = None,
+        url: str = "",
+        method: str = "GET",
+        from_cache: bool = False,
+        json_decoder: JSONDecoder = _json.loads,
+    ) -> None:
+        self.status = status
+        self.reason = reason
+        self.url = url
+        self.method = method
+        self.headers = (
+            headers
+            if isinstance(headers, CIMultiDictProxy)
+            else CIMultiDictProxy(CIMultiDict(headers or {}))
+        )
+        self.from_cache = from_cache
+        self.json_decoder = json_decoder
+        self._body = body
+
+    @classmethod
+    async def from_client_response(
+        cls,
+        response: Union[aiohttp.ClientResponse, CachedResponse],
+        *,
+        json_decoder: JSONDecoder = _json.loads,
+        spill_threshold: Optional[int] = None,
+        spill_dir: Union[str, Path, None] = None,
+    ) -> "Response":
+        """Read and release `response`, returning its `Response` representation.
+
+        Bodies larger than `spill_threshold` bytes are streamed to a temporary file in
+        `spill_dir` (default, the system temporary directory). None keeps every body
+        in memory. A body already read, e.g. by the cache, is written to the file and
+        its bytes are not retained.
+        """
+        if (
+            spill_threshold is not None
+            and isinstance(response, aiohttp.ClientResponse)
+            and response._body is None
+        ):
+            body = await _read_body(response, spill_threshold, spill_dir)
+        else:
+            body = await response.read()
+            if spill_threshold is not None and len(body) > spill_threshold:
+                body = SpilledBody.write(body, dir=spill_dir)
+        response.release()
+        return cls(
+            response.status,
+            body,
+            headers=response.headers,
+            reason=response.reason,
+            url=str(response.url),
+            method=response.method,
+            from_cache=bool(getattr(response, "from_cache", False)),
+            json_decoder=json_decoder,
+        )
+
+    @property
+    def content(self) -> bytes:
+        """Response body. Spilled bodies are read from disk into memory, prefer
+        `Response.buffer` or `Response.open` for large bodies."""
+        body = self._body
+        if isinstance(body, SpilledBody):
+            return body.read()
+        return body
+
+    @property
+    def buffer(self) -> memoryview:
+        """Response body without a copy. Memory mapped if the body was spilled."""
+        body = self._body
+        if isinstance(body, SpilledBody):
+            return body.buffer()
+        return memoryview(body)
+
+    @property
+    def size(self) -> int:
+        """Response body size in bytes"""
+        return len(self._body)
+
+    @property
+    def spill_path(self) -> Optional[Path]:
+        """Temporary file holding the body, None if the body is held in memory"""
+        body = self._body
+        return body.path if isinstance(body, SpilledBody) else None
+
+    def open(self) -> BinaryIO:
+        """Binary file object of the response body, e.g. for a streaming csv parser"""
+        body = self._body
+        if isinstance(body, SpilledBody):
+            return body.open()
+        return io.BytesIO(body)
+
+    def close(self) -> None:
+        """Remove the temporary file of a spilled body. The body is no longer
+        accessible. No effect if the body is held in memory."""
+        body = self._body
+        if isinstance(body, SpilledBody):
+            body.close()
+
+    @property
+    def ok(self) -> bool:
+        """True if status is less than 400"""
+        return self.status < 400
+
+    def raise_for_status(self) -> None:
+        """Raise `aiohttp.ClientResponseError` if status is 400 or greater"""
+        if not self.ok:
+            raise aiohttp.ClientResponseError(
+                None,
+                (),
+                status=self.status,
+                message=self.reason or "",
+                headers=self.headers,
+            )
+
+    def get_encoding(self) -> str:
+        """Body encoding from the Content-Type charset, falling back to utf-8"""
+        mimetype = parse_mimetype(self.headers.get("Content-Type", "").lower())
+        encoding = mimetype.parameters.get("charset")
+        if encoding:
+            try:
+                return codecs.lookup(encoding).name
+            except LookupError:
+                pass
+        return "utf-8"
+
+    def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        """Decoded response body"""
+        return str(self.buffer, encoding or self.get_encoding(), errors)
+
+    def json(
+        self,
+        *,
+        encoding: Optional[str] = None,
+        loads: Optional[Callable[[str], Any]] = None,
+        content_type: Optional[str] = "application/json",
+    ) -> Any:
+        """Deserialized json response body. None if the body is empty.
+
+        By default the body bytes are passed directly to `Response.json_decoder`
+        without first decoding them to `str`.
+
+        Spilled bodies (see `Response.spill_path`) are decoded from their file, but
+        the stdlib decoder and `loads` still hold the whole decoded text in memory
+        while deserializing. For very large bodies, parse `Response.open()` with a
+        streaming parser, or use the "orjson" decoder, which reads the memory mapped
+        `Response.buffer` without copying it to the heap.
+
+        Parameters
+        ----------
+        encoding: str, optional, default None
+            Body encoding. Defaults to the Content-Type charset, then utf-8.
+        loads: Callable[[str], Any], optional, default None
+            Deserialize from `str` using `loads` instead of `Response.json_decoder`
+        content_type: str, optional, default "application/json"
+            Expected Content-Type. None disables the check.
+
+        Raises
+        ------
+        aiohttp.ContentTypeError
+            If `content_type` is not None and does not match the response Content-Type
+        """
+        if content_type:
+            ctype = self.headers.get("Content-Type", "").lower()
+            if not _is_expected_content_type(ctype, content_type):
+                raise aiohttp.ContentTypeError(
+                    None,
+                    (),
+                    message=f"Attempt to decode JSON with unexpected mimetype: {ctype}",
+                    headers=self.headers,
+                )
+
+        body = self._body
+        spilled = isinstance(body, SpilledBody)
+        if spilled:
+            body = body.buffer()
+            if _NON_WHITESPACE.search(body) is None:
+                return None
+        # avoid copying potentially large bodies (i.e. bytes.strip)
+        elif not body or body.isspace():
+            return None
+
+        encoding = encoding or self.get_encoding()
+        if spilled and loads is None and self.json_decoder is _json.loads:
+            # decode from the file rather than a transcoded copy of the body
+            with io.TextIOWrapper(self._body.open(), encoding) as f:
+                return _json.load(f)
+        if loads is not None:
+            return loads(str(body, encoding))
+
+        if encoding not in ("utf-8", "ascii"):
+            return self.json_decoder(str(body, encoding).encode("utf-8"))
+        return self.json_decoder(body)
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status} {self.reason}] {self.method} {self.url}>"
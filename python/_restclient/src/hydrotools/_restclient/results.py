@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import aiohttp
+
+from .response import Response
+
+__all__ = ["MGetCheckpoint", "MGetError", "MGetResults"]
+
+
+class MGetError(Exception):
+    """Raised by `MGetResults.raise_for_failures` if any request failed"""
+
+    def __init__(self, errors: Dict[int, BaseException]) -> None:
+        self.errors = errors
+        idx, error = next(iter(errors.items()))
+        super().__init__(
+            f"{len(errors)} request(s) failed. First failure, request {idx}: {error!r}"
+        )
+
+
+def is_failure(response: Response) -> bool:
+    """True if a response should be retried later: server errors and 429 (Too Many
+    Requests). Other client errors (e.g. 404) are final and count as completed."""
+    return response.status >= 500 or response.status == 429
+
+
+class MGetResults:
+    """Outcome of each request of an `mget_results` call, by request index.
+
+    A request either succeeded (a `Response` is available), failed (the exception
+    raised, or an `aiohttp.ClientResponseError` for a retryable status, see
+    `is_failure`), or was skipped because a checkpoint recorded it as completed by a
+    previous run. A failure does not discard other requests' responses. Failed
+    requests can be reissued with `retry_failed`.
+
+    Examples
+    --------
+    >>> results = client.mget_results(urls, checkpoint="backfill.checkpoint")
+    >>> results = client.retry_failed(results)
+    >>> for idx, response in results.items():
+    ...     handle(idx, response)
+    >>> results.raise_for_failures()
+    """
+
+    def __init__(
+        self,
+        requests: List[Dict[str, Any]],
+        *,
+        priority: int = 0,
+        kwargs: Optional[Dict[str, Any]] = None,
+        checkpoint: Optional["MGetCheckpoint"] = None,
+        skipped: Iterable[int] = (),
+    ) -> None:
+        self._requests = requests
+        self._priority = priority
+        self._kwargs = kwargs or {}
+        self._checkpoint = checkpoint
+        self._responses = {}  # type: Dict[int, Response]
+        self._errors = {}  # type: Dict[int, BaseException]
+        self._skipped = set(skipped)  # type: Set[int]
+
+    def _set_response(self, idx: int, response: Response) -> None:
+        if is_failure(response):
+            # failure statuses are >= 400, so raise_for_status always raises
+            try:
+                response.raise_for_status()
+            except aiohttp.ClientResponseError as e:
+                self._set_error(idx, e)
+            return
+
+        self._errors.pop(idx, None)
+        self._responses[idx] = response
+        if self._checkpoint is not None:
+            self._checkpoint.add(idx)
+
+    def _set_error(self, idx: int, error: BaseException) -> None:
+        self._errors[idx] = error
+
+    @property
+    def requests(self) -> List[Dict[str, Any]]:
+        """`get` keyword arguments of each request, by index"""
+        return self._requests
+
+    @property
+    def checkpoint(self) -> Optional["MGetCheckpoint"]:
+        return self._checkpoint
+
+    @property
+    def succeeded(self) -> List[int]:
+        """Indices of requests with a response"""
+        return sorted(self._responses)
+
+    @property
+    def failed(self) -> List[int]:
+        """Indices of failed requests"""
+        return sorted(self._errors)
+
+    @property
+    def skipped(self) -> List[int]:
+        """Indices of requests completed by a previous run, according to the
+        checkpoint. Their responses are not available."""
+        return sorted(self._skipped)
+
+    @property
+    def pending(self) -> List[int]:
+        """Indices of requests without an outcome, e.g. if the call was cancelled"""
+        done = self._responses.keys() | self._errors.keys() | self._skipped
+        return [idx for idx in range(len(self._requests)) if idx not in done]
+
+    @property
+    def errors(self) -> Dict[int, BaseException]:
+        """Exception of each failed request"""
+        return dict(sorted(self._errors.items()))
+
+    @property
+    def complete(self) -> bool:
+        """True if every request succeeded or was skipped"""
+        return len(self._responses) + len(self._skipped) == len(self._requests)
+
+    def items(self) -> Iterator[Tuple[int, Response]]:
+        """Successful `(index, Response)` pairs in request order"""
+        for idx in self.succeeded:
+            yield idx, self._responses[idx]
+
+    def raise_for_failures(self) -> None:
+        """Raise `MGetError` if any request failed"""
+        if self._errors:
+            errors = self.errors
+            raise MGetError(errors) from next(iter(errors.values()))
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __getitem__(self, idx: int) -> Response:
+        """Response of request `idx`. Raises the request's exception if it failed, and
+        `KeyError` if it was skipped or has no outcome."""
+        if idx < 0:
+            idx += len(self._requests)
+        try:
+            return self._responses[idx]
+        except KeyError:
+            pass
+
+        if idx in self._errors:
+            raise self._errors[idx]
+        state = "skipped" if idx in self._skipped else "pending"
+        raise KeyError(f"request {idx} is {state}")
+
+    def __repr__(self) -> str:
+        return (
+            f"<MGetResults {len(self._requests)} requests: "
+            f"{len(self._responses)} succeeded, {len(self._errors)} failed, "
+            f"{len(self._skipped)} skipped>"
+        )
+
+
+class MGetCheckpoint:
+    """File recording which requests of an `mget_results` call completed, so a
+    restarted job requests only what is missing. The checkpoint is tied to its list
+    of requests; loading it for different requests raises `ValueError`.
+
+    Only request indices are recorded, not response bodies. Handle responses before
+    the job exits, or keep the persistent request cache enabled, so that completed
+    responses are not lost.
+
+    Parameters
+    ----------
+    path: str or pathlib.Path
+        Checkpoint file. Written atomically.
+    flush_every: int, default 50
+        Write the file after this many newly completed requests. The file is
+        always written when the call finishes, fails, or is cancelled.
+    """
+
+    def __init__(self, path: Union[str, Path], *, flush_every: int = 50) -> None:
+        self._path = Path(path).expanduser()
+        self._flush_every = flush_every
+        self._fingerprint = None  # type: Optional[str]
+        self._total = 0
+        self._completed = set()  # type: Set[int]
+        self._unflushed = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def completed(self) -> Set[int]:
+        """Indices of completed requests"""
+        return set(self._completed)
+
+    @staticmethod
+    def fingerprint(urls: Iterable[str]) -> str:
+        """Identifier of a list of request urls"""
+        digest = hashlib.sha256()
+        for url in urls:
+            digest.update(url.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str, total: int) -> Set[int]:
+        """Read completed indices for a list of `total` requests identified by
+        `fingerprint`. Empty if the file does not exist."""
+        self._fingerprint = fingerprint
+        self._total = total
+        self._unflushed = 0
+        try:
+            state = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            self._completed = set()
+            return set()
+
+        if state["fingerprint"] != fingerprint:
+            raise ValueError(
+                f"checkpoint {self._path} was written for a different list of requests"
+            )
+        self._completed = set(state["completed"])
+        return set(self._completed)
+
+    def add(self, idx: int) -> None:
+        """Record request `idx` as completed"""
+        self._completed.add(idx)
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write completed indices to the checkpoint file"""
+        if self._fingerprint is None:
+            raise RuntimeError("checkpoint has not been loaded")
+
+        state = {
+            "fingerprint": self._fingerprint,
+            "total": self._total,
+            "completed": sorted(self._completed),
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._unflushed = 0
+
+    def delete(self) -> None:
+        """Remove the checkpoint file, e.g. once a job has completed"""
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        self._completed = set()
+
+    def __repr__(self) -> str:
+        return f"MGetCheckpoint({str(self._path)!r})"
@@ -0,0 +1,221 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import time
+from typing import FrozenSet, Optional, Tuple, Type
+
+import aiohttp
+
+__all__ = [
+    "RetryPolicy",
+    "RetryStats",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RETRY_STATUS_CODES",
+]
+
+RETRY_STATUS_CODES = frozenset({503, 429, 301})
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised without making a request while a host's circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(
+            f"circuit breaker open for host {host!r}, retry in {retry_in:.1f}s"
+        )
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Describes which requests are retried, how long to wait between attempts, and
+    when to stop.
+
+    Delays use exponential backoff with "full jitter": a delay is drawn uniformly from
+    `[0, min(max_delay, base_delay * 2**attempt)]`. A `Retry-After` response header
+    (seconds or HTTP date) replaces the computed delay, up to `max_delay`.
+
+    Parameters
+    ----------
+    n_retries: int, default 3
+        Maximum number of retries after the first attempt
+    statuses: FrozenSet[int], default {301, 429, 503}
+        Response status codes that are retried
+    exceptions: Tuple[Type[BaseException], ...], default (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        Exceptions that are retried. The defaults cover connection resets, refused
+        connections, server disconnects, and timeouts.
+    base_delay: float, default 1.0
+        Backoff delay of the first retry in seconds
+    max_delay: float, default 60.0
+        Upper bound of any single delay in seconds
+    jitter: bool, default True
+        Randomize delays using full jitter. If False, delays are
+        `min(max_delay, base_delay * 2**attempt)`.
+    deadline: float, optional, default None
+        Maximum total seconds spent on a request, including retries and delays. A
+        retry is not attempted if its delay would exceed the deadline.
+    respect_retry_after: bool, default True
+        Honor `Retry-After` response headers
+    circuit_breaker_threshold: int, optional, default None
+        Number of consecutive failures (retryable exceptions or `statuses`) to a
+        host before its circuit opens and requests to it fail fast with
+        `CircuitOpenError`. Cached responses are served while a circuit is open.
+        None disables the circuit breaker.
+    circuit_breaker_reset: float, default 30.0
+        Seconds a circuit stays open before a single probe request is allowed. A
+        successful probe closes the circuit.
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient, RetryPolicy
+    >>>
+    >>> policy = RetryPolicy(n_retries=5, deadline=120, circuit_breaker_threshold=10)
+    >>> client = RestClient(retry_policy=policy)
+    """
+
+    n_retries: int = 3
+    statuses: FrozenSet[int] = RETRY_STATUS_CODES
+    exceptions: Tuple[Type[BaseException], ...] = (
+        aiohttp.ClientConnectionError,
+        asyncio.TimeoutError,
+    )
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    jitter: bool = True
+    deadline: Optional[float] = None
+    respect_retry_after: bool = True
+    circuit_breaker_threshold: Optional[int] = None
+    circuit_breaker_reset: float = 30.0
+
+    def __post_init__(self) -> None:
+        if self.n_retries < 0:
+            raise ValueError("n_retries must be >= 0")
+
+        threshold = self.circuit_breaker_threshold
+        if threshold is not None and threshold < 1:
+            raise ValueError("circuit_breaker_threshold must be >= 1 or None")
+
+        # accept any collection of status codes
+        object.__setattr__(self, "statuses", frozenset(self.statuses))
+
+    def delay(
+        self, attempt: int, response: Optional[aiohttp.ClientResponse] = None
+    ) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)"""
+        if self.respect_retry_after and response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(self.max_delay, retry_after)
+
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_retryable_exception(self, error: BaseException) -> bool:
+        # circuit breaker rejections are never retried
+        return isinstance(error, self.exceptions) and not isinstance(
+            error, CircuitOpenError
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header value (delay-seconds or HTTP date).
+    None if value is missing or malformed."""
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Per host circuit breaker. A circuit opens after `threshold` consecutive
+    failures, rejects requests for `reset_timeout` seconds, then allows a single probe
+    request. The circuit closes if the probe succeeds and reopens if it fails.
+
+    Parameters
+    ----------
+    threshold: int, default 5
+        Consecutive failures before the circuit opens
+    reset_timeout: float, default 30.0
+        Seconds the circuit stays open before a probe request is allowed
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit allows a probe request"""
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """True if a request may be made. Transitions an open circuit whose reset
+        timeout has elapsed to half-open and allows the caller to probe."""
+        if self.state == self.CLOSED:
+            return True
+
+        # open, or half-open with a probe in flight. If a probe never reports back
+        # (e.g. it was cancelled), another probe is allowed after reset_timeout.
+        if self.retry_in():
+            return False
+
+        self.state = self.HALF_OPEN
+        self._opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """Point in time snapshot of retry activity.
+
+    Attributes
+    ----------
+    retries: int
+        Total number of retry attempts
+    retried_requests: int
+        Number of requests retried at least once
+    exhausted: int
+        Number of requests that failed after retries or the deadline ran out
+    circuit_breaker_rejections: int
+        Number of requests failed fast by an open circuit breaker
+    open_circuits: Tuple[str, ...]
+        Hosts whose circuit breaker is open or half-open
+    """
+
+    retries: int = 0
+    retried_requests: int = 0
+    exhausted: int = 0
+    circuit_breaker_rejections: int = 0
+    open_circuits: Tuple[str, ...] = field(default_factory=tuple)
@@ -0,0 +1,247 @@
+import asyncio
+import heapq
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+__all__ = ["RequestScheduler", "SchedulerStats"]
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    """Point in time snapshot of `RequestScheduler` state.
+
+    Attributes
+    ----------
+    in_flight: int
+        Number of requests currently holding a slot
+    queued: int
+        Number of requests waiting for a slot
+    peak_in_flight: int
+        Largest number of simultaneously in-flight requests observed
+    peak_queued: int
+        Largest queue depth observed
+    submitted: int
+        Total number of requests that have asked for a slot. A retried request asks
+        again for each retry.
+    completed: int
+        Total number of requests that have released their slot
+    in_flight_by_host: Dict[str, int]
+        Number of in-flight requests per host
+    queued_by_host: Dict[str, int]
+        Number of queued requests per host
+    """
+
+    in_flight: int = 0
+    queued: int = 0
+    peak_in_flight: int = 0
+    peak_queued: int = 0
+    submitted: int = 0
+    completed: int = 0
+    in_flight_by_host: Dict[str, int] = field(default_factory=dict)
+    queued_by_host: Dict[str, int] = field(default_factory=dict)
+
+
+class RequestScheduler:
+    """Bound the number of concurrent in-flight requests, in total and per host.
+    Requests that cannot start immediately wait in a priority queue. Lower priority
+    values are scheduled first and requests of equal priority are scheduled in
+    first-in-first-out order. A request blocked by its host's limit does not hold up
+    requests to other hosts.
+
+    Parameters
+    ----------
+    max_in_flight: int, default 100
+        Maximum number of simultaneous requests
+    max_in_flight_per_host: int, optional, default None
+        Maximum number of simultaneous requests to a single host. None is unlimited.
+
+    Examples
+    --------
+    >>> scheduler = RequestScheduler(max_in_flight=10, max_in_flight_per_host=4)
+    >>>
+    >>> async def get(session, url):
+    ...     async with scheduler.slot("waterservices.usgs.gov"):
+    ...         async with session.get(url) as resp:
+    ...             return await resp.read()
+    """
+
+    def __init__(
+        self, max_in_flight: int = 100, max_in_flight_per_host: Optional[int] = None
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        if max_in_flight_per_host is not None and max_in_flight_per_host < 1:
+            raise ValueError("max_in_flight_per_host must be >= 1 or None")
+
+        self._max_in_flight = max_in_flight
+        self._max_in_flight_per_host = max_in_flight_per_host
+
+        # host: heap of (priority, sequence number, future) waiting for a slot
+        self._queues = defaultdict(
+            list
+        )  # type: Dict[str, List[Tuple[int, int, asyncio.Future]]]
+        self._in_flight_by_host = defaultdict(int)  # type: Dict[str, int]
+        self._sequence = count()
+
+        self._in_flight = 0
+        self._queued = 0
+        self._peak_in_flight = 0
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+
+    async def acquire(self, host: str, priority: int = 0) -> None:
+        """Wait for and take a request slot for `host`. Every `acquire` must be paired
+        with a `release`. Prefer `RequestScheduler.slot`, which does this for you."""
+        self._submitted += 1
+
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._queues[host], (priority, next(self._sequence), future))
+        self._queued += 1
+        self._peak_queued = max(self._peak_queued, self._queued)
+
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # cancelled while waiting; entry is skipped and discarded by _dispatch
+                self._queued -= 1
+            else:
+                # slot was granted, but the waiter was cancelled before it ran
+                self.release(host)
+            raise
+
+    def release(self, host: str) -> None:
+        """Return a request slot for `host` and start the next eligible request."""
+        self._in_flight -= 1
+        self._in_flight_by_host[host] -= 1
+        if not self._in_flight_by_host[host]:
+            del self._in_flight_by_host[host]
+
+        self._completed += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, host: str, priority: int = 0) -> AsyncIterator[None]:
+        """Asynchronous context manager that holds a request slot for `host`"""
+        await self.acquire(host, priority)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def stats(self) -> SchedulerStats:
+        """Return a snapshot of the scheduler's queue and in-flight state"""
+        return SchedulerStats(
+            in_flight=self._in_flight,
+            queued=self._queued,
+            peak_in_flight=self._peak_in_flight,
+            peak_queued=self._peak_queued,
+            submitted=self._submitted,
+            completed=self._completed,
+            in_flight_by_host=dict(self._in_flight_by_host),
+            queued_by_host={
+                host: sum(not f.cancelled() for *_, f in queue)
+                for host, queue in self._queues.items()
+            },
+        )
+
+    def _host_available(self, host: str) -> bool:
+        if self._max_in_flight_per_host is None:
+            return True
+        return self._in_flight_by_host.get(host, 0) < self._max_in_flight_per_host
+
+    def _dispatch(self) -> None:
+        """Grant slots to queued requests while capacity remains"""
+        while self._in_flight < self._max_in_flight:
+            # head of each host queue that is below its host limit. The number of
+            # hosts is small, so a linear scan is cheaper than maintaining an index.
+            candidates = [
+                (queue[0], host)
+                for host, queue in self._queues.items()
+                if self._host_available(host)
+            ]
+
+            if not candidates:
+                return
+
+            _, host = min(candidates, key=lambda c: c[0][:2])
+            queue = self._queues[host]
+            *_, future = heapq.heappop(queue)
+
+            if not queue:
+                del self._queues[host]
+
+            if future.cancelled():
+                continue
+
+            self._queued -= 1
+            self._in_flight += 1
+            self._in_flight_by_host[host] += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            future.set_result(None)
+
+    @property
+    def max_in_flight(self) -> int:
+        """Maximum number of simultaneous requests"""
+        return self._max_in_flight
+
+    @property
+    def max_in_flight_per_host(self) -> Optional[int]:
+        """Maximum number of simultaneous requests to a single host"""
+        return self._max_in_flight_per_host
+
+
+class _RequestSlot:
+    """Request slot of a single request, taken from `scheduler` when the request is
+    sent rather than when it is made. Requests answered from the cache never wait for
+    a slot, and a request waiting to be retried releases its slot to other requests.
+    `acquire` takes the slot if it is not held. `on_acquired` is called the first
+    time the slot is taken."""
+
+    def __init__(
+        self,
+        scheduler: RequestScheduler,
+        host: str,
+        priority: int = 0,
+        on_acquired: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._scheduler = scheduler
+        self._host = host
+        self._priority = priority
+        self._on_acquired = on_acquired
+        self._held = False
+        # total seconds spent waiting for the slot
+        self.queued = 0.0
+        # time.perf_counter() when the slot was last taken, None if never taken
+        self.acquired_at = None  # type: Optional[float]
+
+    @property
+    def held(self) -> bool:
+        return self._held
+
+    async def acquire(self) -> None:
+        if self._held:
+            return
+
+        start = time.perf_counter()
+        await self._scheduler.acquire(self._host, self._priority)
+        self._held = True
+        self.acquired_at = time.perf_counter()
+        self.queued += self.acquired_at - start
+
+        on_acquired, self._on_acquired = self._on_acquired, None
+        if on_acquired is not None:
+            on_acquired()
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            self._scheduler.release(self._host)
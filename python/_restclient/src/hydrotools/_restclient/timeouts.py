@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+
+__all__ = ["TimeoutPolicy"]
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    """Request and batch time limits in seconds. A limit of None is unbounded.
+
+    `connect` and `sock_read` bound each attempt of a request. `total` bounds a
+    request end to end, from sending its first attempt until its response body is
+    read, including retries and backoff delays (see `RetryPolicy`). Each attempt is
+    given the time that remains and a retry is not attempted once it has run out.
+    Time spent queued for a request slot (see `RequestScheduler`) is excluded.
+    `batch` bounds `mget`, `iter_mget`, and `mget_results` calls, including queued
+    time. Requests outstanding when a batch deadline passes are cancelled.
+
+    Timed out requests raise `asyncio.TimeoutError`.
+
+    Parameters
+    ----------
+    connect: float, optional, default 30.0
+        Seconds to establish a connection, per attempt
+    sock_read: float, optional, default 60.0
+        Seconds to wait for the next piece of a response, per attempt
+    total: float, optional, default 300.0
+        Seconds a request may take, including retries
+    batch: float, optional, default None
+        Seconds a batch of requests may take
+
+    Examples
+    --------
+    >>> from hydrotools._restclient import RestClient, TimeoutPolicy
+    >>>
+    >>> client = RestClient(timeout_policy=TimeoutPolicy(total=60, batch=600))
+    >>> results = client.mget_results(urls)
+    >>> # requests not complete within 600 seconds
+    >>> results.pending
+    """
+
+    connect: Optional[float] = 30.0
+    sock_read: Optional[float] = 60.0
+    total: Optional[float] = 300.0
+    batch: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        for name in ["connect", "sock_read", "total", "batch"]:
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0 or None")
+
+    def client_timeout(self) -> aiohttp.ClientTimeout:
+        """`aiohttp.ClientTimeout` of a single attempt"""
+        return aiohttp.ClientTimeout(
+            total=self.total, sock_connect=self.connect, sock_read=self.sock_read
+        )
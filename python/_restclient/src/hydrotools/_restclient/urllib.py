@@ -1,13 +1,14 @@
 import urllib.parse as parse
-from typing import Dict, List, Tuple, Union, TypeVar
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union, TypeVar
 from collections import UserString
+from functools import lru_cache
 import re
 
 # local imports
 from ._iterable_nonstring import IterableNonStringLike
 from .urllib_types import Quote, QUOTE_PLUS_OR_CARRY, FORWARD_SLASH
 
-__all__ = ["Url", "Variadic"]
+__all__ = ["Url", "UrlTemplate", "Variadic", "compile_url"]
 
 PRIMITIVE = TypeVar("PRIMITIVE", bool, float, int, str, None)
 
@@ -165,17 +166,7 @@ class Url(UserString, str):
         >>> https://www.test.gov/api/feature?format=json&sites=1&sites=2&sites=3
         """
         query = parse.parse_qs(self._url.query)  # type: dict[list[str]]
-        # compare keys
-        intersect = set(query) & set(b)
-        left_difference = {k: b[k] for k in set(b) - set(query)}
-
-        # put keys from b not in self in self
-        query.update(left_difference)
-
-        # append values from b to keys existing in self
-        for k in intersect:
-            to_insert = b[k] if isinstance(b[k], IterableNonStringLike) else [b[k]]
-            query[k].extend(to_insert)
+        query = _merge_query(query, b)
 
         # Transform query from dict to string of kwargs
         query = parse.urlencode(
@@ -348,6 +339,279 @@ class Url(UserString, str):
         )
 
 
+def _merge_query(
+    query: Dict[str, List[str]], b: Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]]
+) -> Dict[str, List[str]]:
+    """Merge query parameters `b` into parsed query `query` (in place)"""
+    # compare keys
+    intersect = set(query) & set(b)
+    left_difference = {k: b[k] for k in set(b) - set(query)}
+
+    # put keys from b not in self in self
+    query.update(left_difference)
+
+    # append values from b to keys existing in self
+    for k in intersect:
+        to_insert = b[k] if isinstance(b[k], IterableNonStringLike) else [b[k]]
+        query[k].extend(to_insert)
+
+    return query
+
+
+_HASHABLE_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _freeze_parameters(
+    parameters: Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]]
+) -> Optional[Tuple[Hashable, ...]]:
+    """Hashable representation of query parameters used as a cache key. Types are
+    included so that, for example, `True` and `1` are not confused. None if any value
+    is not a primitive, `Variadic`, or list / tuple of primitives."""
+
+    def freeze(value: Any) -> Hashable:
+        value_type = type(value)
+        if value_type in _HASHABLE_PRIMITIVES:
+            return value_type, value
+        if value_type is Variadic:
+            return value_type, value.data
+        if value_type in (list, tuple):
+            return value_type, tuple(freeze(v) for v in value)
+        raise TypeError
+
+    try:
+        return tuple((k, freeze(v)) for k, v in parameters.items())
+    except TypeError:
+        return None
+
+
+class UrlTemplate:
+    """Parsed, reusable form of a `Url` for building many quoted urls that share a
+    scheme, host, and path but differ by query parameters.
+
+    `UrlTemplate(url).quote_url(parameters)` returns the same string as
+    `(Url(url) + parameters).quote_url`, including `quote_treatment`, `safe`, and
+    `quote_overide_map` handling. The url is parsed and its path quoted once, rather
+    than once per intermediate `Url` instance, and quoted urls are cached per set of
+    query parameters.
+
+    Parameters
+    ----------
+    url : Union[str, Url]
+        Template url. `str` urls are converted using `Url` defaults.
+    cache_size : int, default 1024
+        Maximum number of quoted urls and joined templates cached. 0 disables caching.
+
+    Examples
+    --------
+    >>> template = UrlTemplate(Url("https://www.test.gov/api", safe="/:"))
+    >>> template.quote_url({"sites": ["01646500", "02339495"]})
+    'https://www.test.gov/api?sites=01646500&sites=02339495'
+    >>> (template / "feature").quote_url({"format": "json"})
+    'https://www.test.gov/api/feature?format=json'
+    """
+
+    __slots__ = (
+        "_url",
+        "_query",
+        "_prefix",
+        "_params",
+        "_fragment",
+        "_quote_via",
+        "_unquote",
+        "_safe",
+        "_overide_items",
+        "_fast",
+        "_cache_size",
+        "_cache",
+        "_joined",
+    )
+
+    def __init__(self, url: Union[str, Url], *, cache_size: int = 1024) -> None:
+        url = url if isinstance(url, Url) else Url(url)
+        parsed = url._url
+        quote_treatment = url._quote_treatment
+
+        self._url = url
+        self._query = parse.parse_qs(parsed.query)
+        path = quote_treatment.quote(parsed.path, safe=url._safe)
+        self._prefix = (parsed.scheme, parsed.netloc, path)
+        self._params = parsed.params
+        self._fragment = parsed.fragment
+        self._quote_via = quote_treatment.quote_style
+        self._unquote = quote_treatment.unquote_style
+        self._safe = url._safe
+        self._overide_items = tuple(url._quote_overide_map.items())
+        # a `#` left unquoted in the query would be reparsed as a fragment and byte
+        # quoting produces bytes queries. Build through `Url` in those cases.
+        self._fast = quote_treatment != Quote.QUOTE_FROM_BYTES and "#" not in url._safe
+        self._cache_size = cache_size
+        self._cache = {}  # type: Dict[Tuple[Hashable, ...], str]
+        self._joined = {}  # type: Dict[str, UrlTemplate]
+
+    @property
+    def url(self) -> Url:
+        """Template `Url`"""
+        return self._url
+
+    def joinurl(self, b: str) -> "UrlTemplate":
+        """Template of `self.url / b`. See `Url.joinurl`."""
+        # only cache plain str paths, `Url` instances format differently than str
+        if type(b) is not str:
+            return UrlTemplate(self._url / b, cache_size=self._cache_size)
+
+        template = self._joined.get(b)
+        if template is None:
+            template = UrlTemplate(self._url / b, cache_size=self._cache_size)
+            self._cache_put(self._joined, b, template)
+        return template
+
+    def __truediv__(self, b: str) -> "UrlTemplate":
+        return self.joinurl(b)
+
+    def quote_url(
+        self, parameters: Optional[Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]]] = None
+    ) -> str:
+        """Quoted url including query `parameters`. Equivalent to
+        `(self.url + parameters).quote_url`."""
+        parameters = parameters or {}
+        key = _freeze_parameters(parameters) if self._cache_size else None
+        if key is not None:
+            url = self._cache.get(key)
+            if url is not None:
+                return url
+
+        if self._fast:
+            url = self._quote_url(parameters)
+        else:
+            url = (self._url + parameters).quote_url
+
+        if key is not None:
+            self._cache_put(self._cache, key, url)
+        return url
+
+    def _quote_url(self, parameters: Dict[str, Union[PRIMITIVE, List[PRIMITIVE]]]) -> str:
+        # mirrors Url.add -> Url.__init__ -> Url.quote_url without intermediate parsing
+        query = {k: list(v) for k, v in self._query.items()}
+        query = _merge_query(query, parameters)
+
+        encoded = self._encode_query(query)
+        if encoded is None:
+            encoded = parse.urlencode(
+                query, doseq=True, quote_via=self._quote_via, safe=self._safe
+            )
+            # Url unquotes queries at construction and quote_url reparses and requotes
+            encoded = parse.urlencode(
+                parse.parse_qs(self._unquote(encoded)),
+                doseq=True,
+                quote_via=self._quote_via,
+                safe=self._safe,
+            )
+        query = encoded
+
+        url = parse.urlunparse((*self._prefix, self._params, query, self._fragment))
+        # Explicitly replace characters in url
+        for char, remap_char in self._overide_items:
+            url = url.replace(char, remap_char)
+        return url
+
+    def _encode_query(self, query: Dict[str, Any]) -> Optional[str]:
+        """Quote query in a single pass. Equivalent to the urlencode, unquote,
+        parse_qs, urlencode round trip of `Url`, which drops blank values and groups
+        repeated keys, when no key or value contains characters the round trip
+        reinterprets. None otherwise."""
+        quote = _quoter(self._quote_via, self._safe)
+        # quoted key: quoted values
+        grouped = {}  # type: Dict[str, List[str]]
+        for k, v in query.items():
+            if isinstance(v, str):
+                if type(v) is Variadic:
+                    v = v.data
+                elif type(v) is not str:
+                    return None
+                values = (v,)
+            elif isinstance(v, bytes):
+                return None
+            else:
+                try:
+                    len(v)
+                    values = v
+                except TypeError:
+                    values = (v,)
+
+            k = str(k) if not isinstance(k, bytes) else None
+            if k is None or _REQUOTE_CHARS.search(k):
+                return None
+            # parse_qs reads a literal + as a space
+            k = quote(k.replace("+", " "))
+
+            for value in values:
+                if isinstance(value, bytes):
+                    return None
+                value = str(value)
+                if not value:
+                    # blank values dropped by parse_qs
+                    continue
+                if _REQUOTE_CHARS.search(value):
+                    return None
+                grouped.setdefault(k, []).append(quote(value.replace("+", " ")))
+
+        return "&".join(
+            f"{k}={value}" for k, values in grouped.items() for value in values
+        )
+
+    def _cache_put(self, cache: dict, key: Hashable, value: Any) -> None:
+        if len(cache) >= self._cache_size:
+            # evict oldest entry
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+    def __repr__(self) -> str:
+        return f"UrlTemplate({self._url.url!r})"
+
+
+# characters reinterpreted when an unquoted query is reparsed, other than +
+_REQUOTE_CHARS = re.compile(r"[&=%;]")
+
+
+@lru_cache(maxsize=16)
+def _quoter(quote_via: Callable, safe: str) -> Callable[[str], str]:
+    """Memoized `quote_via` for repeated keys and values (e.g. site codes)"""
+
+    @lru_cache(maxsize=8192)
+    def quote(value: str) -> str:
+        return quote_via(value, safe)
+
+    return quote
+
+
+def compile_url(url: Union[str, Url]) -> UrlTemplate:
+    """Return a shared `UrlTemplate` for `url`. Templates are cached by url and quoting
+    options, so repeated calls with equivalent urls reuse the parsed url and its cache
+    of quoted urls."""
+    if isinstance(url, Url):
+        return _compile_url(
+            url.url,
+            url._quote_treatment,
+            url._safe,
+            tuple(url._quote_overide_map.items()),
+        )
+    return _compile_url(url, Quote.QUOTE_PLUS, "/", ())
+
+
+@lru_cache(maxsize=256)
+def _compile_url(
+    url: str, quote_treatment: Quote, safe: str, overide_items: Tuple[Tuple[str, str], ...]
+) -> UrlTemplate:
+    return UrlTemplate(
+        Url(
+            url,
+            quote_treatment=quote_treatment,
+            safe=safe,
+            quote_overide_map=dict(overide_items),
+        )
+    )
+
+
 def _are_properties_set(obj: object, properties: Union[List[str], Tuple[str]]) -> bool:
     return all([getattr(obj, prop, None) for prop in properties])
 
@@ -0,0 +1,290 @@
+import json
+from aiohttp import web
+import pytest
+from hydrotools._restclient import AsyncRestClient, RequestStats
+
+
+@pytest.fixture
+async def naked_server(aiohttp_raw_server):
+    async def wrap(handler):
+        server = await aiohttp_raw_server(handler)
+        return server
+
+    return wrap
+
+
+@pytest.fixture
+async def basic_test_server(naked_server):
+    import json
+
+    data = {"this": "is a test"}
+
+    async def handler(request):
+        return web.Response(
+            status=200,
+            text=json.dumps(data),
+            headers=request.headers,
+            content_type="application/json",
+        )
+
+    server = await naked_server(handler)
+
+    # return server uri, data served by server
+    return str(server.make_url("/")), data
+
+
+@pytest.fixture
+async def delayed_test_server(naked_server):
+    """Server that sleeps `delay` seconds (query parameter) before responding"""
+    import asyncio
+    import json
+
+    async def handler(request):
+        delay = float(request.query.get("delay", 0))
+        await asyncio.sleep(delay)
+        return web.Response(
+            status=200,
+            text=json.dumps({"delay": delay}),
+            content_type="application/json",
+        )
+
+    server = await naked_server(handler)
+    return str(server.make_url("/"))
+
+
+@pytest.fixture
+async def counting_test_server(naked_server):
+    """Slow server that counts the requests it receives"""
+    import asyncio
+
+    counter = {"requests": 0}
+
+    async def handler(request):
+        counter["requests"] += 1
+        await asyncio.sleep(0.1)
+        return web.Response(text=request.query.get("id", ""))
+
+    server = await naked_server(handler)
+    return str(server.make_url("/")), counter
+
+
+@pytest.fixture
+def temp_sqlite_db():
+    """ Yield a temp file with suffix .sqlite """
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(suffix=".sqlite") as temp_db:
+        yield temp_db.name
+
+
+async def test_get_without_cache(basic_test_server):
+    """AsyncRestClient runs in the test's running event loop without nest_asyncio"""
+    uri, data = basic_test_server
+    import json
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        r = await client.get(uri)
+
+        assert r.json() == data
+        assert r.text() == json.dumps(data)
+
+
+async def test_get_with_cache(basic_test_server, temp_sqlite_db):
+    uri, data = basic_test_server
+
+    async with AsyncRestClient(
+        enable_cache=True, cache_filename=temp_sqlite_db, cache_expire_after=-1
+    ) as client:
+        r = await client.get(uri)
+        r2 = await client.get(uri)
+
+        assert r.json() == data
+        assert r2.json() == data
+        assert not r.from_cache
+        assert r2.from_cache
+
+    import sqlite3
+
+    with sqlite3.connect(temp_sqlite_db) as con:
+        cur = con.cursor()
+        response = cur.execute("SELECT * FROM responses").fetchall()
+
+        # There should only be one response in the db
+        assert len(response) == 1
+
+
+async def test_mget_and_iter_mget(delayed_test_server):
+    uri = delayed_test_server
+    parameters = [{"delay": 0.2}, {"delay": 0.0}, {"delay": 0.1}]
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        rs = await client.mget(uri, parameters=parameters)
+        assert [r.json()["delay"] for r in rs] == [0.2, 0.0, 0.1]
+
+        # disabled cache must not answer repeated requests
+        order = [idx async for idx, _ in client.iter_mget(uri, parameters=parameters)]
+        assert order == [1, 2, 0]
+
+
+async def test_disabled_cache_has_no_stats(basic_test_server):
+    uri, _ = basic_test_server
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        r = await client.get(uri)
+        r2 = await client.get(uri)
+        assert not r2.from_cache
+        assert client.cache_stats is None
+
+
+async def test_get_headers_have_precedent_over_instance(basic_test_server):
+    uri, _ = basic_test_server
+    instance_headers = {"some": "headers"}
+    method_headers = {"some": "other_header"}
+
+    async with AsyncRestClient(enable_cache=False, headers=instance_headers) as client:
+        r = await client.get(uri, headers=method_headers)
+
+        assert all(k_v_pair in r.headers.items() for k_v_pair in method_headers.items())
+
+
+async def test_session_created_on_first_use(basic_test_server):
+    uri, _ = basic_test_server
+
+    client = AsyncRestClient(enable_cache=False)
+    assert client.closed
+
+    await client.get(uri)
+    assert not client.closed
+
+    await client.close()
+    assert client.closed
+
+
+def test_build_url():
+    base_url = "http://www.test.gov/"
+    query_params = {"key": "value"}
+    client = AsyncRestClient(enable_cache=False)
+
+    assert client.build_url(base_url) == base_url
+    assert client.build_url(base_url, query_params) == f"{base_url}?key=value"
+
+
+async def test_json_decoder(basic_test_server):
+    uri, data = basic_test_server
+    decoded = []
+
+    def decoder(body: bytes):
+        decoded.append(body)
+        return json.loads(body)
+
+    async with AsyncRestClient(enable_cache=False, json_decoder=decoder) as client:
+        r = await client.get(uri)
+        assert r.json() == data
+        assert decoded == [r.content]
+
+
+async def test_concurrent_identical_requests_coalesced(counting_test_server):
+    import asyncio
+
+    uri, counter = counting_test_server
+    parameters = [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 1}]
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        rs = await client.mget(uri, parameters=parameters)
+        assert [r.text() for r in rs] == ["1", "2", "1", "1"]
+        assert counter["requests"] == 2
+        # coalesced requests share a response
+        assert rs[0] is rs[2] is rs[3]
+        assert client.request_stats == RequestStats(requests=4, coalesced=2)
+
+        # differing headers are not coalesced
+        await asyncio.gather(
+            client.get(uri, headers={"a": "1"}), client.get(uri, headers={"a": "2"})
+        )
+        assert counter["requests"] == 4
+
+        # completed requests are not reused
+        await client.get(uri, parameters={"id": 1})
+        assert counter["requests"] == 5
+
+
+async def test_coalesced_request_survives_caller_cancellation(counting_test_server):
+    import asyncio
+
+    uri, counter = counting_test_server
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        first = asyncio.ensure_future(client.get(uri))
+        second = asyncio.ensure_future(client.get(uri))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second).status == 200
+        assert counter["requests"] == 1
+
+
+async def test_coalescing_disabled(counting_test_server):
+    uri, counter = counting_test_server
+
+    async with AsyncRestClient(enable_cache=False, coalesce_requests=False) as client:
+        await client.mget([uri, uri])
+        assert counter["requests"] == 2
+        assert client.request_stats.coalesced == 0
+
+
+async def test_cached_response_does_not_wait_for_slot(delayed_test_server):
+    import asyncio
+    from hydrotools._restclient import MemoryLRUBackend
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), max_in_flight=1
+    ) as client:
+        await client.get(delayed_test_server, parameters={"delay": 0})
+
+        # slow request holds the only slot
+        slow = asyncio.ensure_future(
+            client.get(delayed_test_server, parameters={"delay": 1})
+        )
+        await asyncio.sleep(0.05)
+        assert client.scheduler_stats.in_flight == 1
+
+        response = await asyncio.wait_for(
+            client.get(delayed_test_server, parameters={"delay": 0}), 0.5
+        )
+        assert response.from_cache
+        assert not slow.done()
+        await slow
+
+
+async def test_retry_backoff_releases_slot(naked_server):
+    import asyncio
+    from hydrotools._restclient import RetryPolicy
+
+    order = []
+
+    async def handler(request):
+        name = request.query["name"]
+        order.append(name)
+        if name == "throttled" and order.count(name) == 1:
+            return web.Response(status=503, headers={"Retry-After": "0.5"})
+        return web.Response(text=name)
+
+    server = await naked_server(handler)
+    uri = str(server.make_url("/"))
+
+    async with AsyncRestClient(
+        enable_cache=False, max_in_flight=1, retry_policy=RetryPolicy(n_retries=1)
+    ) as client:
+        throttled = asyncio.ensure_future(
+            client.get(uri, parameters={"name": "throttled"})
+        )
+        await asyncio.sleep(0.1)
+
+        # sent while the throttled request waits to retry
+        other = await asyncio.wait_for(
+            client.get(uri, parameters={"name": "other"}), 0.3
+        )
+        assert other.text() == "other"
+        assert (await throttled).text() == "throttled"
+        assert order == ["throttled", "other", "throttled"]
+        assert client.scheduler_stats.in_flight == 0
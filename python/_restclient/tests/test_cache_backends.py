@@ -0,0 +1,389 @@
+import asyncio
+import multiprocessing as mp
+import pickle
+import sqlite3
+
+import pytest
+from aiohttp_client_cache.response import CachedResponse
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    BoundedSQLiteBackend,
+    CacheStats,
+    CompressedCachedResponse,
+    MemoryLRUBackend,
+    ShardedFileBackend,
+    ShardedSQLiteBackend,
+)
+
+
+def response(body: bytes) -> CachedResponse:
+    return CachedResponse(
+        method="GET",
+        reason="OK",
+        status=200,
+        url="http://test",
+        version="1.1",
+        body=body,
+    )
+
+
+@pytest.fixture
+def temp_sqlite_db(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture(params=["memory", "sqlite", "file"])
+def backend_factory(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryLRUBackend(**kwargs)
+        if request.param == "sqlite":
+            return BoundedSQLiteBackend(str(tmp_path / "cache.sqlite"), **kwargs)
+        return ShardedFileBackend(tmp_path / "cache", **kwargs)
+
+    return factory
+
+
+async def test_backend_round_trip(backend_factory):
+    backend = backend_factory()
+    await backend.responses.write("abc123", response(b"data"))
+
+    cached = await backend.get_response("abc123")
+    assert cached._body == b"data"
+    assert await backend.get_response("missing0") is None
+
+    stats = backend.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 0)
+    assert stats.entries == 1
+    assert stats.size_bytes > 0
+    await backend.close()
+
+
+async def test_backend_evicts_least_recently_used(backend_factory):
+    probe = backend_factory()
+    await probe.responses.write("00", response(b"x" * 1000))
+    item_size = probe.stats().size_bytes
+    await probe.clear()
+    await probe.close()
+
+    # room for two items
+    backend = backend_factory(max_bytes=2 * item_size + item_size // 2)
+    await backend.responses.write("aa", response(b"x" * 1000))
+    await backend.responses.write("bb", response(b"x" * 1000))
+    # touch "aa" so "bb" is least recently used
+    assert await backend.get_response("aa") is not None
+    await backend.responses.write("cc", response(b"x" * 1000))
+
+    assert await backend.responses.contains("aa")
+    assert not await backend.responses.contains("bb")
+    assert await backend.responses.contains("cc")
+
+    stats = backend.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.size_bytes <= backend.responses.max_bytes
+    await backend.close()
+
+
+async def test_memory_backend_max_entries():
+    backend = MemoryLRUBackend(max_entries=2)
+    for key in ["a", "b", "c"]:
+        await backend.responses.write(key, response(b"data"))
+
+    assert backend.stats() == CacheStats(
+        hits=0, misses=0, evictions=1, entries=2, size_bytes=8
+    )
+
+
+async def test_sqlite_backend_migrates_legacy_table(temp_sqlite_db):
+    with sqlite3.connect(temp_sqlite_db) as con:
+        con.execute("CREATE TABLE responses (key PRIMARY KEY, value)")
+        con.execute(
+            "INSERT INTO responses VALUES (?, ?)",
+            ("legacy", pickle.dumps(response(b"legacy"))),
+        )
+
+    backend = BoundedSQLiteBackend(temp_sqlite_db)
+    cached = await backend.get_response("legacy")
+    assert cached._body == b"legacy"
+    assert backend.stats().entries == 1
+    await backend.close()
+
+
+@pytest.mark.parametrize("max_bytes", [None, 1_000_000])
+async def test_sqlite_backend_totals(temp_sqlite_db, max_bytes):
+    backend = BoundedSQLiteBackend(temp_sqlite_db, max_bytes=max_bytes)
+    cache = backend.responses
+    await cache.write("a", response(b"x" * 1000))
+    await cache.write("b", response(b"x" * 10))
+    await cache.write("a", response(b"x" * 100))
+    await cache.bulk_delete({"b", "missing"})
+    assert await backend.get_response("a") is not None
+
+    # access times are buffered, and only kept by bounded caches
+    assert len(cache._accessed) == (0 if max_bytes is None else 1)
+    stats = backend.stats()
+    await backend.close()
+    assert not cache._accessed
+
+    with sqlite3.connect(temp_sqlite_db) as con:
+        assert (stats.entries, stats.size_bytes) == con.execute(
+            "SELECT COUNT(key), SUM(size) FROM responses"
+        ).fetchone()
+
+
+def test_sharded_file_backend_layout(tmp_path):
+    backend = ShardedFileBackend(tmp_path, shard_depth=2, shard_width=2)
+    assert backend.responses._path("abcdef") == tmp_path / "ab" / "cd" / "abcdef"
+
+
+@pytest.mark.parametrize("backend_type", [MemoryLRUBackend, ShardedFileBackend])
+async def test_client_cache_backend(backend_type, tmp_path, aiohttp_raw_server):
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(text="data")
+
+    server = await aiohttp_raw_server(handler)
+    uri = str(server.make_url("/"))
+
+    if backend_type is ShardedFileBackend:
+        backend = ShardedFileBackend(tmp_path)
+    else:
+        backend = MemoryLRUBackend()
+
+    async with AsyncRestClient(cache_backend=backend) as client:
+        await client.get(uri)
+        r = await client.get(uri)
+        assert r.from_cache
+        assert r.text() == "data"
+        assert (client.cache_stats.hits, client.cache_stats.misses) == (1, 1)
+
+
+@pytest.fixture
+async def etag_test_server(aiohttp_raw_server):
+    from aiohttp import web
+
+    requests = {"full": 0, "not_modified": 0}
+
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            requests["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        requests["full"] += 1
+        return web.Response(text="data", headers={"ETag": '"v1"'})
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), requests
+
+
+@pytest.mark.parametrize("revalidate_expired", [True, False])
+async def test_expired_response_revalidated(
+    etag_test_server, temp_sqlite_db, revalidate_expired
+):
+    import asyncio
+
+    uri, requests = etag_test_server
+    backend = BoundedSQLiteBackend(
+        temp_sqlite_db, expire_after=0.1, revalidate_expired=revalidate_expired
+    )
+
+    async with AsyncRestClient(cache_backend=backend) as client:
+        await client.get(uri)
+        await asyncio.sleep(0.2)
+
+        r = await client.get(uri)
+        assert r.text() == "data"
+
+        if revalidate_expired:
+            assert requests == {"full": 1, "not_modified": 1}
+            assert client.cache_stats.revalidations == 1
+
+            # renewed entry is served from cache without a request
+            r = await client.get(uri)
+            assert r.text() == "data"
+            assert requests == {"full": 1, "not_modified": 1}
+            assert client.cache_stats.hits == 1
+        else:
+            assert requests == {"full": 2, "not_modified": 0}
+            assert client.cache_stats.revalidations == 0
+
+
+@pytest.fixture(params=["sqlite", "file", "sharded-sqlite"])
+def persistent_backend_factory(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "sqlite":
+            return BoundedSQLiteBackend(str(tmp_path / "cache.sqlite"), **kwargs)
+        if request.param == "sharded-sqlite":
+            return ShardedSQLiteBackend(tmp_path / "cache", n_shards=2, **kwargs)
+        return ShardedFileBackend(tmp_path / "cache", **kwargs)
+
+    return factory
+
+
+COMPRESSIBLE = b'{"value": 1.0, "qualifiers": ["P"]}, ' * 1000
+
+
+@pytest.mark.parametrize("codec", ["zlib", "bz2", "lzma", "zstd"])
+async def test_compressed_round_trip(persistent_backend_factory, codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+
+    backend = persistent_backend_factory(compression=codec)
+    await backend.responses.write("abc123", response(COMPRESSIBLE))
+
+    cached = await backend.get_response("abc123")
+    # decompressed on first read
+    assert isinstance(cached, CompressedCachedResponse)
+    assert cached.codec == codec
+    assert await cached.read() == COMPRESSIBLE
+    assert cached.codec is None
+
+    stats = backend.stats()
+    assert stats.compression_ratio > 10
+    assert stats.size_bytes < len(COMPRESSIBLE) / 10
+    await backend.close()
+
+
+@pytest.mark.parametrize("method", ["text", "json"])
+async def test_compressed_text_and_json(persistent_backend_factory, method):
+    body = b'{"values": [' + b", ".join([b"1.0"] * 1000) + b"]}"
+    backend = persistent_backend_factory(compression="zlib")
+    await backend.responses.write("abc123", response(body))
+
+    cached = await backend.get_response("abc123")
+    assert cached.codec == "zlib"
+    if method == "text":
+        assert await cached.text() == body.decode()
+    else:
+        assert await cached.json() == {"values": [1.0] * 1000}
+    assert cached.codec is None
+    await backend.close()
+
+
+async def test_incompressible_body_stored_as_is(persistent_backend_factory):
+    backend = persistent_backend_factory(compression="zlib")
+    await backend.responses.write("abc123", response(b"x"))
+
+    cached = await backend.get_response("abc123")
+    assert type(cached) is CachedResponse
+    assert backend.stats().compression_ratio == 1.0
+    await backend.close()
+
+
+async def test_recompress(persistent_backend_factory):
+    backend = persistent_backend_factory()
+    for key in ["aaaaaa", "bbbbbb"]:
+        await backend.responses.write(key, response(COMPRESSIBLE))
+    await backend.close()
+
+    backend = persistent_backend_factory(compression="zlib")
+    report = await backend.recompress()
+    assert report.entries == 2
+    assert report.ratio > 10
+    assert (await backend.get_response("aaaaaa")).codec == "zlib"
+    await backend.close()
+
+    # decompress
+    backend = persistent_backend_factory()
+    report = await backend.recompress()
+    assert report.ratio < 0.1
+    cached = await backend.get_response("bbbbbb")
+    assert cached.codec is None
+    assert await cached.read() == COMPRESSIBLE
+    await backend.close()
+
+
+def test_unknown_codec(tmp_path):
+    with pytest.raises(ValueError):
+        ShardedFileBackend(tmp_path, compression="snappy")
+
+
+async def test_client_cache_compression(tmp_path, aiohttp_raw_server):
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(body=COMPRESSIBLE)
+
+    server = await aiohttp_raw_server(handler)
+    uri = str(server.make_url("/"))
+
+    async with AsyncRestClient(
+        cache_filename=str(tmp_path / "cache"), cache_compression="zlib"
+    ) as client:
+        await client.get(uri)
+        r = await client.get(uri)
+        assert r.from_cache
+        assert r.content == COMPRESSIBLE
+        assert client.cache_stats.compression_ratio > 10
+
+
+async def test_sharded_sqlite_batches_writes(tmp_path):
+    backend = ShardedSQLiteBackend(tmp_path, n_shards=2, batch_size=100, flush_interval=60)
+    other = ShardedSQLiteBackend(tmp_path, n_shards=2)
+    await backend.responses.write("abc123", response(b"data"))
+
+    # buffered, visible to this process only
+    assert (await backend.get_response("abc123"))._body == b"data"
+    assert not await other.responses.contains("abc123")
+
+    await backend.responses.flush()
+    assert (await other.get_response("abc123"))._body == b"data"
+    assert backend.stats().entries == 1
+
+    assert (tmp_path / "shards").read_text() == "2"
+    # databases are created on first use
+    (shard,) = tmp_path.glob("shard-*.sqlite")
+    con = sqlite3.connect(shard)
+    assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    con.close()
+
+    await backend.close()
+    await other.close()
+
+
+async def test_sharded_sqlite_flush_interval_and_close(tmp_path):
+    backend = ShardedSQLiteBackend(tmp_path, n_shards=2, flush_interval=0.01)
+    await backend.responses.write("aa", response(b"a"))
+    await asyncio.sleep(0.1)
+    assert backend.stats().entries == 1
+
+    await backend.responses.write("bb", response(b"b"))
+    await backend.close()
+
+    backend = ShardedSQLiteBackend(tmp_path, n_shards=2)
+    assert await backend.responses.size() == 2
+    await backend.close()
+
+
+def test_sharded_sqlite_shard_count_mismatch(tmp_path):
+    ShardedSQLiteBackend(tmp_path, n_shards=2)
+    with pytest.raises(ValueError):
+        ShardedSQLiteBackend(tmp_path, n_shards=4)
+
+
+def _write_worker(path, worker, n):
+    async def work():
+        backend = ShardedSQLiteBackend(path, n_shards=4, batch_size=8)
+        for idx in range(n):
+            await backend.responses.write(f"{worker:02x}{idx:06x}", response(b"x" * 100))
+        await backend.close()
+
+    asyncio.run(work())
+
+
+async def test_sharded_sqlite_concurrent_processes(tmp_path):
+    processes = [
+        mp.Process(target=_write_worker, args=(tmp_path, worker, 50))
+        for worker in range(6)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    assert [p.exitcode for p in processes] == [0] * 6
+
+    backend = ShardedSQLiteBackend(tmp_path, n_shards=4)
+    assert await backend.responses.size() == 300
+    await backend.close()
@@ -150,6 +150,138 @@ def test_verify_client_session_signature():
     assert {"retry", "n_retries", "cache", "headers"}.issubset(set(sig.parameters))
 
 
+@pytest.fixture
+async def status_server(naked_server):
+    """Server that responds with queued statuses, then 200"""
+
+    class context:
+        statuses = []
+        headers = {}
+        called = 0
+
+        async def handler(self, request):
+            self.called += 1
+            status = self.statuses.pop(0) if self.statuses else 200
+            return web.Response(status=status, headers=self.headers)
+
+    server_context = context()
+    server = await naked_server(server_context.handler)
+    return server.make_url("/"), server_context
+
+
+@pytest.fixture
+def unused_url():
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+async def test_retry_policy_retries_connection_errors(unused_url):
+    import aiohttp
+    from hydrotools._restclient import RetryPolicy
+
+    policy = RetryPolicy(n_retries=2, base_delay=0.01, circuit_breaker_threshold=None)
+    async with ClientSession(retry_policy=policy) as client:
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.get(unused_url)
+
+        stats = client.retry_stats
+        assert (stats.retries, stats.retried_requests, stats.exhausted) == (2, 1, 1)
+
+
+async def test_retry_policy_statuses_and_retry_after(status_server):
+    import time
+    from hydrotools._restclient import RetryPolicy
+
+    uri, server = status_server
+    server.statuses = [500, 500]
+    server.headers = {"Retry-After": "0.2"}
+
+    policy = RetryPolicy(statuses={500}, base_delay=0.0, circuit_breaker_threshold=None)
+    async with ClientSession(retry_policy=policy) as client:
+        start = time.monotonic()
+        async with client.get(uri) as resp:
+            assert resp.status == 200
+        # two retries, each waiting Retry-After seconds rather than base_delay
+        assert time.monotonic() - start >= 0.4
+        assert server.called == 3
+        assert client.retry_stats.retries == 2
+
+
+async def test_retry_policy_deadline(status_server):
+    from hydrotools._restclient import RetryPolicy
+
+    uri, server = status_server
+    server.statuses = [503] * 5
+
+    policy = RetryPolicy(
+        base_delay=1.0, jitter=False, deadline=0.5, circuit_breaker_threshold=None
+    )
+    async with ClientSession(retry_policy=policy) as client:
+        async with client.get(uri) as resp:
+            # first retry delay exceeds deadline, give up
+            assert resp.status == 503
+        assert server.called == 1
+        assert client.retry_stats.exhausted == 1
+
+
+async def test_circuit_breaker_fails_fast(status_server):
+    from hydrotools._restclient import CircuitOpenError, RetryPolicy
+
+    uri, server = status_server
+    # statuses that are not retried do not count as failures
+    server.statuses = [500, 503, 503]
+
+    policy = RetryPolicy(
+        n_retries=0, circuit_breaker_threshold=2, circuit_breaker_reset=0.2
+    )
+    async with ClientSession(retry_policy=policy) as client:
+        for status in server.statuses[:]:
+            async with client.get(uri) as resp:
+                assert resp.status == status
+        assert client.retry_stats.open_circuits == (uri.host,)
+
+        with pytest.raises(CircuitOpenError):
+            await client.get(uri)
+        assert server.called == 3
+        assert client.retry_stats.circuit_breaker_rejections == 1
+        assert client.retry_stats.open_circuits == (uri.host,)
+
+        # probe allowed after reset timeout, success closes the circuit
+        import asyncio
+
+        await asyncio.sleep(0.25)
+        async with client.get(uri) as resp:
+            assert resp.status == 200
+        assert client.retry_stats.open_circuits == ()
+
+
+async def test_circuit_breaker_serves_cached_responses(status_server):
+    from aiohttp_client_cache import CacheBackend
+    from hydrotools._restclient import CircuitOpenError, RetryPolicy
+
+    uri, server = status_server
+    policy = RetryPolicy(n_retries=0, circuit_breaker_threshold=1)
+    async with ClientSession(retry_policy=policy, cache=CacheBackend()) as client:
+        cached_uri = uri.with_query(cached=1)
+        async with client.get(cached_uri) as resp:
+            assert resp.status == 200
+
+        server.statuses = [503]
+        async with client.get(uri) as resp:
+            assert resp.status == 503
+        with pytest.raises(CircuitOpenError):
+            await client.get(uri)
+
+        async with client.get(cached_uri) as resp:
+            assert resp.from_cache
+        assert server.called == 2
+        assert client.retry_stats.circuit_breaker_rejections == 1
+
+
 ########### Integration tests with _restclient.urllib ###########
 from hydrotools._restclient.urllib import Url, Variadic
 
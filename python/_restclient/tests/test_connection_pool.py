@@ -0,0 +1,80 @@
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    ConnectionPool,
+    PoolStats,
+    RestClient,
+)
+
+
+@pytest.fixture
+async def pool_server(aiohttp_raw_server):
+    async def handler(request):
+        return web.Response(status=200, text="ok")
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/"))
+
+
+def test_pool_stats_reuse_ratio():
+    assert PoolStats().reuse_ratio is None
+    assert PoolStats(connections_created=1, connections_reused=3).reuse_ratio == 0.75
+
+
+async def test_shared_pool_across_clients(pool_server):
+    pool = ConnectionPool(limit=10, keepalive_timeout=30)
+    a = AsyncRestClient(enable_cache=False, connection_pool=pool)
+    b = AsyncRestClient(enable_cache=False, connection_pool=pool)
+
+    assert a.connection_pool is pool
+    for idx in range(5):
+        await a.get(pool_server, parameters={"id": idx})
+        await b.get(pool_server, parameters={"id": idx})
+
+    assert a._session.connector is b._session.connector
+    stats = b.pool_stats
+    assert stats.sessions == 2
+    # one connection is established and kept alive for all sequential requests
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 9
+
+    connector = a._session.connector
+    await a.close()
+    assert not connector.closed
+    assert pool.stats().sessions == 1
+
+    await b.get(pool_server, parameters={"id": "after close"})
+    await b.close()
+    assert connector.closed
+    assert pool.stats().sessions == 0
+
+
+async def test_pool_connector_recreated_after_close(pool_server):
+    pool = ConnectionPool()
+    async with AsyncRestClient(enable_cache=False, connection_pool=pool) as client:
+        await client.get(pool_server)
+
+    async with AsyncRestClient(enable_cache=False, connection_pool=pool) as client:
+        await client.get(pool_server)
+
+    assert pool.stats().connections_created == 2
+
+
+def test_restclient_connection_pool(pool_server):
+    pool = ConnectionPool(limit_per_host=2)
+    with RestClient(enable_cache=False, connection_pool=pool) as client:
+        client.mget(pool_server, parameters=[{"id": idx} for idx in range(6)])
+
+        assert client.connection_pool is pool
+        stats = client.pool_stats
+        assert stats.connections_created <= 2
+        assert stats.connections_created + stats.connections_reused == 6
+
+
+def test_pool_stats_none_without_pool(pool_server):
+    with RestClient(enable_cache=False) as client:
+        client.get(pool_server)
+        assert client.connection_pool is None
+        assert client.pool_stats is None
@@ -0,0 +1,174 @@
+import asyncio
+import time
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    HedgePolicy,
+    HedgeStats,
+    Instrumentation,
+    RestClient,
+)
+
+
+@pytest.fixture
+async def straggler_server(aiohttp_raw_server):
+    """Server that responds after `delay` seconds to the first request with a given
+    `id`, and immediately to later requests. Records request ids."""
+    received = []
+
+    async def handler(request):
+        key = request.query.get("id")
+        first = key not in received
+        received.append(key)
+        if first:
+            await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.Response(text=key)
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), received
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"percentile": 0},
+        {"percentile": 100},
+        {"max_hedge_ratio": 0},
+        {"min_delay": -1},
+        {"min_samples": 0},
+        {"min_samples": 10, "window": 5},
+    ],
+)
+def test_hedge_policy_invalid(kwargs):
+    with pytest.raises(ValueError):
+        HedgePolicy(**kwargs)
+
+
+def test_hedge_delay_percentile():
+    policy = HedgePolicy(percentile=90, min_delay=0.0, min_samples=10)
+    for latency in range(9):
+        policy.observe("a", latency)
+    assert policy.delay("a") is None
+
+    policy.observe("a", 9)
+    assert policy.delay("a") == pytest.approx(8.1)
+    assert policy.delay("b") is None
+    assert policy.stats().delay_by_host == {"a": pytest.approx(8.1)}
+
+
+def test_hedge_min_delay():
+    policy = HedgePolicy(min_delay=0.5, min_samples=1)
+    policy.observe("a", 0.01)
+    assert policy.delay("a") == 0.5
+
+
+def test_hedge_ratio_cap():
+    policy = HedgePolicy(max_hedge_ratio=0.1)
+    for _ in range(25):
+        policy.delay("a")
+    assert [policy.try_hedge() for _ in range(3)] == [True, True, False]
+
+    stats = policy.stats()
+    assert stats.requests == 25
+    assert stats.hedged == 2
+    assert stats.hedge_ratio == pytest.approx(0.08)
+
+
+async def test_straggler_is_hedged(straggler_server):
+    uri, received = straggler_server
+    instrumentation = Instrumentation()
+    policy = HedgePolicy(min_delay=0.05, min_samples=10, max_hedge_ratio=0.5)
+
+    async with AsyncRestClient(
+        enable_cache=False, hedge_policy=policy, instrumentation=instrumentation
+    ) as client:
+        # measure host latency
+        await client.mget(uri, parameters=[{"id": f"warm{i}"} for i in range(10)])
+        assert client.hedge_stats.hedged == 0
+
+        start = time.perf_counter()
+        response = await client.get(uri, parameters={"id": "slow", "delay": 2})
+        elapsed = time.perf_counter() - start
+
+        assert response.text() == "slow"
+        assert elapsed < 1
+        assert received.count("slow") == 2
+
+        stats = client.hedge_stats
+        assert isinstance(stats, HedgeStats)
+        assert stats.hedged == stats.hedge_wins == 1
+
+        trace = instrumentation.traces[-1]
+        assert trace.hedged and trace.hedge_won
+        assert trace.total >= 0.05
+        assert instrumentation.stats().requests == 11
+        assert instrumentation.stats().hedged == 1
+        assert instrumentation.stats().hedge_wins == 1
+
+
+async def test_hedge_cap_limits_duplicates(straggler_server):
+    uri, received = straggler_server
+    policy = HedgePolicy(min_delay=0.05, min_samples=5, max_hedge_ratio=0.1)
+
+    async with AsyncRestClient(enable_cache=False, hedge_policy=policy) as client:
+        await client.mget(uri, parameters=[{"id": f"warm{i}"} for i in range(5)])
+        await client.mget(
+            uri, parameters=[{"id": f"slow{i}", "delay": 0.3} for i in range(5)]
+        )
+
+        # 10 requests counted, so at most one hedge
+        assert client.hedge_stats.hedged == 1
+        assert len(received) == 11
+
+
+async def test_hedging_disabled_by_default(straggler_server):
+    uri, received = straggler_server
+
+    async with AsyncRestClient(enable_cache=False) as client:
+        await client.get(uri, parameters={"id": "a"})
+        assert client.hedge_policy is None
+        assert client.hedge_stats is None
+
+
+async def test_restclient_hedge_policy(straggler_server):
+    uri, _ = straggler_server
+    policy = HedgePolicy()
+
+    with RestClient(
+        enable_cache=False, hedge_policy=policy, background_loop=True
+    ) as client:
+        response = await asyncio.get_event_loop().run_in_executor(
+            None, lambda: client.get(uri, parameters={"id": "a"})
+        )
+        assert response.text() == "a"
+        assert client.hedge_policy is policy
+        assert client.hedge_stats.requests == 1
+
+
+async def test_observed_latency_excludes_retry_delay(aiohttp_raw_server):
+    from urllib.parse import urlsplit
+    from hydrotools._restclient import RetryPolicy
+
+    received = []
+
+    async def handler(request):
+        received.append(request)
+        if len(received) == 1:
+            return web.Response(status=503, headers={"Retry-After": "0.3"})
+        return web.Response(text="ok")
+
+    server = await aiohttp_raw_server(handler)
+    uri = str(server.make_url("/"))
+    policy = HedgePolicy(min_samples=1, min_delay=0)
+
+    async with AsyncRestClient(
+        enable_cache=False, hedge_policy=policy, retry_policy=RetryPolicy(n_retries=1)
+    ) as client:
+        assert (await client.get(uri)).text() == "ok"
+
+    # latency of the successful attempt, not including the 0.3s Retry-After delay
+    assert len(received) == 2
+    assert policy.delay(urlsplit(uri).netloc) < 0.2
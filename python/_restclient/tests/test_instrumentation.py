@@ -0,0 +1,119 @@
+import asyncio
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    Instrumentation,
+    LatencySummary,
+    MemoryLRUBackend,
+    RetryPolicy,
+)
+
+
+@pytest.fixture
+async def naked_server(aiohttp_raw_server):
+    async def wrap(handler):
+        server = await aiohttp_raw_server(handler)
+        return server
+
+    return wrap
+
+
+@pytest.fixture
+async def flaky_test_server(naked_server):
+    """Server that responds 503 to the first request for each `id` query parameter"""
+    seen = set()
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        key = request.query.get("id")
+        if key not in seen:
+            seen.add(key)
+            return web.Response(status=503)
+        return web.Response(text="x" * 100)
+
+    server = await naked_server(handler)
+    return str(server.make_url("/"))
+
+
+def test_latency_summary():
+    assert LatencySummary.from_samples([None, None]) == LatencySummary()
+
+    summary = LatencySummary.from_samples([float(v) for v in range(1, 101)])
+    assert summary.count == 100
+    assert summary.p50 == pytest.approx(50.5)
+    assert summary.p99 == pytest.approx(99.01)
+    assert summary.max == 100.0
+
+
+async def test_instrumentation_records_requests(flaky_test_server):
+    traces = []
+    instrumentation = Instrumentation(sinks=[traces.append])
+    policy = RetryPolicy(base_delay=0.0, circuit_breaker_threshold=None)
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(),
+        retry_policy=policy,
+        instrumentation=instrumentation,
+    ) as client:
+        assert client.instrumentation is instrumentation
+
+        await client.get(flaky_test_server, parameters={"id": 1})
+        network = traces[-1]
+        assert network.origin == "network"
+        assert (network.status, network.size, network.retries) == (200, 100, 1)
+        assert network.ttfb is not None and network.total >= network.ttfb
+        assert network.connection_reused is not None
+
+        await client.get(flaky_test_server, parameters={"id": 1})
+        cached = traces[-1]
+        assert cached.origin == "cache"
+        assert cached.ttfb is None and cached.retries == 0
+
+        stats = client.trace_stats
+        assert (stats.requests, stats.cache_hits, stats.retries) == (2, 1, 1)
+        assert stats.cache_hit_ratio == 0.5
+        assert stats.bytes == 200
+        assert stats.total.count == stats.window == 2
+        assert stats.ttfb.count == 1
+        assert stats.throughput > 0
+
+
+async def test_instrumentation_records_errors():
+    instrumentation = Instrumentation()
+
+    async with AsyncRestClient(
+        enable_cache=False, retry=False, instrumentation=instrumentation
+    ) as client:
+        with pytest.raises(Exception):
+            # invalid port
+            await client.get("http://127.0.0.1:1/")
+
+        trace = instrumentation.traces[-1]
+        assert trace.status is None and trace.error is not None
+        assert client.trace_stats.errors == 1
+        assert client.trace_stats.cache_hit_ratio is None
+
+
+async def test_instrumentation_sink_errors_warn(flaky_test_server):
+    def bad_sink(trace):
+        raise RuntimeError
+
+    instrumentation = Instrumentation(sinks=[bad_sink], max_traces=1)
+    async with AsyncRestClient(
+        enable_cache=False, retry=False, instrumentation=instrumentation
+    ) as client:
+        with pytest.warns(RuntimeWarning):
+            await client.get(flaky_test_server, parameters={"id": 2})
+
+    instrumentation.remove_sink(bad_sink)
+    instrumentation.reset()
+    assert instrumentation.stats().requests == 0
+
+
+async def test_instrumentation_disabled_by_default(flaky_test_server):
+    async with AsyncRestClient(enable_cache=False) as client:
+        assert client.instrumentation is None
+        assert client.trace_stats is None
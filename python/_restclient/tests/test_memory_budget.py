@@ -0,0 +1,209 @@
+import asyncio
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    MemoryBudget,
+    MemoryBudgetStats,
+    RestClient,
+)
+
+BODY_BYTES = 1000
+
+
+@pytest.fixture
+async def sized_server(aiohttp_raw_server):
+    """Server responding with a `BODY_BYTES` body. Records the number of requests
+    received."""
+    received = []
+
+    async def handler(request):
+        received.append(request.query.get("idx"))
+        return web.Response(body=b"x" * BODY_BYTES)
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), received
+
+
+def test_memory_budget_invalid():
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
+
+
+async def test_first_request_admitted_alone():
+    budget = MemoryBudget(100)
+    first = await budget.acquire()
+    assert first == 100
+
+    # no estimate yet, second request waits for the first response
+    second = asyncio.ensure_future(budget.acquire())
+    await asyncio.sleep(0)
+    assert not second.done()
+    assert budget.stats().waiting == 1
+
+    budget.settle(first, 10)
+    assert await second == 10
+    assert budget.estimated_response_bytes == 10
+    assert budget.held_bytes == 20
+
+
+async def test_oversized_response_does_not_block():
+    budget = MemoryBudget(100)
+    reserved = await budget.acquire()
+    budget.settle(reserved, 500)
+
+    waiter = asyncio.ensure_future(budget.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    budget.release(500)
+    assert await waiter == 500
+    assert budget.stats().peak_held_bytes == 500
+
+
+async def test_cancelled_waiter():
+    budget = MemoryBudget(100)
+    reserved = await budget.acquire()
+
+    waiter = asyncio.ensure_future(budget.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    budget.release(reserved)
+    assert budget.held_bytes == 0
+
+    # cancelled waiter does not block later requests
+    assert await asyncio.wait_for(budget.acquire(), 1) == 100
+
+
+async def test_iter_mget_waits_for_consumer(sized_server):
+    uri, received = sized_server
+    parameters = [{"idx": idx} for idx in range(20)]
+
+    async with AsyncRestClient(enable_cache=False, memory_budget=3500) as client:
+        responses = client.iter_mget(uri, parameters=parameters)
+        await responses.__anext__()
+        # give outstanding requests a chance to run while the consumer is idle
+        await asyncio.sleep(0.2)
+
+        stats = client.memory_budget_stats
+        assert len(received) < len(parameters)
+        assert stats.held_bytes <= stats.max_bytes
+        assert stats.waiting > 0
+
+        n = 1 + len([resp async for _, resp in responses])
+
+        stats = client.memory_budget_stats
+        assert n == len(received) == len(parameters)
+        assert stats.held_bytes == 0
+        assert stats.peak_held_bytes <= 3500
+        assert stats.estimated_response_bytes == BODY_BYTES
+
+
+async def test_iter_mget_early_close_releases_budget(sized_server):
+    uri, _ = sized_server
+    parameters = [{"idx": idx} for idx in range(10)]
+    budget = MemoryBudget(2500)
+
+    async with AsyncRestClient(enable_cache=False, memory_budget=budget) as client:
+        responses = client.iter_mget(uri, parameters=parameters)
+        await responses.__anext__()
+        await asyncio.sleep(0.1)
+        await responses.aclose()
+        # let cancelled requests unwind
+        await asyncio.sleep(0.1)
+
+        assert budget.held_bytes == 0
+        assert client.memory_budget is budget
+
+
+async def test_mget_with_budget(sized_server):
+    uri, received = sized_server
+    parameters = [{"idx": idx} for idx in range(10)]
+
+    async with AsyncRestClient(enable_cache=False, memory_budget=2500) as client:
+        responses = await client.mget(uri, parameters=parameters)
+        assert [len(r.content) for r in responses] == [BODY_BYTES] * 10
+
+        results = await client.mget_results(uri, parameters=parameters)
+        assert results.complete and not results.failed
+        assert client.memory_budget_stats.held_bytes == 0
+
+
+async def test_spilled_bodies_not_counted(sized_server, tmp_path):
+    uri, _ = sized_server
+    parameters = [{"idx": idx} for idx in range(4)]
+
+    async with AsyncRestClient(
+        enable_cache=False, memory_budget=100, spill_threshold=10, spill_dir=tmp_path
+    ) as client:
+        responses = await client.mget(uri, parameters=parameters)
+        assert all(r.spill_path is not None for r in responses)
+        assert client.memory_budget_stats.peak_held_bytes == 100
+        for r in responses:
+            r.close()
+
+
+async def test_restclient_memory_budget(sized_server):
+    uri, _ = sized_server
+    loop = asyncio.get_event_loop()
+
+    client = RestClient(enable_cache=False, memory_budget=2500, background_loop=True)
+    try:
+        # server runs in this loop, iterate from another thread
+        parameters = [{"idx": idx} for idx in range(5)]
+        n = await loop.run_in_executor(
+            None, lambda: sum(1 for _ in client.iter_mget(uri, parameters=parameters))
+        )
+        assert n == 5
+
+        stats = client.memory_budget_stats
+        assert isinstance(stats, MemoryBudgetStats)
+        assert stats.held_bytes == 0
+        assert stats.max_bytes == 2500
+    finally:
+        client.close()
+
+    with RestClient(enable_cache=False, background_loop=True) as client:
+        assert client.memory_budget is None
+        assert client.memory_budget_stats is None
+
+
+async def test_budget_shared_by_background_loops(sized_server):
+    uri, received = sized_server
+    loop = asyncio.get_event_loop()
+    budget = MemoryBudget(int(1.5 * BODY_BYTES))
+
+    clients = [
+        RestClient(enable_cache=False, memory_budget=budget, background_loop=True)
+        for _ in range(2)
+    ]
+    try:
+        # each client's requests wait on, and are admitted from, both loops
+        batches = await asyncio.wait_for(
+            asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        None,
+                        lambda client=client, idx=idx: client.mget(
+                            uri, parameters=[{"idx": f"{idx}-{n}"} for n in range(6)]
+                        ),
+                    )
+                    for idx, client in enumerate(clients)
+                ]
+            ),
+            10,
+        )
+    finally:
+        for client in clients:
+            client.close()
+
+    assert [len(responses) for responses in batches] == [6, 6]
+    assert len(received) == 12
+    stats = budget.stats()
+    assert (stats.held_bytes, stats.waiting) == (0, 0)
+    assert stats.waits > 0
@@ -0,0 +1,179 @@
+import asyncio
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    MemoryLRUBackend,
+    PrefetchProgress,
+    RestClient,
+)
+
+
+@pytest.fixture
+async def counting_server(aiohttp_raw_server):
+    """Server that responds after `delay` seconds with the status given by the
+    `status` query parameter. Records request ids in arrival order."""
+    received = []
+
+    async def handler(request):
+        received.append(request.query.get("id"))
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.Response(
+            status=int(request.query.get("status", 200)),
+            text=request.query.get("id", ""),
+        )
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), received
+
+
+def test_prefetch_progress():
+    progress = PrefetchProgress(total=4, completed=2, failed=1, cached=1)
+    assert progress.pending == 1
+    assert progress.fraction == 0.75
+    assert not progress.done
+    assert PrefetchProgress().done
+    assert PrefetchProgress().fraction == 1.0
+
+
+async def test_prefetch_fills_cache(counting_server):
+    uri, received = counting_server
+    parameters = [{"id": str(idx)} for idx in range(4)]
+    reported = []
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), memory_budget=10_000
+    ) as client:
+        progress = await client.prefetch(
+            uri, parameters=parameters, on_progress=reported.append
+        )
+        assert progress == PrefetchProgress(total=4, completed=4)
+        assert [p.completed for p in reported] == [1, 2, 3, 4]
+        assert client.memory_budget_stats.held_bytes == 0
+
+        response = await client.get(uri, parameters={"id": "2"})
+        assert response.from_cache
+        assert response.text() == "2"
+        assert len(received) == 4
+
+        # already cached
+        progress = await client.prefetch(uri, parameters=parameters)
+        assert progress.cached == 4
+        assert len(received) == 4
+
+
+async def test_prefetch_counts_failures(counting_server):
+    uri, _ = counting_server
+    parameters = [{"id": "a"}, {"id": "b", "status": 500}]
+
+    async with AsyncRestClient(cache_backend=MemoryLRUBackend(), retry=False) as client:
+        progress = await client.prefetch(uri, parameters=parameters)
+    assert progress == PrefetchProgress(total=2, completed=1, failed=1)
+
+
+async def test_prefetch_is_low_priority(counting_server):
+    uri, received = counting_server
+    parameters = [{"id": f"prefetch{idx}", "delay": 0.1} for idx in range(4)]
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), max_in_flight=1
+    ) as client:
+        prefetch = asyncio.ensure_future(client.prefetch(uri, parameters=parameters))
+        await asyncio.sleep(0.05)
+        await client.get(uri, parameters={"id": "interactive"})
+
+        # sent as soon as the first prefetch request released its slot
+        assert received[:2] == ["prefetch0", "interactive"]
+        assert (await prefetch).completed == 4
+
+
+async def test_prefetch_cancel(counting_server):
+    uri, received = counting_server
+    parameters = [{"id": str(idx), "delay": 1} for idx in range(4)]
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), max_in_flight=1
+    ) as client:
+        prefetch = asyncio.ensure_future(client.prefetch(uri, parameters=parameters))
+        await asyncio.sleep(0.05)
+        prefetch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await prefetch
+        await asyncio.sleep(0.05)
+        assert client.scheduler_stats.queued == 0
+    assert len(received) == 1
+
+
+async def test_restclient_prefetch(counting_server):
+    uri, received = counting_server
+    parameters = [{"id": str(idx)} for idx in range(3)]
+    loop = asyncio.get_event_loop()
+
+    with RestClient(
+        cache_backend=MemoryLRUBackend(), background_loop=True
+    ) as client:
+        prefetch = client.prefetch(uri, parameters=parameters)
+        assert prefetch.progress().total == 3
+
+        progress = await loop.run_in_executor(None, prefetch.wait)
+        assert progress == PrefetchProgress(total=3, completed=3)
+        assert prefetch.done
+        assert prefetch.progress() == progress
+
+        response = await loop.run_in_executor(
+            None, lambda: client.get(uri, parameters={"id": "1"})
+        )
+        assert response.from_cache
+        assert len(received) == 3
+
+
+async def test_restclient_prefetch_wait_timeout(counting_server):
+    uri, _ = counting_server
+    parameters = [{"id": str(idx), "delay": 1} for idx in range(2)]
+    loop = asyncio.get_event_loop()
+
+    with RestClient(
+        cache_backend=MemoryLRUBackend(), background_loop=True
+    ) as client:
+        prefetch = client.prefetch(uri, parameters=parameters)
+        with pytest.raises(asyncio.TimeoutError):
+            await loop.run_in_executor(None, lambda: prefetch.wait(0.05))
+        assert not prefetch.done
+    # closing the client cancels the prefetch
+    assert prefetch.done
+
+
+async def test_restclient_prefetch_reports_progress(counting_server, monkeypatch):
+    import time
+    from hydrotools._restclient import _restclient, Prefetch
+
+    class SlowPrefetch(Prefetch):
+        def __init__(self, *args, **kwargs):
+            # the background loop runs while the handle is being created
+            time.sleep(0.1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(_restclient, "Prefetch", SlowPrefetch)
+    uri, received = counting_server
+    parameters = [{"id": str(idx)} for idx in range(3)]
+    reported = []
+    loop = asyncio.get_event_loop()
+
+    with RestClient(
+        cache_backend=MemoryLRUBackend(), background_loop=True
+    ) as client:
+        await loop.run_in_executor(
+            None, lambda: client.mget([uri] * 3, parameters=parameters)
+        )
+        # cached requests report progress as soon as the prefetch runs
+        prefetch = client.prefetch(
+            uri, parameters=parameters, on_progress=reported.append
+        )
+        progress = await loop.run_in_executor(None, prefetch.wait)
+
+    assert progress == PrefetchProgress(total=3, completed=3, cached=3)
+    assert prefetch.progress() == progress
+    assert reported[-1] == progress
+    assert len(received) == 3
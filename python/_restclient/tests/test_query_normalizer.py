@@ -0,0 +1,128 @@
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    HTTPArchive,
+    MemoryLRUBackend,
+    QueryNormalizer,
+    RestClient,
+    Variadic,
+    measure_normalization,
+)
+
+normalizer = QueryNormalizer(
+    unordered=["sites", "parameterCd"], lowercase=["siteStatus"]
+)
+
+
+@pytest.fixture
+async def query_server(aiohttp_raw_server):
+    """Server that responds with the request's query string"""
+    queries = []
+
+    async def handler(request):
+        queries.append(request.query_string)
+        return web.Response(status=200, text=request.query_string)
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), queries
+
+
+def test_normalize_sorts_keys_and_unordered_values():
+    assert normalizer(
+        {"sites": "02,01,02", "format": "json", "parameterCd": ["00065", "00060"]}
+    ) == {"format": "json", "parameterCd": ["00060", "00065"], "sites": "01,02"}
+
+
+def test_normalize_case():
+    n = QueryNormalizer(lowercase=["a"], uppercase=["b"])
+    assert n({"a": "ALL", "b": ["x", "Y"], "c": "Keep"}) == {
+        "a": "all",
+        "b": ["X", "Y"],
+        "c": "Keep",
+    }
+
+
+def test_normalize_preserves_variadic():
+    value = normalizer({"sites": Variadic(["b", "a"])})["sites"]
+    assert type(value) is Variadic
+    assert value.data == "a,b"
+
+
+def test_normalize_without_key_sort():
+    n = QueryNormalizer(sort_keys=False)
+    assert list(n({"b": 1, "a": 2})) == ["b", "a"]
+
+
+def test_measure_normalization():
+    base = "https://waterservices.usgs.gov/nwis/iv/?format=json"
+    urls = [
+        f"{base}&sites=01%2C02&siteStatus=all",
+        f"{base}&sites=02%2C01&siteStatus=ALL",
+        f"{base}&siteStatus=all&sites=01%2C02",
+        f"{base}&sites=03&siteStatus=all",
+    ]
+    report = measure_normalization(urls, normalizer)
+
+    assert report.requests == 4
+    # parameter order is already ignored by cache keys
+    assert report.unique_keys == 3
+    assert report.normalized_unique_keys == 2
+    assert report.hit_rate == 0.25
+    assert report.normalized_hit_rate == 0.5
+
+
+async def test_equivalent_queries_share_cache_entry(query_server):
+    uri, queries = query_server
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), query_normalizer=normalizer
+    ) as client:
+        r1 = await client.get(uri, parameters={"sites": "01,02", "siteStatus": "ALL"})
+        r2 = await client.get(uri, parameters={"siteStatus": "all", "sites": "02,01"})
+
+        assert client.cache_stats.hits == 1
+
+    assert len(queries) == 1
+    assert sorted(queries[0].split("&")) == ["siteStatus=all", "sites=01,02"]
+    assert r1.text() == r2.text()
+
+
+async def test_registered_normalizer_longest_prefix(query_server):
+    uri, queries = query_server
+    lower = QueryNormalizer(lowercase=["q"])
+    upper = QueryNormalizer(uppercase=["q"])
+
+    async with AsyncRestClient(enable_cache=False, base_url=uri) as client:
+        client.register_query_normalizer(uri, lower)
+        client.register_query_normalizer(uri + "upper", upper)
+
+        await client.get("lower", parameters={"q": "A"})
+        await client.get("upper", parameters={"q": "a"})
+
+        client.register_query_normalizer(uri, None)
+        client.register_query_normalizer(uri + "upper", None)
+        await client.get("none", parameters={"q": "A"})
+
+    assert queries == ["q=a", "q=A", "q=A"]
+
+
+def test_restclient_query_normalizer(query_server, tmp_path):
+    uri, queries = query_server
+    archive = HTTPArchive(tmp_path, mode="record")
+
+    with RestClient(
+        enable_cache=False, query_normalizer=normalizer, archive=archive
+    ) as client:
+        assert client.query_normalizer is normalizer
+        client.mget(
+            uri,
+            parameters=[{"sites": "02,01"}, {"sites": "01,02"}, {"sites": "03"}],
+        )
+
+    # equivalent concurrent requests are coalesced
+    assert sorted(queries) == ["sites=01,02", "sites=03"]
+    recorded = sorted(url for _, url in archive)
+    assert len(recorded) == 2
+    assert measure_normalization(recorded, normalizer).normalized_unique_keys == 2
@@ -0,0 +1,143 @@
+import time
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    MemoryLRUBackend,
+    RateLimiter,
+    RestClient,
+    TokenBucket,
+)
+
+
+@pytest.fixture
+async def timestamp_server(aiohttp_raw_server):
+    """Server that records the arrival time of each request. Responds with the status
+    given by the `status` query parameter."""
+    arrivals = []
+
+    async def handler(request):
+        arrivals.append(time.monotonic())
+        return web.Response(status=int(request.query.get("status", 200)), text="ok")
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), arrivals
+
+
+def test_token_bucket_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_refund():
+    bucket = TokenBucket(rate=1)
+    bucket.reserve()
+    assert bucket.reserve() > 0
+    bucket.refund()
+    assert bucket.tokens == pytest.approx(0.0, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"rate": 0},
+        {"rate": 1, "burst": 0.5},
+        {"rate": 1, "decrease_factor": 1},
+        {"rate": 1, "min_rate": 2},
+    ],
+)
+def test_rate_limiter_invalid(kwargs):
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+def test_adaptive_decrease_and_recovery():
+    limiter = RateLimiter(10, adaptive=True, min_rate=2, increase=0.1)
+    sent_at = time.monotonic()
+
+    limiter.record("a", 429, sent_at)
+    assert limiter.rate_for("a") == 5
+    # sent before the decrease, does not decrease again
+    limiter.record("a", 429, sent_at)
+    assert limiter.rate_for("a") == 5
+
+    limiter.record("a", 429, time.monotonic())
+    limiter.record("a", 429, time.monotonic())
+    assert limiter.rate_for("a") == 2
+
+    for _ in range(20):
+        limiter.record("a", 200, time.monotonic())
+    assert limiter.rate_for("a") == 10
+    assert limiter.rate_for("b") == 10
+
+    stats = limiter.stats()
+    assert stats.throttled == 4
+    assert stats.rate_decreases == 3
+    assert stats.rates == {"a": 10}
+
+
+def test_non_adaptive_counts_429_without_decrease():
+    limiter = RateLimiter(10)
+    limiter.record("a", 429, time.monotonic())
+    assert limiter.rate_for("a") == 10
+    assert limiter.stats().throttled == 1
+
+
+async def test_requests_are_paced(timestamp_server):
+    uri, arrivals = timestamp_server
+    limiter = RateLimiter(20, burst=2)
+
+    async with AsyncRestClient(enable_cache=False, rate_limiter=limiter) as client:
+        await client.mget(uri, parameters=[{"id": idx} for idx in range(6)])
+        stats = client.rate_limit_stats
+
+    # 2 burst requests, then 4 paced at 20 per second
+    assert arrivals[-1] - arrivals[0] >= 0.15
+    assert stats.acquired == 6
+    assert stats.delayed == 4
+
+
+async def test_cached_responses_do_not_consume_tokens(timestamp_server):
+    uri, arrivals = timestamp_server
+    limiter = RateLimiter(1)
+
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), rate_limiter=limiter
+    ) as client:
+        for _ in range(3):
+            await client.get(uri)
+
+    assert len(arrivals) == 1
+    assert limiter.stats().acquired == 1
+
+
+async def test_adaptive_limiter_slows_on_429(timestamp_server):
+    uri, _ = timestamp_server
+    limiter = RateLimiter(100, burst=5, adaptive=True)
+
+    async with AsyncRestClient(
+        enable_cache=False, retry=False, rate_limiter=limiter
+    ) as client:
+        r = await client.get(uri, parameters={"status": 429})
+        assert r.status == 429
+
+    host = next(iter(limiter.stats().rates))
+    assert limiter.rate_for(host) == 50
+
+
+def test_restclient_rate_limiter(timestamp_server):
+    uri, _ = timestamp_server
+    limiter = RateLimiter(100)
+
+    with RestClient(enable_cache=False, rate_limiter=limiter) as client:
+        client.get(uri)
+        assert client.rate_limiter is limiter
+        assert client.rate_limit_stats.acquired == 1
+
+    with RestClient(enable_cache=False) as client:
+        assert client.rate_limit_stats is None
@@ -0,0 +1,116 @@
+import time
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    ArchiveMissError,
+    AsyncRestClient,
+    HTTPArchive,
+)
+
+
+@pytest.fixture
+async def naked_server(aiohttp_raw_server):
+    async def wrap(handler):
+        server = await aiohttp_raw_server(handler)
+        return server
+
+    return wrap
+
+
+@pytest.fixture
+async def counting_test_server(naked_server):
+    """Server that counts the requests it receives and echos the `id` parameter"""
+    counter = {"requests": 0}
+
+    async def handler(request):
+        counter["requests"] += 1
+        return web.json_response({"id": request.query.get("id")}, status=200)
+
+    server = await naked_server(handler)
+    return str(server.make_url("/")), counter
+
+
+def test_archive_save_load(tmp_path):
+    archive = HTTPArchive(tmp_path / "archive", mode="record")
+    assert archive.recording and not archive.replaying
+
+    archive.save(
+        "get",
+        "https://www.fake.gov/?a=1",
+        status=200,
+        body=b"x" * 1000,
+        headers=[("Content-Type", "text/plain")],
+        reason="OK",
+        elapsed=0.5,
+    )
+    assert ("GET", "https://www.fake.gov/?a=1") in archive
+    assert len(archive) == 1
+
+    archived = HTTPArchive(tmp_path / "archive").load("GET", "https://www.fake.gov/?a=1")
+    assert (archived.status, archived.reason, archived.elapsed) == (200, "OK", 0.5)
+    assert archived.body == b"x" * 1000
+
+    response = archived.to_response()
+    assert response.text() == "x" * 1000
+    assert response.headers["content-type"] == "text/plain"
+
+
+def test_archive_save_file(tmp_path):
+    body = tmp_path / "body.nc"
+    body.write_bytes(b"netcdf")
+
+    archive = HTTPArchive(tmp_path / "archive", mode="record")
+    archive.save_file("GET", "https://www.fake.gov/file.nc", status=200, body_path=body)
+    assert archive.load("GET", "https://www.fake.gov/file.nc").body == b"netcdf"
+
+
+def test_archive_errors(tmp_path):
+    with pytest.raises(ValueError):
+        HTTPArchive(tmp_path, mode="rewind")
+
+    with pytest.raises(FileNotFoundError):
+        HTTPArchive(tmp_path / "missing")
+
+    archive = HTTPArchive(tmp_path)
+    with pytest.raises(ArchiveMissError):
+        archive.load("GET", "https://www.fake.gov")
+
+    with pytest.raises(RuntimeError):
+        archive.save("GET", "https://www.fake.gov", status=200)
+
+
+async def test_record_then_replay(counting_test_server, tmp_path):
+    uri, counter = counting_test_server
+    parameters = [{"id": str(idx)} for idx in range(3)]
+
+    recorder = HTTPArchive(tmp_path, mode="record")
+    async with AsyncRestClient(enable_cache=False, archive=recorder) as client:
+        recorded = await client.mget(uri, parameters=parameters)
+    assert counter["requests"] == 3
+    assert len(recorder) == 3
+
+    replayer = HTTPArchive(tmp_path)
+    async with AsyncRestClient(enable_cache=False, archive=replayer) as client:
+        assert client.archive is replayer
+        replayed = await client.mget(uri, parameters=parameters)
+
+        with pytest.raises(ArchiveMissError):
+            await client.get(uri, parameters={"id": "not recorded"})
+
+    # served without network access
+    assert counter["requests"] == 3
+    assert [r.json() for r in replayed] == [r.json() for r in recorded]
+    assert [len(r.content) for r in replayed] == [len(r.content) for r in recorded]
+
+
+async def test_replay_simulated_latency(tmp_path):
+    recorder = HTTPArchive(tmp_path, mode="record")
+    recorder.save("GET", "https://www.fake.gov/", status=200, body=b"{}", elapsed=0.2)
+
+    replayer = HTTPArchive(tmp_path, simulate_latency=True, latency_scale=0.5)
+    async with AsyncRestClient(enable_cache=False, archive=replayer) as client:
+        start = time.monotonic()
+        await client.get("https://www.fake.gov/")
+        assert time.monotonic() - start >= 0.1
@@ -0,0 +1,241 @@
+import gc
+import json
+
+import aiohttp
+from aiohttp import web
+import pytest
+from hydrotools._restclient import (
+    AsyncRestClient,
+    HTTPArchive,
+    MemoryLRUBackend,
+    Response,
+    SpilledBody,
+    get_json_decoder,
+)
+
+
+def test_response_json_and_text():
+    body = '{"site": "Ñandú"}'.encode("utf-8")
+    r = Response(200, body, headers={"Content-Type": "application/json"})
+
+    assert r.json() == {"site": "Ñandú"}
+    assert r.text() == '{"site": "Ñandú"}'
+    assert r.content == body
+    assert r.ok
+    assert not r.from_cache
+
+
+def test_response_charset():
+    body = "Ñandú".encode("latin-1")
+    r = Response(200, body, headers={"Content-Type": "text/plain; charset=latin-1"})
+    assert r.text() == "Ñandú"
+
+
+@pytest.mark.parametrize(
+    "content_type", ["application/json", "application/geo+json; charset=utf-8"]
+)
+def test_response_json_content_types(content_type):
+    r = Response(200, b"[1, 2]", headers={"Content-Type": content_type})
+    assert r.json() == [1, 2]
+
+
+def test_response_json_unexpected_content_type():
+    r = Response(200, b"[1, 2]", headers={"Content-Type": "text/html"})
+    with pytest.raises(aiohttp.ContentTypeError):
+        r.json()
+    assert r.json(content_type=None) == [1, 2]
+
+
+def test_response_empty_json():
+    r = Response(204, b" ", headers={"Content-Type": "application/json"})
+    assert r.json() is None
+
+
+def test_response_raise_for_status():
+    Response(200, b"").raise_for_status()
+    with pytest.raises(aiohttp.ClientResponseError):
+        Response(404, b"", reason="Not Found").raise_for_status()
+
+
+def test_response_is_slotted():
+    r = Response(200, b"")
+    with pytest.raises(AttributeError):
+        r.some_attribute = None
+
+
+@pytest.mark.parametrize("decoder", [None, "stdlib", "orjson"])
+def test_get_json_decoder(decoder):
+    if decoder == "orjson":
+        pytest.importorskip("orjson")
+    loads = get_json_decoder(decoder)
+    assert loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+
+
+def test_get_json_decoder_callable_and_unknown():
+    def decoder(body: bytes):
+        return body
+
+    assert get_json_decoder(decoder) is decoder
+    with pytest.raises(ValueError):
+        get_json_decoder("simplejson")
+
+
+def test_response_json_decodes_bytes():
+    received = []
+
+    def decoder(body):
+        received.append(body)
+        return {}
+
+    body = b'{"a": 1}\n'
+    r = Response(
+        200, body, headers={"Content-Type": "application/json"}, json_decoder=decoder
+    )
+    r.json()
+    # body is passed as is, without decoding or copying
+    assert received[0] is body
+
+    # str based loads overrides json_decoder
+    assert r.json(loads=lambda s: s) == '{"a": 1}\n'
+
+
+def test_response_json_transcodes_non_utf8():
+    body = '{"site": "Ñandú"}'.encode("latin-1")
+    r = Response(
+        200, body, headers={"Content-Type": "application/json; charset=latin-1"}
+    )
+    assert r.json() == {"site": "Ñandú"}
+
+
+def test_spilled_body(tmp_path):
+    body = SpilledBody.write(b' {"a": [1, 2]} ', dir=tmp_path)
+    r = Response(200, body, headers={"Content-Type": "application/json"})
+
+    assert r.spill_path == body.path
+    assert body.path.parent == tmp_path
+    assert r.size == len(body) == 15
+    assert r.json() == {"a": [1, 2]}
+    assert r.text() == ' {"a": [1, 2]} '
+    assert r.content == b' {"a": [1, 2]} '
+    assert bytes(r.buffer[1:4]) == b'{"a'
+    with r.open() as f:
+        assert f.read(2) == b" {"
+
+    r.close()
+    assert body.closed
+    assert not body.path.exists()
+    with pytest.raises(ValueError):
+        r.buffer
+
+
+def test_spilled_body_json_non_utf8(tmp_path):
+    body = SpilledBody.write('{"site": "Ñandú"}'.encode("latin-1"), dir=tmp_path)
+    r = Response(
+        200, body, headers={"Content-Type": "application/json; charset=latin-1"}
+    )
+    assert r.json() == {"site": "Ñandú"}
+    assert r.json(loads=json.loads) == {"site": "Ñandú"}
+
+
+def test_spilled_body_removed_when_collected(tmp_path):
+    r = Response(200, SpilledBody.write(b"data", dir=tmp_path))
+    path = r.spill_path
+    assert r.text() == "data"
+
+    del r
+    gc.collect()
+    assert not path.exists()
+
+
+def test_spilled_body_decoder_receives_buffer(tmp_path):
+    pytest.importorskip("orjson")
+    received = []
+
+    def decoder(body):
+        received.append(body)
+        return get_json_decoder("orjson")(body)
+
+    r = Response(
+        200,
+        SpilledBody.write(b"[1]", dir=tmp_path),
+        headers={"Content-Type": "application/json"},
+        json_decoder=decoder,
+    )
+    assert r.json() == [1]
+    assert isinstance(received[0], memoryview)
+
+
+def test_spilled_whitespace_json(tmp_path):
+    r = Response(
+        200,
+        SpilledBody.write(b" \n ", dir=tmp_path),
+        headers={"Content-Type": "application/json"},
+    )
+    assert r.json() is None
+
+
+@pytest.fixture
+async def json_server(aiohttp_raw_server):
+    """Server that responds with a json list of `n` (query parameter) integers, using
+    chunked transfer encoding if `chunked` is set"""
+
+    async def handler(request):
+        body = json.dumps(list(range(int(request.query["n"])))).encode()
+        if "chunked" not in request.query:
+            return web.Response(body=body, content_type="application/json")
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        for idx in range(0, len(body), 1000):
+            await response.write(body[idx : idx + 1000])
+        await response.write_eof()
+        return response
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/"))
+
+
+@pytest.mark.parametrize("decoder", ["stdlib", "orjson"])
+async def test_client_spills_large_bodies(json_server, tmp_path, decoder):
+    if decoder == "orjson":
+        pytest.importorskip("orjson")
+
+    async with AsyncRestClient(
+        enable_cache=False, spill_threshold=1024, spill_dir=tmp_path, json_decoder=decoder
+    ) as client:
+        assert client.spill_threshold == 1024
+        small = await client.get(json_server, parameters={"n": 10})
+        large = await client.get(json_server, parameters={"n": 5000})
+        chunked = await client.get(json_server, parameters={"n": 5000, "chunked": 1})
+
+    assert small.spill_path is None
+    assert small.json() == list(range(10))
+    for r in (large, chunked):
+        assert r.spill_path.parent == tmp_path
+        assert r.size == r.spill_path.stat().st_size
+        assert r.json() == list(range(5000))
+
+
+async def test_client_spills_cached_bodies(json_server, tmp_path):
+    async with AsyncRestClient(
+        cache_backend=MemoryLRUBackend(), spill_threshold=1024, spill_dir=tmp_path
+    ) as client:
+        first = await client.get(json_server, parameters={"n": 5000})
+        second = await client.get(json_server, parameters={"n": 5000})
+
+    assert second.from_cache
+    assert first.spill_path != second.spill_path
+    assert first.json() == second.json() == list(range(5000))
+
+
+async def test_archive_records_spilled_body(json_server, tmp_path):
+    archive = HTTPArchive(tmp_path / "archive", mode="record")
+    async with AsyncRestClient(
+        enable_cache=False, spill_threshold=1024, spill_dir=tmp_path, archive=archive
+    ) as client:
+        r = await client.get(json_server, parameters={"n": 5000})
+
+    assert r.spill_path is not None
+    archived = archive.load("GET", r.url)
+    assert archived.body == r.content
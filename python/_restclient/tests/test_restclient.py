@@ -122,6 +122,69 @@ def test_mget_with_cache_using_context_manager(basic_test_server, temp_sqlite_db
         assert len(response) == 1
 
 
+@pytest.fixture
+async def delayed_test_server(naked_server):
+    """Server that sleeps `delay` seconds (query parameter) before responding"""
+    import asyncio
+    import json
+
+    async def handler(request):
+        delay = float(request.query.get("delay", 0))
+        await asyncio.sleep(delay)
+        return web.Response(
+            status=200,
+            text=json.dumps({"delay": delay}),
+            content_type="application/json",
+        )
+
+    server = await naked_server(handler)
+    return str(server.make_url("/"))
+
+
+def test_iter_mget_without_cache(basic_test_server):
+    uri, data = basic_test_server
+
+    with RestClient(enable_cache=False) as client:
+        rs = list(client.iter_mget([uri for _ in range(10)]))
+
+        assert sorted(idx for idx, _ in rs) == list(range(10))
+        assert all(r.json() == data for _, r in rs)
+
+
+def test_iter_mget_yields_in_completion_order(delayed_test_server):
+    uri = delayed_test_server
+    parameters = [{"delay": 0.3}, {"delay": 0.0}, {"delay": 0.15}]
+
+    with RestClient(enable_cache=False) as client:
+        rs = list(client.iter_mget(uri, parameters=parameters))
+
+        assert [idx for idx, _ in rs] == [1, 2, 0]
+        assert all(r.json()["delay"] == parameters[idx]["delay"] for idx, r in rs)
+
+
+def test_mget_returns_in_request_order(delayed_test_server):
+    uri = delayed_test_server
+    parameters = [{"delay": 0.2}, {"delay": 0.0}, {"delay": 0.1}]
+
+    with RestClient(enable_cache=False) as client:
+        rs = client.mget(uri, parameters=parameters)
+
+        assert [r.json()["delay"] for r in rs] == [0.2, 0.0, 0.1]
+
+
+def test_mget_respects_max_in_flight(delayed_test_server):
+    uri = delayed_test_server
+
+    with RestClient(enable_cache=False, max_in_flight=2) as client:
+        parameters = [{"delay": 0.05, "id": idx} for idx in range(6)]
+        client.mget(uri, parameters=parameters)
+        stats = client.scheduler_stats
+
+        assert stats.peak_in_flight == 2
+        assert stats.submitted == stats.completed == 6
+        assert stats.in_flight == stats.queued == 0
+
+
 def test_headers(basic_test_server):
     uri, _ = basic_test_server
     headers = {"some": "headers"}
@@ -184,3 +247,53 @@ def test_restclient_nest_asyncio_ModuleNotFoundError(loop):
                 RestClient(enable_cache=False)
 
     loop.run_until_complete(test())
+
+
+async def test_background_loop_shared_by_threads(basic_test_server):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from functools import partial
+
+    uri, data = basic_test_server
+    loop = asyncio.get_event_loop()
+
+    client = RestClient(enable_cache=False, background_loop=True)
+    assert client.background_loop
+    assert client._loop is not loop
+
+    # requests are made from worker threads while the test loop serves requests
+    with ThreadPoolExecutor(8) as pool:
+        responses = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, partial(client.get, uri, parameters={"id": i}))
+                for i in range(32)
+            )
+        )
+
+    assert all(r.json() == data for r in responses)
+    assert client.scheduler_stats.completed == 32
+
+    client.close()
+    assert client._session.closed
+    assert not client._loop_thread.running
+    # idempotent
+    client.close()
+
+
+async def test_background_loop_within_running_loop(tmp_path):
+    from hydrotools._restclient import HTTPArchive
+
+    url = "https://www.test.gov/"
+    HTTPArchive(tmp_path, mode="record").save("GET", url, status=200, body=b"ok")
+
+    # no nest_asyncio required, the calling loop is not re-entered
+    with RestClient(
+        enable_cache=False, archive=HTTPArchive(tmp_path), background_loop=True
+    ) as client:
+        assert client.get(url).text() == "ok"
+        assert [r.text() for _, r in client.iter_mget([url, url])] == ["ok", "ok"]
+
+
+def test_background_loop_and_loop_are_exclusive(loop):
+    with pytest.raises(ValueError):
+        RestClient(enable_cache=False, loop=loop, background_loop=True)
@@ -0,0 +1,153 @@
+from collections import Counter
+import json
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    MGetCheckpoint,
+    MGetError,
+    MGetResults,
+    RestClient,
+)
+
+
+@pytest.fixture
+async def flaky_server(aiohttp_raw_server):
+    """Server that responds 500 to the first `fail` (query parameter) requests for
+    each `id`, then 200"""
+    hits = Counter()
+
+    async def handler(request):
+        idx = request.query["id"]
+        hits[idx] += 1
+        if hits[idx] <= int(request.query.get("fail", 0)):
+            return web.Response(status=500, text="error")
+        return web.Response(status=200, text=idx)
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), hits
+
+
+def parameter_sets(n, failing=(), fail=1):
+    return [{"id": idx, "fail": fail if idx in failing else 0} for idx in range(n)]
+
+
+async def test_partial_failure_keeps_responses(flaky_server):
+    uri, _ = flaky_server
+
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        results = await client.mget_results(
+            uri, parameters=parameter_sets(5, failing={1, 3})
+        )
+
+    assert isinstance(results, MGetResults)
+    assert len(results) == 5
+    assert results.succeeded == [0, 2, 4]
+    assert results.failed == [1, 3]
+    assert not results.complete
+    assert [r.text() for _, r in results.items()] == ["0", "2", "4"]
+    assert results[-1].text() == "4"
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        results[1]
+
+    with pytest.raises(MGetError) as e:
+        results.raise_for_failures()
+    assert sorted(e.value.errors) == [1, 3]
+
+
+async def test_exceptions_are_recorded(flaky_server, aiohttp_unused_port):
+    uri, _ = flaky_server
+    unreachable = f"http://127.0.0.1:{aiohttp_unused_port()}/"
+
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        results = await client.mget_results(
+            [uri, unreachable], parameters={"id": "a"}
+        )
+
+    assert results.succeeded == [0]
+    assert isinstance(results.errors[1], aiohttp.ClientConnectionError)
+
+
+async def test_retry_failed(flaky_server):
+    uri, hits = flaky_server
+
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        results = await client.mget_results(
+            uri, parameters=parameter_sets(4, failing={2}, fail=2)
+        )
+        assert results.failed == [2]
+
+        assert await client.retry_failed(results) is results
+        assert results.failed == [2]
+
+        await client.retry_failed(results)
+        assert results.complete
+        assert results[2].text() == "2"
+
+    # only the failing request was reissued
+    assert hits == {"0": 1, "1": 1, "2": 3, "3": 1}
+
+
+async def test_checkpoint_resumes(flaky_server, tmp_path):
+    uri, hits = flaky_server
+    path = tmp_path / "job.checkpoint"
+    parameters = parameter_sets(6, failing={4})
+
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        results = await client.mget_results(uri, parameters=parameters, checkpoint=path)
+        assert results.failed == [4]
+
+    assert json.loads(path.read_text())["completed"] == [0, 1, 2, 3, 5]
+
+    # restarted job, only the missing request is made
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        results = await client.mget_results(uri, parameters=parameters, checkpoint=path)
+
+    assert results.skipped == [0, 1, 2, 3, 5]
+    assert results.succeeded == [4]
+    assert results.complete
+    assert hits["4"] == 2
+    assert sum(hits.values()) == 7
+
+    with pytest.raises(KeyError):
+        results[0]
+
+    checkpoint = MGetCheckpoint(path)
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        with pytest.raises(ValueError):
+            await client.mget_results(
+                uri, parameters=parameter_sets(7), checkpoint=checkpoint
+            )
+
+    checkpoint.delete()
+    assert not path.exists()
+
+
+def test_checkpoint_flush_every(tmp_path):
+    checkpoint = MGetCheckpoint(tmp_path / "c", flush_every=2)
+    checkpoint.load("fingerprint", 3)
+
+    checkpoint.add(0)
+    assert not checkpoint.path.exists()
+    checkpoint.add(1)
+    assert json.loads(checkpoint.path.read_text())["completed"] == [0, 1]
+
+
+def test_restclient_mget_results(flaky_server, tmp_path):
+    uri, _ = flaky_server
+
+    with RestClient(enable_cache=False, retry=False) as client:
+        results = client.mget_results(
+            uri,
+            parameters=parameter_sets(3, failing={0}),
+            checkpoint=str(tmp_path / "c"),
+        )
+        assert results.failed == [0]
+
+        client.retry_failed(results)
+        assert results.complete
+        assert [idx for idx, _ in results.items()] == [0, 1, 2]
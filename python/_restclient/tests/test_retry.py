@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from hydrotools._restclient.retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after("not a date") is None
+
+    future = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 < parse_retry_after(format_datetime(future, usegmt=True)) <= 60
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+    assert [policy.delay(n) for n in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    jittered = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    assert all(0 <= jittered.delay(3) <= 5.0 for _ in range(100))
+
+
+def test_retry_policy_validation():
+    with pytest.raises(ValueError):
+        RetryPolicy(n_retries=-1)
+    with pytest.raises(ValueError):
+        RetryPolicy(circuit_breaker_threshold=0)
+    assert RetryPolicy(statuses=[500]).statuses == frozenset({500})
+
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in() <= 60
+
+    # reset timeout elapsed, single probe allowed
+    breaker._opened_at -= 60
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # failed probe reopens circuit
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker._opened_at -= 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+
+from hydrotools._restclient.scheduler import RequestScheduler, SchedulerStats
+
+
+async def run_requests(scheduler, hosts, duration=0.01):
+    """Run a request per host in `hosts`; return peak concurrency, total and per host"""
+    running = {"total": 0, "peak": 0, "by_host": {}, "peak_by_host": {}}
+
+    async def request(host):
+        async with scheduler.slot(host):
+            running["total"] += 1
+            running["by_host"][host] = running["by_host"].get(host, 0) + 1
+            running["peak"] = max(running["peak"], running["total"])
+            running["peak_by_host"][host] = max(
+                running["peak_by_host"].get(host, 0), running["by_host"][host]
+            )
+            await asyncio.sleep(duration)
+            running["total"] -= 1
+            running["by_host"][host] -= 1
+
+    await asyncio.gather(*[request(host) for host in hosts])
+    return running
+
+
+async def test_max_in_flight():
+    scheduler = RequestScheduler(max_in_flight=3)
+    running = await run_requests(scheduler, ["a"] * 10)
+
+    assert running["peak"] == 3
+
+    stats = scheduler.stats()
+    assert stats.peak_in_flight == 3
+    assert stats.peak_queued == 7
+    assert stats.submitted == stats.completed == 10
+    assert stats.in_flight == stats.queued == 0
+
+
+async def test_max_in_flight_per_host():
+    scheduler = RequestScheduler(max_in_flight=4, max_in_flight_per_host=1)
+    running = await run_requests(scheduler, ["a", "b"] * 5)
+
+    assert running["peak"] == 2
+    assert running["peak_by_host"] == {"a": 1, "b": 1}
+
+
+async def test_host_limit_does_not_block_other_hosts():
+    scheduler = RequestScheduler(max_in_flight=2, max_in_flight_per_host=1)
+    order = []
+
+    async def request(host, duration):
+        async with scheduler.slot(host):
+            order.append(host)
+            await asyncio.sleep(duration)
+
+    # second "a" request is queued ahead of "b", but "b" should start first
+    await asyncio.gather(request("a", 0.05), request("a", 0.0), request("b", 0.0))
+    assert order == ["a", "b", "a"]
+
+
+async def test_priority_then_fifo_order():
+    scheduler = RequestScheduler(max_in_flight=1)
+    order = []
+
+    async def request(name, priority):
+        async with scheduler.slot("a", priority=priority):
+            order.append(name)
+
+    await scheduler.acquire("a")
+    tasks = [
+        asyncio.ensure_future(request(name, priority))
+        for name, priority in [("low", 5), ("high", 1), ("mid-1", 3), ("mid-2", 3)]
+    ]
+    # allow tasks to enqueue
+    await asyncio.sleep(0)
+    assert scheduler.stats().queued == 4
+    assert scheduler.stats().queued_by_host == {"a": 4}
+
+    scheduler.release("a")
+    await asyncio.gather(*tasks)
+    assert order == ["high", "mid-1", "mid-2", "low"]
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = RequestScheduler(max_in_flight=1)
+    await scheduler.acquire("a")
+
+    waiter = asyncio.ensure_future(scheduler.acquire("a"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.stats().queued == 0
+    scheduler.release("a")
+
+    # slot is available again
+    await asyncio.wait_for(scheduler.acquire("a"), timeout=1)
+    assert scheduler.stats().in_flight == 1
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        RequestScheduler(max_in_flight=0)
+
+    with pytest.raises(ValueError):
+        RequestScheduler(max_in_flight_per_host=0)
+
+
+def test_default_stats():
+    assert RequestScheduler().stats() == SchedulerStats()
@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+from aiohttp import web
+import pytest
+
+from hydrotools._restclient import (
+    AsyncRestClient,
+    RestClient,
+    RetryPolicy,
+    TimeoutPolicy,
+)
+
+
+@pytest.fixture
+async def sleepy_server(aiohttp_raw_server):
+    """Server that responds after `delay` seconds with the status given by the
+    `status` query parameter. Records the arrival time of each request."""
+    arrivals = []
+
+    async def handler(request):
+        arrivals.append(time.monotonic())
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.Response(
+            status=int(request.query.get("status", 200)),
+            text=request.query.get("delay", "0"),
+        )
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/")), arrivals
+
+
+@pytest.fixture
+async def stalled_body_server(aiohttp_raw_server):
+    """Server that sends headers and part of a body, then stalls"""
+
+    async def handler(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b"partial")
+        await asyncio.sleep(10)
+        return response
+
+    server = await aiohttp_raw_server(handler)
+    return str(server.make_url("/"))
+
+
+@pytest.mark.parametrize("name", ["connect", "sock_read", "total", "batch"])
+def test_timeout_policy_invalid(name):
+    with pytest.raises(ValueError):
+        TimeoutPolicy(**{name: 0})
+
+
+def test_client_timeout():
+    timeout = TimeoutPolicy(connect=1, sock_read=2, total=None).client_timeout()
+    assert timeout.sock_connect == 1
+    assert timeout.sock_read == 2
+    assert timeout.total is None
+
+
+async def test_total_spans_retries(sleepy_server):
+    uri, arrivals = sleepy_server
+    policy = RetryPolicy(n_retries=10, base_delay=0.05, jitter=False)
+
+    async with AsyncRestClient(
+        enable_cache=False,
+        retry_policy=policy,
+        timeout_policy=TimeoutPolicy(total=0.5),
+    ) as client:
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(uri, parameters={"delay": 0.3, "status": 503})
+        elapsed = time.perf_counter() - start
+
+    # first attempt fails after 0.3s of 0.5s, the retry times out in the remainder
+    assert elapsed < 0.8
+    assert len(arrivals) == 2
+
+
+async def test_sock_read_timeout(stalled_body_server):
+    async with AsyncRestClient(
+        enable_cache=False,
+        retry=False,
+        timeout_policy=TimeoutPolicy(sock_read=0.2),
+    ) as client:
+        start = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(stalled_body_server)
+        assert time.perf_counter() - start < 2
+
+
+async def test_per_request_timeout_override(sleepy_server):
+    import aiohttp
+
+    uri, _ = sleepy_server
+
+    async with AsyncRestClient(enable_cache=False, retry=False) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(
+                uri, parameters={"delay": 1}, timeout=aiohttp.ClientTimeout(total=0.1)
+            )
+
+
+async def test_batch_deadline(sleepy_server):
+    uri, _ = sleepy_server
+    parameters = [{"delay": 0}, {"delay": 0}, {"delay": 2}]
+
+    async with AsyncRestClient(
+        enable_cache=False, timeout_policy=TimeoutPolicy(batch=0.3)
+    ) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.mget(uri, parameters=parameters)
+
+        # per call batch timeout overrides the policy
+        responses = await client.mget(
+            uri, parameters=parameters[:2], batch_timeout=5
+        )
+        assert len(responses) == 2
+
+        results = await client.mget_results(uri, parameters=parameters)
+        assert results.succeeded == [0, 1]
+        assert results.pending == [2]
+        assert not results.failed
+
+        await client.retry_failed(results, batch_timeout=5)
+        assert results.succeeded == [0, 1, 2]
+
+
+async def test_restclient_batch_timeout(sleepy_server):
+    uri, _ = sleepy_server
+    policy = TimeoutPolicy(batch=0.2)
+
+    with RestClient(
+        enable_cache=False, timeout_policy=policy, background_loop=True
+    ) as client:
+        assert client.timeout_policy is policy
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: list(client.iter_mget(uri, parameters=[{"delay": 1}] * 2)),
+            )
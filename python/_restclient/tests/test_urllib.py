@@ -2,7 +2,7 @@
 from urllib import parse
 import pytest
 
-from hydrotools._restclient.urllib import Url, Variadic
+from hydrotools._restclient.urllib import Url, UrlTemplate, Variadic, compile_url
 from hydrotools._restclient.urllib_types import Quote
 
 
@@ -213,3 +213,53 @@ def test_quote_overide_map():
     quote_remap = {"+": "%2B"}
     url = Url(base_url, quote_overide_map=quote_remap) + params
     assert url.quote_url == f"{base_url}?key=%2B12"
+
+
+TEMPLATE_URLS = [
+    "https://www.fake.gov/api/",
+    Url("https://www.fake.gov/api", safe="/:", quote_overide_map={"+": "%2B"}),
+    Url("http://www.fake.gov/a b?x=1&y=a+b", quote_treatment=Quote.QUOTE),
+]
+
+TEMPLATE_PARAMETERS = [
+    {},
+    {"key": "+12"},
+    {"x": [2, 3], "time": "2021-01-01T00:00+00:00"},
+    {"sites": Variadic(["01646500", "02339495"]), "flag": True},
+    {"flag": 1, "value": None, "q": "a&b=c d"},
+]
+
+
+@pytest.mark.parametrize("url", TEMPLATE_URLS)
+@pytest.mark.parametrize("parameters", TEMPLATE_PARAMETERS)
+def test_url_template_matches_url(url, parameters):
+    template = UrlTemplate(url)
+    expected = (Url(url) + parameters).quote_url
+
+    assert template.quote_url(parameters) == expected
+    # cached
+    assert template.quote_url(parameters) == expected
+    assert (template / "path").quote_url(parameters) == (
+        Url(url) / "path" + parameters
+    ).quote_url
+
+
+def test_url_template_cache():
+    template = UrlTemplate("https://www.fake.gov", cache_size=2)
+    for idx in range(3):
+        template.quote_url({"id": idx})
+    assert len(template._cache) == 2
+
+    # unhashable parameter values are not cached
+    template.quote_url({"id": {1, 2}})
+    assert len(template._cache) == 2
+
+    # True and 1 are distinct parameter sets
+    assert template.quote_url({"id": True}) != template.quote_url({"id": 1})
+
+
+def test_compile_url():
+    url = Url("https://www.fake.gov", safe="/:")
+    assert compile_url(url) is compile_url(Url("https://www.fake.gov", safe="/:"))
+    assert compile_url(url) is not compile_url("https://www.fake.gov")
+    assert compile_url(url).url.url == url.url
@@ -0,0 +1,173 @@
+"""
+Canonical dataframe benchmark
+
+Times the transformation of `IVDataService.get_raw` output into a canonical
+dataframe on synthetic USGS IV service payloads. Payloads are built by repeating the
+series in `tests/nwis_test_data.json`, so their structure matches real responses.
+The "per series" row is the previous behavior, which built a dataframe per series,
+broadcast its metadata columns, and concatenated the frames. The "columnar" row is
+`IVDataService._to_canonical_dataframe`. Both produce identical dataframes, which
+is verified before timing.
+
+Usage:
+    python benchmarks/bench_canonical_dataframe.py [--sites 2000] [--days 1]
+        [--expanded-metadata] [--repeat 3]
+"""
+import argparse
+import copy
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import timeit
+import warnings
+
+import pandas as pd
+
+from hydrotools.nwis_client import IVDataService
+from hydrotools.nwis_client.iv import _create_empty_canonical_df
+
+TEST_DATA = Path(__file__).resolve().parents[1] / "tests" / "nwis_test_data.json"
+
+
+def iv_payload(sites: int, days: int) -> dict:
+    """Deserialized IV service response with `sites` x 2 series of 15 minute values"""
+    template = json.loads(TEST_DATA.read_text())
+    series = template["value"]["timeSeries"]
+
+    start = datetime(2021, 1, 1, tzinfo=timezone(timedelta(hours=-5)))
+    values = [
+        {
+            "value": f"{5000 + (idx % 97)}",
+            "qualifiers": ["P"] if idx % 11 else ["P", "e"],
+            "dateTime": (start + timedelta(minutes=15 * idx)).isoformat(
+                timespec="milliseconds"
+            ),
+        }
+        for idx in range(days * 96)
+    ]
+
+    time_series = []
+    for site in range(sites):
+        for s in series:
+            s = copy.deepcopy(s)
+            s["sourceInfo"]["siteCode"][0]["value"] = f"{site:08d}"
+            s["values"][0]["value"] = values
+            time_series.append(s)
+
+    template["value"]["timeSeries"] = time_series
+    return template
+
+
+def per_series_canonical_dataframe(
+    raw_data, value_time_label="value_time", include_expanded_metadata=False
+):
+    """Previous `IVDataService._to_canonical_dataframe`"""
+
+    def list_to_df_helper(item: dict):
+        values = item.pop("values")
+        df = pd.DataFrame(values)
+
+        for column_name, value in item.items():
+            df[column_name] = value
+
+        return df
+
+    list_of_frames = list(map(list_to_df_helper, raw_data))
+    if not list_of_frames:
+        warnings.warn("No data was returned by the request.")
+        return _create_empty_canonical_df()
+
+    dfs = pd.concat(list_of_frames, ignore_index=True)
+    dfs["value"] = pd.to_numeric(dfs["value"], downcast="float")
+    dfs[value_time_label] = pd.to_datetime(dfs["dateTime"], utc=True).dt.tz_localize(
+        None
+    )
+    dfs["variable_name"] = dfs["variableName"].apply(
+        IVDataService.simplify_variable_name
+    )
+    dfs = dfs.sort_values(
+        ["usgs_site_code", "measurement_unit", value_time_label], ignore_index=True
+    )
+    dfs = dfs.fillna("")
+
+    cols = ["variable_name", "usgs_site_code", "measurement_unit", "qualifiers", "series"]
+    if include_expanded_metadata:
+        cols += ["siteTypeCd", "hucCd", "countyCd", "stateCd", "siteName", "srs"]
+    dfs[cols] = dfs[cols].astype(str)
+    dfs[cols] = dfs[cols].astype(dtype="category")
+
+    df_float = dfs.select_dtypes(include=["float"])
+    converted_float = df_float.apply(pd.to_numeric, downcast="float")
+    dfs[converted_float.columns] = converted_float
+
+    output_columns = [
+        value_time_label,
+        "variable_name",
+        "usgs_site_code",
+        "measurement_unit",
+        "value",
+        "qualifiers",
+        "series",
+    ]
+    if include_expanded_metadata:
+        expanded_column_mapping = {
+            "siteTypeCd": "site_type_code",
+            "hucCd": "huc_code",
+            "countyCd": "county_code",
+            "stateCd": "state_code",
+            "siteName": "site_name",
+        }
+        dfs = dfs.rename(columns=expanded_column_mapping)
+        output_columns += list(expanded_column_mapping.values()) + [
+            "latitude",
+            "longitude",
+        ]
+    return dfs[output_columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sites", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--expanded-metadata", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = iv_payload(args.sites, args.days)
+    expanded = args.expanded_metadata
+    service = IVDataService(enable_cache=False)
+
+    def raw_data():
+        # the per series path consumes its input
+        return service._handle_deserialized_response(
+            copy.deepcopy(payload), include_expanded_metadata=expanded
+        )
+
+    transforms = {
+        "per series": lambda raw: per_series_canonical_dataframe(
+            raw, include_expanded_metadata=expanded
+        ),
+        "columnar": lambda raw: service._to_canonical_dataframe(
+            raw, include_expanded_metadata=expanded
+        ),
+    }
+
+    frames = [transform(raw_data()) for transform in transforms.values()]
+    pd.testing.assert_frame_equal(*frames)
+
+    print(
+        f"series: {len(raw_data())}, rows: {len(frames[0])}, best of {args.repeat}"
+    )
+    baseline = None
+    for name, transform in transforms.items():
+        timings = []
+        for _ in range(args.repeat):
+            raw = raw_data()
+            timings.append(timeit.timeit(lambda: transform(raw), number=1))
+        seconds = min(timings)
+        baseline = baseline or seconds
+        print(f"{name:>12}: {seconds * 1e3:8.1f} ms ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
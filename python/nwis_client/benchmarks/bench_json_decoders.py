@@ -0,0 +1,88 @@
+"""
+JSON decoder benchmark
+
+Times `hydrotools._restclient` json decoders on synthetic USGS IV service payloads.
+Payloads are built by repeating the series in `tests/nwis_test_data.json`, so their
+structure matches real responses. The "stdlib (str)" row is the previous behavior,
+which decoded the body to `str` before parsing.
+
+Usage:
+    python benchmarks/bench_json_decoders.py [--sites 20] [--days 30] [--repeat 5]
+"""
+import argparse
+import copy
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import timeit
+
+from hydrotools._restclient import Response, get_json_decoder
+
+TEST_DATA = Path(__file__).resolve().parents[1] / "tests" / "nwis_test_data.json"
+
+
+def iv_payload(sites: int, days: int) -> bytes:
+    """IV service json response with `sites` x 2 series of 15 minute values"""
+    template = json.loads(TEST_DATA.read_text())
+    series = template["value"]["timeSeries"]
+
+    start = datetime(2021, 1, 1, tzinfo=timezone(timedelta(hours=-5)))
+    values = [
+        {
+            "value": f"{5000 + (idx % 97)}",
+            "qualifiers": ["P"],
+            "dateTime": (start + timedelta(minutes=15 * idx)).isoformat(
+                timespec="milliseconds"
+            ),
+        }
+        for idx in range(days * 96)
+    ]
+
+    time_series = []
+    for site in range(sites):
+        for s in series:
+            s = copy.deepcopy(s)
+            s["sourceInfo"]["siteCode"][0]["value"] = f"{site:08d}"
+            s["values"][0]["value"] = values
+            time_series.append(s)
+
+    template["value"]["timeSeries"] = time_series
+    return json.dumps(template).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = iv_payload(args.sites, args.days)
+    headers = {"Content-Type": "application/json;charset=UTF-8"}
+
+    decoders = {
+        "stdlib (str)": lambda: Response(200, body, headers=headers).json(
+            loads=json.loads
+        ),
+        "stdlib (bytes)": lambda: Response(
+            200, body, headers=headers, json_decoder=get_json_decoder("stdlib")
+        ).json(),
+    }
+    try:
+        orjson_loads = get_json_decoder("orjson")
+        decoders["orjson (bytes)"] = lambda: Response(
+            200, body, headers=headers, json_decoder=orjson_loads
+        ).json()
+    except ModuleNotFoundError:
+        print("orjson not installed, skipping")
+
+    print(f"payload: {len(body) / 1024**2:.1f} MiB, best of {args.repeat}")
+    baseline = None
+    for name, decode in decoders.items():
+        seconds = min(timeit.repeat(decode, number=1, repeat=args.repeat))
+        baseline = baseline or seconds
+        print(f"{name:>16}: {seconds * 1e3:8.1f} ms ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
 # removing __version__ import will cause build to fail. see: https://github.com/pypa/setuptools/issues/1724#issuecomment-627241822
 from ._version import __version__
 
-from .iv import IVDataService
+from .iv import IVDataService, AsyncIVDataService
@@ -8,6 +8,7 @@ Classes
 -------
 
    IVDataService
+   AsyncIVDataService
 
 """
 
@@ -21,12 +22,27 @@ import warnings
 
 import numpy as np
 import pandas as pd
-from hydrotools._restclient import RestClient, Url
+from aiohttp_client_cache import CacheBackend
+from hydrotools._restclient import (
+    AsyncRestClient,
+    ConnectionPool,
+    HedgePolicy,
+    HTTPArchive,
+    Instrumentation,
+    MemoryBudget,
+    Prefetch,
+    PrefetchProgress,
+    QueryNormalizer,
+    RateLimiter,
+    RestClient,
+    TimeoutPolicy,
+    Url,
+)
 from collections.abc import Sequence
 
 # typing imports
 from pathlib import Path
-from typing import Dict, List, Set, TypeVar, Union, Iterable
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar, Union, Iterable
 
 T = TypeVar("T")
 
@@ -34,6 +50,14 @@ T = TypeVar("T")
 # local imports
 from ._utilities import verify_case_insensitive_kwargs
 
+# NWIS IV ignores the order of multi-valued parameters and the case of siteStatus.
+# Queries are normalized so that equivalent queries share cache entries.
+IV_QUERY_NORMALIZER = QueryNormalizer(
+    unordered=["sites", "parameterCd", "huc", "countyCd"],
+    lowercase=["siteStatus"],
+)
+
+
 def _verify_case_insensitive_kwargs_handler(m: str) -> None:
     raise RuntimeError(m)
 
@@ -54,6 +78,50 @@ class IVDataService:
         Label to use for datetime column returned by IVDataService.get
     cache_filename: str or Path default 'nwisiv_cache'
         Sqlite cache filename or filepath. Suffix '.sqlite' will be added to file if not included.
+    cache_max_bytes: int, optional, default None
+        Maximum sqlite cache size in bytes. Expired, then least recently used, responses
+        are evicted when exceeded. None is unlimited.
+    cache_compression: str, optional, default None
+        Store cached responses compressed, e.g. "zlib" or "zstd" (requires
+        `zstandard`). NWIS json typically compresses more than 10 times.
+    cache_backend: aiohttp_client_cache.CacheBackend, optional, default None
+        Cache backend used instead of the sqlite cache. Use a
+        `hydrotools._restclient.ShardedSQLiteBackend` when many processes (e.g. cron
+        jobs or pool workers) share a cache. When provided, `cache_filename`,
+        `cache_expire_after`, `cache_max_bytes`, and `cache_compression` are ignored.
+    json_decoder: str or Callable[[bytes], Any], optional, default None
+        Response json decoder. "stdlib", "orjson" (requires `orjson`), or a callable
+        that deserializes json from bytes. None is "stdlib".
+    instrumentation: hydrotools._restclient.Instrumentation, optional, default None
+        Record request timings, sizes, cache origin, and retries. See
+        `IVDataService.trace_stats`.
+    archive: hydrotools._restclient.HTTPArchive, optional, default None
+        Record responses to, or replay responses from, a local archive. Replay
+        requires no network access.
+    connection_pool: hydrotools._restclient.ConnectionPool, optional, default None
+        Connection pool shared with other service clients (e.g. `SVIClient`)
+    rate_limiter: hydrotools._restclient.RateLimiter, optional, default None
+        Client side request rate limit. Use an adaptive limiter to stay below the
+        service's throttling threshold. See `IVDataService.rate_limit_stats`.
+    spill_threshold: int, optional, default None
+        Responses larger than this many bytes (e.g. large `stateCd` queries) are
+        streamed to a temporary file rather than held in memory until they are
+        parsed. None holds every response in memory.
+    memory_budget: int or hydrotools._restclient.MemoryBudget, optional, default None
+        Bound, in bytes, on the responses held while waiting to be parsed. Once
+        reached, no new requests are sent until responses have been parsed, so large
+        multi-request queries run in bounded memory. None is unbounded.
+    hedge_policy: hydrotools._restclient.HedgePolicy, optional, default None
+        Duplicate requests slower than a latency percentile of recent requests and
+        use the first response, so a few slow responses do not dominate the time of
+        multi-request queries. See `IVDataService.hedge_stats`.
+    timeout_policy: hydrotools._restclient.TimeoutPolicy, optional, default None
+        Connect, socket read, and per request time limits, and a deadline for all
+        requests made by a single `get`. Defaults to `TimeoutPolicy()`.
+    background_loop: bool, default False
+        Run requests in an event loop thread owned by the service, so a single
+        service may be shared by many threads (e.g. `ThreadPoolExecutor` workers)
+        and used within running event loops without `nest_asyncio`
 
     Examples
     --------
@@ -106,7 +174,20 @@ class IVDataService:
         enable_cache: bool = True, 
         cache_expire_after: int = 43200,
         value_time_label: str = "value_time",
-        cache_filename: Union[str, Path] = "nwisiv_cache"
+        cache_filename: Union[str, Path] = "nwisiv_cache",
+        cache_max_bytes: Optional[int] = None,
+        cache_compression: Optional[str] = None,
+        cache_backend: Optional[CacheBackend] = None,
+        json_decoder: Union[str, Callable[[bytes], Any], None] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        archive: Optional[HTTPArchive] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        spill_threshold: Optional[int] = None,
+        memory_budget: Union[int, MemoryBudget, None] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout_policy: Optional[TimeoutPolicy] = None,
+        background_loop: bool = False
         ):
         self._cache_enabled = enable_cache
         self._restclient = RestClient(
@@ -115,6 +196,20 @@ class IVDataService:
             enable_cache=self._cache_enabled,
             cache_filename=str(cache_filename),
             cache_expire_after=cache_expire_after,
+            cache_max_bytes=cache_max_bytes,
+            cache_compression=cache_compression,
+            cache_backend=cache_backend,
+            json_decoder=json_decoder,
+            instrumentation=instrumentation,
+            archive=archive,
+            connection_pool=connection_pool,
+            rate_limiter=rate_limiter,
+            query_normalizer=IV_QUERY_NORMALIZER,
+            spill_threshold=spill_threshold,
+            memory_budget=memory_budget,
+            hedge_policy=hedge_policy,
+            timeout_policy=timeout_policy,
+            background_loop=background_loop,
         )
         self._value_time_label = value_time_label
 
@@ -258,104 +353,10 @@ class IVDataService:
             **params,
         )
 
-        def list_to_df_helper(item: dict):
-            values = item.pop("values")
-            df = pd.DataFrame(values)
-
-            for column_name, value in item.items():
-                df[column_name] = value
-
-            return df
-
-        def empty_df_warning_helper():
-            warning_message = "No data was returned by the request."
-            warnings.warn(warning_message)
-
-        list_of_frames = list(map(list_to_df_helper, raw_data))
-
-        # Empty list. No data was returned in the request
-        if not list_of_frames:
-            empty_df_warning_helper()
-            empty_df = _create_empty_canonical_df()
-            empty_df = empty_df.rename(columns={"value_time": self.value_time_label})
-            return empty_df
-
-        # Concatenate list in single pd.DataFrame
-        dfs = pd.concat(list_of_frames, ignore_index=True)
-
-        # skip data processing steps if no data was retrieved and return empty canonical df
-        if dfs.empty:
-            empty_df_warning_helper()
-            empty_df = _create_empty_canonical_df()
-            empty_df = empty_df.rename(columns={"value_time": self.value_time_label})
-            return empty_df
-
-        # Convert values to numbers
-        dfs["value"] = pd.to_numeric(dfs["value"], downcast="float")
-
-        # Convert all times to UTC
-        dfs[self.value_time_label] = pd.to_datetime(
-            dfs["dateTime"], utc=True).dt.tz_localize(None)
-
-        # Simplify variable name
-        dfs["variable_name"] = dfs["variableName"].apply(self.simplify_variable_name)
-
-        # Sort DataFrame
-        dfs = dfs.sort_values(
-            ["usgs_site_code", "measurement_unit", self.value_time_label], ignore_index=True
+        return self._to_canonical_dataframe(
+            raw_data, include_expanded_metadata=include_expanded_metadata
         )
 
-        # Fill NaNs
-        dfs = dfs.fillna("")
-
-        # Convert categories
-        cols = [
-            "variable_name",
-            "usgs_site_code",
-            "measurement_unit",
-            "qualifiers",
-            "series"
-        ]
-        if include_expanded_metadata:
-            expanded_columns = [
-                "siteTypeCd",
-                "hucCd",
-                "countyCd",
-                "stateCd",
-                "siteName",
-                "srs"
-                ]
-            cols += expanded_columns
-        dfs[cols] = dfs[cols].astype(str)
-        dfs[cols] = dfs[cols].astype(dtype="category")
-
-        # Downcast floats
-        df_float = dfs.select_dtypes(include=["float"])
-        converted_float = df_float.apply(pd.to_numeric, downcast="float")
-        dfs[converted_float.columns] = converted_float
-
-        # DataFrame in semi-WRES compatible format
-        output_columns = [
-            self.value_time_label,
-            "variable_name",
-            "usgs_site_code",
-            "measurement_unit",
-            "value",
-            "qualifiers",
-            "series",
-        ]
-        if include_expanded_metadata:
-            expanded_column_mapping = {
-                "siteTypeCd": "site_type_code",
-                "hucCd": "huc_code",
-                "countyCd": "county_code",
-                "stateCd": "state_code",
-                "siteName": "site_name"
-                }
-            dfs = dfs.rename(columns=expanded_column_mapping)
-            output_columns += list(expanded_column_mapping.values()) + ["latitude", "longitude"]
-        return dfs[output_columns]
-
     def get_raw(
         self,
         sites: Union[
@@ -404,6 +405,108 @@ class IVDataService:
         Return raw requests data from the NWIS IV Rest API in a list.
         See `IVDataService.get` for argument documentation.
         """
+        query_params = self._build_query_params(
+            sites=sites,
+            stateCd=stateCd,
+            huc=huc,
+            bBox=bBox,
+            countyCd=countyCd,
+            parameterCd=parameterCd,
+            startDT=startDT,
+            endDT=endDT,
+            period=period,
+            siteStatus=siteStatus,
+            max_sites_per_request=max_sites_per_request,
+            **params,
+        )
+
+        # handle each response as it arrives so its body can be released before the
+        # remaining requests complete
+        handled_responses = [None] * len(query_params)
+        for idx, response in self._restclient.iter_mget(
+            parameters=query_params, headers=self._headers
+        ):
+            handled_responses[idx] = self._handle_response(
+                response, include_expanded_metadata=include_expanded_metadata
+            )
+
+        # flatten list of lists in request order
+        return [item for r in handled_responses for item in r]
+
+    def prefetch(
+        self,
+        queries: List[Dict[str, Any]],
+        *,
+        on_progress: Optional[Callable[[PrefetchProgress], None]] = None,
+    ) -> Prefetch:
+        """Fetch the responses of `queries` in the background at a low priority to
+        fill the cache, so that later `get` calls with the same arguments are answered
+        from the cache. Returns immediately. Requests are subject to the service's
+        rate limiter and memory budget. Requires caching to be enabled.
+
+        Without `background_loop=True`, prefetching progresses only while the
+        service is making other requests or waiting on the returned `Prefetch`.
+
+        Parameters
+        ----------
+        queries: List[Dict[str, Any]]
+            Keyword arguments of `IVDataService.get`, one mapping per query
+        on_progress: Callable[[PrefetchProgress], None], optional
+            Called with the prefetch's progress as each request completes or fails
+
+        Returns
+        -------
+        hydrotools._restclient.Prefetch
+            Handle reporting the prefetch's progress
+
+        Examples
+        --------
+        >>> from hydrotools.nwis_client import IVDataService
+        >>> service = IVDataService(background_loop=True)
+        >>> prefetch = service.prefetch([
+        ...     {"stateCd": "AL", "period": "P1D"},
+        ...     {"sites": ["01646500", "02339495"], "period": "P1D"},
+        ... ])
+        >>> prefetch.progress().fraction
+        0.5
+        >>> # answered from the cache once prefetched
+        >>> df = service.get(stateCd="AL", period="P1D")
+        """
+        return self._restclient.prefetch(
+            parameters=self._prefetch_query_params(queries),
+            headers=self._headers,
+            on_progress=on_progress,
+        )
+
+    def _prefetch_query_params(
+        self, queries: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Per request query parameters of `prefetch` queries"""
+        query_params = []
+        for query in queries:
+            query = dict(query)
+            # does not change requests
+            query.pop("include_expanded_metadata", None)
+            query_params.extend(self._build_query_params(**query))
+        return query_params
+
+    def _build_query_params(
+        self,
+        sites=None,
+        stateCd=None,
+        huc=None,
+        bBox=None,
+        countyCd=None,
+        parameterCd: str = "00060",
+        startDT=None,
+        endDT=None,
+        period=None,
+        siteStatus: str = "all",
+        max_sites_per_request: int = 20,
+        **params,
+    ) -> List[Dict[str, str]]:
+        """Split a `get_raw` query into a list of per request query parameters. See
+        `IVDataService.get` for argument documentation."""
         # handle start, end, and period parameters
         kwargs = self._handle_start_end_period_url_params(
             startDT=startDT, endDT=endDT, period=period
@@ -472,12 +575,18 @@ class IVDataService:
         for query_params_dict in query_params:
             query_params_dict.update(params)
 
-        # return query_params
-        results = self._restclient.mget(parameters=query_params, headers=self._headers)
+        return query_params
 
-        # flatten list of lists
-        return [item for r in results for item in self._handle_response(r,
-            include_expanded_metadata=include_expanded_metadata)]
+    def _to_canonical_dataframe(
+        self, raw_data: List[dict], include_expanded_metadata: bool = False
+    ) -> pd.DataFrame:
+        """Transform `get_raw` output into a canonical hydrotools dataframe. See
+        `IVDataService.get` for more detail."""
+        return _decode_canonical_dataframe(
+            raw_data,
+            value_time_label=self.value_time_label,
+            include_expanded_metadata=include_expanded_metadata,
+        )
 
     def _handle_start_end_period_url_params(
         self, startDT=None, endDT=None, period=None
@@ -602,7 +711,7 @@ class IVDataService:
 
         Parameters
         ----------
-        raw_response : aiohttp.ClientResponse 
+        raw_response : hydrotools._restclient.Response
             Request GET response
 
         Returns
@@ -610,9 +719,20 @@ class IVDataService:
         List[dict]
             A list of handled responses
         """
-        # TODO: Speed test using orjson instead of native
         deserialized_response = raw_response.json()
 
+        return IVDataService._handle_deserialized_response(
+            deserialized_response, include_expanded_metadata=include_expanded_metadata
+        )
+
+    @staticmethod
+    def _handle_deserialized_response(
+        deserialized_response: dict,
+        include_expanded_metadata: bool = False
+        ) -> List[dict]:
+        """From a deserialized json response, return a list of extracted sites in
+        dictionary form. See `IVDataService._handle_response` for more detail."""
+
         def extract_metadata(json_time_series):
             return {
                 # Add site code
@@ -644,18 +764,18 @@ class IVDataService:
 
         for response_value_timeSeries in deserialized_response["value"]["timeSeries"]:
 
-            for indicies, site_data in enumerate(response_value_timeSeries["values"]):
-
-                # Create general site metadata dictionary
-                site_metadata = extract_metadata(response_value_timeSeries)
+            # Create general site metadata dictionary, shared by the site's series
+            site_metadata = extract_metadata(response_value_timeSeries)
 
-                # Add expanded metadata
-                if include_expanded_metadata:
-                    site_metadata.update(extract_expanded_metadata(response_value_timeSeries))
+            # Add expanded metadata
+            if include_expanded_metadata:
+                site_metadata.update(extract_expanded_metadata(response_value_timeSeries))
 
+            for indicies, site_data in enumerate(response_value_timeSeries["values"]):
                 # Add site time series values and its index number
-                site_metadata.update({"values": site_data["value"], "series": indicies})
-                flattened_data.append(site_metadata)
+                flattened_data.append(
+                    dict(site_metadata, values=site_data["value"], series=indicies)
+                )
 
         return flattened_data
 
@@ -768,6 +888,28 @@ class IVDataService:
         """ Is cache enabled"""
         return self._cache_enabled
 
+    @property
+    def cache_stats(self):
+        """ Cache hit, miss, and eviction counts. None if cache is disabled"""
+        return self._restclient.cache_stats
+
+    @property
+    def trace_stats(self):
+        """ Request latency percentiles, throughput, and sizes. None if
+        instrumentation is not enabled"""
+        return self._restclient.trace_stats
+
+    @property
+    def rate_limit_stats(self):
+        """ Rate limit waits, 429 responses, and current request rate. None if
+        requests are not rate limited"""
+        return self._restclient.rate_limit_stats
+
+    @property
+    def hedge_stats(self):
+        """ Hedged and won request counts. None if requests are not hedged"""
+        return self._restclient.hedge_stats
+
     @property
     def headers(self) -> dict:
         """ HTTP GET Headers """
@@ -784,6 +926,235 @@ class IVDataService:
         return self._value_time_label
 
 
+class AsyncIVDataService(IVDataService):
+    """
+    Asynchronous variant of `IVDataService` built on
+    `hydrotools._restclient.AsyncRestClient`. `get` and `get_raw` are coroutines that
+    run in the caller's event loop, so this class can be used from running event loops
+    (e.g. aiohttp web services or jupyter notebooks) without blocking them. Use as an
+    asynchronous context manager or call `close` to release resources.
+
+    See `IVDataService` for parameter documentation.
+
+    Examples
+    --------
+    >>> from hydrotools.nwis_client import AsyncIVDataService
+    >>> async with AsyncIVDataService() as service:
+    ...     df = await service.get(sites='01646500', startDT="2021-01-01", endDT="2021-02-01")
+    """
+
+    def __init__(self, *,
+        enable_cache: bool = True,
+        cache_expire_after: int = 43200,
+        value_time_label: str = "value_time",
+        cache_filename: Union[str, Path] = "nwisiv_cache",
+        cache_max_bytes: Optional[int] = None,
+        cache_compression: Optional[str] = None,
+        cache_backend: Optional[CacheBackend] = None,
+        json_decoder: Union[str, Callable[[bytes], Any], None] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        archive: Optional[HTTPArchive] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        spill_threshold: Optional[int] = None,
+        memory_budget: Union[int, MemoryBudget, None] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout_policy: Optional[TimeoutPolicy] = None
+        ):
+        self._cache_enabled = enable_cache
+        self._restclient = AsyncRestClient(
+            base_url=self._base_url,
+            headers=self._headers,
+            enable_cache=self._cache_enabled,
+            cache_filename=str(cache_filename),
+            cache_expire_after=cache_expire_after,
+            cache_max_bytes=cache_max_bytes,
+            cache_compression=cache_compression,
+            cache_backend=cache_backend,
+            json_decoder=json_decoder,
+            instrumentation=instrumentation,
+            archive=archive,
+            connection_pool=connection_pool,
+            rate_limiter=rate_limiter,
+            query_normalizer=IV_QUERY_NORMALIZER,
+            spill_threshold=spill_threshold,
+            memory_budget=memory_budget,
+            hedge_policy=hedge_policy,
+            timeout_policy=timeout_policy,
+        )
+        self._value_time_label = value_time_label
+
+    def __enter__(self):
+        raise TypeError("Use async with instead")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self) -> None:
+        """Release underlying http session"""
+        await self._restclient.close()
+
+    @verify_case_insensitive_kwargs(handler=_verify_case_insensitive_kwargs_handler)
+    async def get(
+        self,
+        sites: Union[
+            str,
+            Union[List[str]],
+            np.ndarray,
+            pd.Series,
+        ] = None,
+        stateCd: Union[str, Union[List[str]], np.ndarray, pd.Series] = None,
+        huc: Union[
+            str,
+            List[Union[str, int]],
+            np.ndarray,
+            pd.Series,
+        ] = None,
+        bBox: Union[
+            str,
+            List[Union[str, int]],
+            np.ndarray,
+            pd.Series,
+            Union[List[List[Union[str, int]]]],
+        ] = None,
+        countyCd: Union[str, List[Union[int, str]]] = None,
+        parameterCd: str = "00060",
+        startDT: Union[
+            str,
+            datetime.datetime,
+            np.datetime64,
+            pd.Timestamp,
+            None,
+        ] = None,
+        endDT: Union[
+            str,
+            datetime.datetime,
+            np.datetime64,
+            pd.Timestamp,
+            None,
+        ] = None,
+        period: Union[str, None] = None,
+        siteStatus: str = "all",
+        include_expanded_metadata: bool = False,
+        **params,
+    ) -> pd.DataFrame:
+        """Return Pandas DataFrame of NWIS IV data.
+        See `IVDataService.get` for argument documentation.
+        """
+        raw_data = await self.get_raw(
+            sites=sites,
+            stateCd=stateCd,
+            huc=huc,
+            bBox=bBox,
+            countyCd=countyCd,
+            parameterCd=parameterCd,
+            startDT=startDT,
+            endDT=endDT,
+            period=period,
+            siteStatus=siteStatus,
+            include_expanded_metadata=include_expanded_metadata,
+            **params,
+        )
+
+        return self._to_canonical_dataframe(
+            raw_data, include_expanded_metadata=include_expanded_metadata
+        )
+
+    async def get_raw(
+        self,
+        sites: Union[
+            str,
+            List[str],
+            np.ndarray,
+            pd.Series,
+        ] = None,
+        stateCd: Union[str, List[str], np.ndarray, pd.Series] = None,
+        huc: Union[
+            str,
+            List[Union[str, int]],
+            np.ndarray,
+            pd.Series,
+        ] = None,
+        bBox: Union[
+            str,
+            List[Union[str, int]],
+            np.ndarray,
+            pd.Series,
+            Union[List[List[Union[str, int]]]],
+        ] = None,
+        countyCd: Union[str, List[Union[int, str]]] = None,
+        parameterCd: str = "00060",
+        startDT: Union[
+            str,
+            datetime.datetime,
+            np.datetime64,
+            pd.Timestamp,
+            None,
+        ] = None,
+        endDT: Union[
+            str,
+            datetime.datetime,
+            np.datetime64,
+            pd.Timestamp,
+            None,
+        ] = None,
+        period: Union[str, None] = None,
+        siteStatus: str = "all",
+        max_sites_per_request: int = 20,
+        include_expanded_metadata: bool = False,
+        **params,
+    ) -> List[dict]:
+        """
+        Return raw requests data from the NWIS IV Rest API in a list.
+        See `IVDataService.get` for argument documentation.
+        """
+        query_params = self._build_query_params(
+            sites=sites,
+            stateCd=stateCd,
+            huc=huc,
+            bBox=bBox,
+            countyCd=countyCd,
+            parameterCd=parameterCd,
+            startDT=startDT,
+            endDT=endDT,
+            period=period,
+            siteStatus=siteStatus,
+            max_sites_per_request=max_sites_per_request,
+            **params,
+        )
+
+        handled_responses = [None] * len(query_params)
+        async for idx, response in self._restclient.iter_mget(
+            parameters=query_params, headers=self._headers
+        ):
+            handled_responses[idx] = self._handle_response(
+                response, include_expanded_metadata=include_expanded_metadata
+            )
+
+        # flatten list of lists in request order
+        return [item for r in handled_responses for item in r]
+
+    async def prefetch(
+        self,
+        queries: List[Dict[str, Any]],
+        *,
+        on_progress: Optional[Callable[[PrefetchProgress], None]] = None,
+    ) -> PrefetchProgress:
+        """Fetch the responses of `queries` at a low priority to fill the cache and
+        return the final progress. Run in the background with
+        `asyncio.ensure_future`. See `IVDataService.prefetch` for argument
+        documentation.
+        """
+        return await self._restclient.prefetch(
+            parameters=self._prefetch_query_params(queries),
+            headers=self._headers,
+            on_progress=on_progress,
+        )
+
+
 def validate_optional_combinations(
     arg_mapping: Dict[str, T],
     valid_arg_keys: List[Set[str]],
@@ -895,3 +1266,117 @@ def _create_empty_canonical_df() -> pd.DataFrame:
         "series": pd.Series(dtype="category"),
     }
     return pd.DataFrame(cols, index=[])
+
+
+# `get_raw` expanded metadata key: canonical dataframe column
+_EXPANDED_METADATA_COLUMNS = {
+    "siteTypeCd": "site_type_code",
+    "hucCd": "huc_code",
+    "countyCd": "county_code",
+    "stateCd": "state_code",
+    "siteName": "site_name",
+}
+
+
+def _decode_canonical_dataframe(
+    raw_data: List[dict],
+    value_time_label: str = "value_time",
+    include_expanded_metadata: bool = False,
+) -> pd.DataFrame:
+    """Decode `IVDataService.get_raw` output into a canonical hydrotools dataframe.
+
+    Each series is walked once, filling preallocated value, datetime, and qualifier
+    code arrays. Per series metadata is factorized once per series and broadcast to
+    rows as categorical codes, rows are ordered by a single stable sort on site,
+    unit, and datetime, and the dataframe is constructed once. `raw_data` is not
+    modified.
+    """
+    series = [item for item in raw_data if item["values"]]
+
+    # Empty list. No data was returned in the request
+    if not series:
+        warnings.warn("No data was returned by the request.")
+        empty_df = _create_empty_canonical_df()
+        return empty_df.rename(columns={"value_time": value_time_label})
+
+    lengths = np.array([len(item["values"]) for item in series])
+    n_rows = int(lengths.sum())
+    values = np.empty(n_rows, dtype=object)
+    date_times = np.empty(n_rows, dtype=object)
+    qualifier_codes = np.empty(n_rows, dtype=np.int64)
+    # qualifiers (None if missing): code, in order of appearance
+    qualifiers = {}  # type: Dict[Optional[tuple], int]
+
+    start = 0
+    for item, length in zip(series, lengths):
+        stop = start + length
+        item_values = item["values"]
+        values[start:stop] = [v["value"] for v in item_values]
+        date_times[start:stop] = [v["dateTime"] for v in item_values]
+        qualifier_codes[start:stop] = [
+            qualifiers.setdefault(None if q is None else tuple(q), len(qualifiers))
+            for q in (v.get("qualifiers") for v in item_values)
+        ]
+        start = stop
+
+    def factorize(labels) -> tuple:
+        # sorted categories and label codes, as `astype("category")`
+        categories, codes = np.unique(
+            np.array(labels, dtype=object), return_inverse=True
+        )
+        return categories, codes
+
+    def metadata(key: str, transform=str) -> tuple:
+        categories, codes = factorize([transform(item.get(key, "")) for item in series])
+        return categories, np.repeat(codes, lengths)
+
+    # Convert all times to UTC. Sites share timestamps, so each distinct timestamp
+    # is parsed once
+    time_codes, unique_times = pd.factorize(date_times)
+    value_time = pd.to_datetime(unique_times, utc=True).tz_localize(None)[time_codes]
+    sites = metadata("usgs_site_code")
+    units = metadata("measurement_unit")
+
+    # Sort rows. Equivalent to a stable sort on site, unit, and value time labels
+    order = np.lexsort((value_time.asi8, units[1], sites[1]))
+
+    def categorical(categories_and_codes: tuple) -> pd.Categorical:
+        categories, codes = categories_and_codes
+        return pd.Categorical.from_codes(codes[order], categories)
+
+    # Qualifier lists are labeled by their string representation
+    qualifier_categories, qualifier_remap = factorize(
+        ["" if q is None else str(list(q)) for q in qualifiers]
+    )
+
+    columns = {
+        value_time_label: value_time[order],
+        "variable_name": categorical(
+            metadata(
+                "variableName",
+                lambda name: IVDataService.simplify_variable_name(str(name)),
+            )
+        ),
+        "usgs_site_code": categorical(sites),
+        "measurement_unit": categorical(units),
+        "value": pd.to_numeric(values[order], downcast="float"),
+        "qualifiers": categorical(
+            (qualifier_categories, qualifier_remap[qualifier_codes])
+        ),
+        "series": categorical(metadata("series")),
+    }
+
+    if include_expanded_metadata:
+        for key, column in _EXPANDED_METADATA_COLUMNS.items():
+            columns[column] = categorical(metadata(key))
+
+        for column in ["latitude", "longitude"]:
+            coordinates = np.array([item.get(column, np.nan) for item in series])
+            coordinates = np.repeat(coordinates, lengths)[order]
+            if coordinates.dtype.kind == "f":
+                # Downcast floats
+                coordinates = pd.to_numeric(coordinates, downcast="float")
+            columns[column] = coordinates
+
+    # DataFrame in semi-WRES compatible format
+    return pd.DataFrame(columns)
@@ -36,6 +36,20 @@ def test_split(key, values, split_threshold, join_on, validation):
             else:
                 assert a == v
 
+def test_iv_query_normalizer():
+    query = {
+        "sites": "01646500,01013500",
+        "parameterCd": "00065,00060",
+        "siteStatus": "ALL",
+        "format": "json",
+    }
+    assert iv.IV_QUERY_NORMALIZER(query) == {
+        "format": "json",
+        "parameterCd": "00060,00065",
+        "siteStatus": "all",
+        "sites": "01013500,01646500",
+    }
+
 ##### MOCK OBJECTS #####
 
 class MockRequests:
@@ -197,14 +211,15 @@ def test_get_raw_with_mock(setup_iv, monkeypatch):
     from pathlib import Path
     from hydrotools._restclient import RestClient
 
-    def requests_mock(*args, **kwargs):
+    def requests_mock(*args, parameters, **kwargs):
         json_text = json.loads(
             (Path(__file__).resolve().parent / "nwis_test_data.json").read_text()
         )
         # key_word_args = {"_json": json_text}
-        return MockRequests(_json=json_text)
+        for idx, _ in enumerate(parameters):
+            yield idx, MockRequests(_json=json_text)
 
-    monkeypatch.setattr(RestClient, "get", requests_mock)
+    monkeypatch.setattr(RestClient, "iter_mget", requests_mock)
 
     data = setup_iv.get_raw(sites="01646500", parameterCd="00060,00065")
     assert data[0]["usgs_site_code"] == "01646500"
@@ -215,14 +230,15 @@ def test_expanded_metadata(setup_iv, monkeypatch):
     from pathlib import Path
     from hydrotools._restclient import RestClient
 
-    def requests_mock(*args, **kwargs):
+    def requests_mock(*args, parameters, **kwargs):
         json_text = json.loads(
             (Path(__file__).resolve().parent / "nwis_test_data.json").read_text()
         )
         # key_word_args = {"_json": json_text}
-        return MockRequests(_json=json_text)
+        for idx, _ in enumerate(parameters):
+            yield idx, MockRequests(_json=json_text)
 
-    monkeypatch.setattr(RestClient, "get", requests_mock)
+    monkeypatch.setattr(RestClient, "iter_mget", requests_mock)
 
     data = setup_iv.get_raw(sites="01646500", parameterCd="00060,00065", include_expanded_metadata=True)
     assert data[0]["hucCd"] == "02070008"
@@ -233,14 +249,15 @@ def test_expanded_metadata_columns(setup_iv, monkeypatch):
     from pathlib import Path
     from hydrotools._restclient import RestClient
 
-    def requests_mock(*args, **kwargs):
+    def requests_mock(*args, parameters, **kwargs):
         json_text = json.loads(
             (Path(__file__).resolve().parent / "nwis_test_data.json").read_text()
         )
         # key_word_args = {"_json": json_text}
-        return MockRequests(_json=json_text)
+        for idx, _ in enumerate(parameters):
+            yield idx, MockRequests(_json=json_text)
 
-    monkeypatch.setattr(RestClient, "get", requests_mock)
+    monkeypatch.setattr(RestClient, "iter_mget", requests_mock)
 
     data = setup_iv.get(sites="01646500", parameterCd="00060,00065", include_expanded_metadata=True)
     extra_columns = [
@@ -557,6 +574,67 @@ def test_nwis_client_cache_path(loop):
         service._restclient.close()
 
 
+def test_nwis_client_cache_backend(loop, tmp_path):
+    """verify that a shared cache backend is used in place of the sqlite cache"""
+    from hydrotools._restclient import ShardedSQLiteBackend
+
+    backend = ShardedSQLiteBackend(tmp_path / "cache", n_shards=2)
+    with iv.IVDataService(cache_backend=backend) as service:
+        assert service._restclient._client._cache is backend
+
+
+
+def test_nwis_client_memory_budget(loop):
+    """verify that the memory budget is passed to the rest client"""
+    with iv.IVDataService(enable_cache=False, memory_budget=2**20) as service:
+        assert service._restclient.memory_budget_stats.max_bytes == 2**20
+
+
+def test_nwis_client_hedge_policy(loop):
+    """verify that the hedge policy is passed to the rest client"""
+    from hydrotools._restclient import HedgePolicy
+
+    policy = HedgePolicy()
+    with iv.IVDataService(enable_cache=False, hedge_policy=policy) as service:
+        assert service._restclient.hedge_policy is policy
+        assert service.hedge_stats.hedged == 0
+
+
+def test_nwis_client_timeout_policy(loop):
+    """verify that the timeout policy is passed to the rest client"""
+    from hydrotools._restclient import TimeoutPolicy
+
+    policy = TimeoutPolicy(total=60, batch=600)
+    with iv.IVDataService(enable_cache=False, timeout_policy=policy) as service:
+        assert service._restclient.timeout_policy is policy
+
+
+def test_nwis_client_prefetch(loop, monkeypatch):
+    """verify that prefetch queries are split into requests like `get`"""
+    captured = {}
+
+    def mock_prefetch(self, urls=None, **kwargs):
+        captured.update(kwargs)
+        return "prefetch"
+
+    monkeypatch.setattr(iv.RestClient, "prefetch", mock_prefetch)
+    sites = [str(site).zfill(8) for site in range(21)]
+    with iv.IVDataService(enable_cache=False) as service:
+        handle = service.prefetch(
+            [
+                {"sites": sites, "period": "P1D"},
+                {"stateCd": "AL", "period": "P1D", "include_expanded_metadata": True},
+            ]
+        )
+        assert handle == "prefetch"
+        assert captured["headers"] == service.headers
+        assert captured["parameters"] == (
+            service._build_query_params(sites=sites, period="P1D")
+            + service._build_query_params(stateCd="AL", period="P1D")
+        )
+        assert len(captured["parameters"]) == 3
+
+
 @pytest.mark.slow
 def test_nwis_client_context_manager(loop):
     """verify that context manager closes resources"""
@@ -588,3 +666,127 @@ def test_fixes_209(loop, monkeypatch):
         # warning will be raised to exception if caught
         warnings.simplefilter("error")
         client.get(sites='01646500', startDT="2021-01-01T01:00", endDT="2021-01-01T01:15")
+
+
+async def test_async_iv_data_service_get(monkeypatch):
+    """Verify AsyncIVDataService.get runs in the running event loop and returns a canonical frame"""
+    import json
+    from pathlib import Path
+    from hydrotools._restclient import AsyncRestClient
+
+    class MockAsyncResponse:
+        def json(self):
+            return json.loads(
+                (Path(__file__).resolve().parent / "nwis_test_data.json").read_text()
+            )
+
+    async def iter_mget_mock(*args, parameters, **kwargs):
+        for idx, _ in enumerate(parameters):
+            yield idx, MockAsyncResponse()
+
+    monkeypatch.setattr(AsyncRestClient, "iter_mget", iter_mget_mock)
+
+    async with iv.AsyncIVDataService(enable_cache=False) as service:
+        df = await service.get(sites="01646500", parameterCd="00060,00065")
+
+    assert list(df.columns) == list(iv._create_empty_canonical_df().columns)
+    assert "01646500" in df["usgs_site_code"].values
+
+    # same parsing as synchronous IVDataService
+    raw_data = await service.get_raw(sites="01646500", parameterCd="00060,00065")
+    assert raw_data == iv.IVDataService._handle_deserialized_response(
+        MockAsyncResponse().json()
+    )
+
+
+def test_async_iv_data_service_requires_async_with():
+    with pytest.raises(TypeError):
+        with iv.AsyncIVDataService(enable_cache=False):
+            pass
+
+
+async def test_async_iv_data_service_get_throws_for_kwargs():
+    async with iv.AsyncIVDataService(enable_cache=False) as service:
+        with pytest.raises(RuntimeError):
+            # startDt should be startDT
+            await service.get(sites=["01189000"], startDt="2022-01-01")
+
+
+def test_to_canonical_dataframe(setup_iv):
+    """verify raw data are decoded into sorted, categorical canonical columns"""
+    import copy
+
+    raw_data = [
+        {
+            "usgs_site_code": "02",
+            "variableName": "Streamflow, ft&#179;/s",
+            "measurement_unit": "ft3/s",
+            "values": [
+                {"value": "2.5", "qualifiers": ["P"], "dateTime": "2021-01-01T00:15:00.000-05:00"},
+                {"value": "2", "qualifiers": ["P", "e"], "dateTime": "2021-01-01T00:00:00.000-05:00"},
+            ],
+            "series": 0,
+        },
+        {"usgs_site_code": "03", "values": [], "series": 0},
+        {
+            "usgs_site_code": "01",
+            "variableName": "streamflow",
+            "measurement_unit": "ft3/s",
+            "values": [
+                {"value": "1", "qualifiers": ["A"], "dateTime": "2021-01-01T05:00:00.000+00:00"},
+                {"value": "3", "dateTime": "2021-01-01T05:00:00.000+00:00"},
+            ],
+            "series": 1,
+        },
+    ]
+    original = copy.deepcopy(raw_data)
+
+    df = setup_iv._to_canonical_dataframe(raw_data)
+
+    # raw data are not consumed
+    assert raw_data == original
+    assert (
+        df.dtypes.astype(str).tolist()
+        == iv._create_empty_canonical_df().dtypes.astype(str).tolist()
+    )
+    assert df["usgs_site_code"].tolist() == ["01", "01", "02", "02"]
+    # equal times keep their order
+    assert df["value"].tolist() == [1.0, 3.0, 2.0, 2.5]
+    assert df["value_time"].tolist() == [pd.Timestamp("2021-01-01T05:00")] * 3 + [
+        pd.Timestamp("2021-01-01T05:15")
+    ]
+    assert df["qualifiers"].tolist() == ["['A']", "", "['P', 'e']", "['P']"]
+    assert df["variable_name"].tolist() == ["streamflow"] * 4
+    assert df["series"].tolist() == ["1", "1", "0", "0"]
+    # categories of sites with data, sorted
+    assert df["usgs_site_code"].cat.categories.tolist() == ["01", "02"]
+    assert df["qualifiers"].cat.categories.tolist() == ["", "['A']", "['P', 'e']", "['P']"]
+
+
+def test_to_canonical_dataframe_expanded_metadata(setup_iv):
+    import json
+    from pathlib import Path
+
+    raw_data = setup_iv._handle_deserialized_response(
+        json.loads((Path(__file__).resolve().parent / "nwis_test_data.json").read_text()),
+        include_expanded_metadata=True,
+    )
+    df = setup_iv._to_canonical_dataframe(raw_data, include_expanded_metadata=True)
+
+    site = df[df["usgs_site_code"] == "01646500"]
+    assert len(site) == len(raw_data[0]["values"])
+    assert (site["huc_code"] == "02070008").all()
+    assert (site["site_type_code"] == "ST").all()
+    assert (site["state_code"] == "24").all()
+    assert (site["county_code"] == "24031").all()
+    assert site["latitude"].iloc[0] == pytest.approx(38.94977778)
+    assert df["site_name"].dtype == "category"
+    assert list(df.columns[-7:]) == [
+        "site_type_code",
+        "huc_code",
+        "county_code",
+        "state_code",
+        "site_name",
+        "latitude",
+        "longitude",
+    ]
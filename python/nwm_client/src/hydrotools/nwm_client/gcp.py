@@ -24,7 +24,7 @@ import numpy as np
 import pandas as pd
 from os import cpu_count
 from concurrent.futures import ProcessPoolExecutor
-from typing import Union
+from typing import Tuple, Union
 import numpy.typing as npt
 from pathlib import Path
 from collections.abc import Iterable
@@ -53,7 +53,8 @@ class NWMDataService:
         location_metadata_mapping: pd.DataFrame = None,
         cache_path: Union[str, Path] = "nwm_client.h5",
         cache_group: str = 'nwm_client',
-        unit_system: str = "SI"
+        unit_system: str = "SI",
+        timeout: Union[float, Tuple[float, float], None] = 120.0
         ):
         """Instantiate NWM Data Service.
 
@@ -80,6 +81,9 @@ class NWMDataService:
         unit_system: str, optional, default 'SI'
             The default measurement_unit for NWM streamflow data are cubic meter per second. 
             Setting this option to "US" will convert the units to cubic foot per second.
+        timeout : float or Tuple[float, float], optional, default 120.0
+            Seconds to wait for the server to accept a connection and between bytes
+            of a response, or a (connect, read) tuple. None waits indefinitely.
 
         Returns
         -------
@@ -101,6 +105,9 @@ class NWMDataService:
         # Set bucket name
         self._bucket_name = bucket_name
 
+        # Set request timeout
+        self._timeout = timeout
+
         # Set max processes
         if max_processes:
             self._max_procs = max(max_processes, 1)
@@ -212,7 +219,7 @@ class NWMDataService:
         # Setup anonymous client and retrieve blob data
         client = storage.Client.create_anonymous_client()
         bucket = client.bucket(self.bucket_name)
-        return bucket.blob(blob_name).download_as_bytes(timeout=120)
+        return bucket.blob(blob_name).download_as_bytes(timeout=self.timeout)
 
     def get_Dataset(
         self, 
@@ -475,6 +482,10 @@ class NWMDataService:
     def bucket_name(self) -> str:
         return self._bucket_name
 
+    @property
+    def timeout(self) -> Union[float, Tuple[float, float], None]:
+        return self._timeout
+
     @property
     def cache_path(self) -> Path:
         return self._cache_path
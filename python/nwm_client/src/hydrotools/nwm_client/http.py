@@ -23,9 +23,9 @@ import xarray as xr
 import warnings
 import numpy as np
 import pandas as pd
-from os import cpu_count
+from os import cpu_count, getpid
 from concurrent.futures import ProcessPoolExecutor
-from typing import Union
+from typing import Tuple, Union
 import numpy.typing as npt
 from pathlib import Path
 from collections.abc import Iterable
@@ -38,6 +38,20 @@ _FEATURE_ID_TO_USGS_SITE_MAP_FILES = (
     Path(__file__).resolve().parent / "data/RouteLink_HI.csv",
 )
 
+# Process local requests.Session, reused by get_cycle worker processes so that
+# blobs fetched by a worker share kept alive connections. Keyed by process id
+# because forked workers inherit, but must not share, the parent's session.
+_SESSION = (None, None)
+
+def _session() -> requests.Session:
+    """Return this process's shared requests.Session, creating it on first use."""
+    global _SESSION
+    pid, session = _SESSION
+    if pid != getpid():
+        session = requests.Session()
+        _SESSION = (getpid(), session)
+    return session
+
 class NWMDataService:
     """An HTTP client class for NWM data.
     This NWMDataService class provides various methods for constructing 
@@ -53,7 +67,8 @@ class NWMDataService:
         *,
         location_metadata_mapping: pd.DataFrame = None,
         cache_path: Union[str, Path] = "nwm_client.h5",
-        cache_group: str = 'nwm_client'
+        cache_group: str = 'nwm_client',
+        timeout: Union[float, Tuple[float, float], None] = 120.0
         ):
         """Instantiate NWM Data Service.
 
@@ -80,6 +95,9 @@ class NWMDataService:
             Structure defaults to storing pandas.DataFrames in PyTable format.
             Individual DataFrames can be accessed directly using key patterns 
             that look like '/{cache_group}/{configuration}/DT{reference_time}'
+        timeout : float or Tuple[float, float], optional, default 120.0
+            Seconds to wait for the server to accept a connection and between bytes
+            of a response, or a (connect, read) tuple. None waits indefinitely.
 
         Returns
         -------
@@ -98,6 +116,9 @@ class NWMDataService:
         # Set verification
         self._verify = verify
 
+        # Set request timeout
+        self._timeout = timeout
+
         # Set max processes
         if max_processes:
             self._max_procs = max(max_processes, 1)
@@ -173,9 +194,10 @@ class NWMDataService:
         directory = self.server + prefix
 
         # Get directory listing
-        html_doc = requests.get(
+        html_doc = _session().get(
             directory, 
             verify=self.verify,
+            timeout=self.timeout,
             headers = { 'Accept': 'text/plain' }
             ).text
 
@@ -210,9 +232,10 @@ class NWMDataService:
         
         """
         # Retrieve content
-        return requests.get(
+        return _session().get(
             blob_url, 
-            verify=self.verify
+            verify=self.verify,
+            timeout=self.timeout
             ).content
 
     def get_Dataset(
@@ -474,6 +497,10 @@ class NWMDataService:
     def verify(self) -> str:
         return self._verify
 
+    @property
+    def timeout(self) -> Union[float, Tuple[float, float], None]:
+        return self._timeout
+
     @property
     def cache_path(self) -> Path:
         return self._cache_path
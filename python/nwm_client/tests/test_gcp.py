@@ -19,6 +19,9 @@ def test_unit_systems(setup_gcp, setup_gcp_US):
 def test_bucket_name(setup_gcp):
     assert (setup_gcp.bucket_name) == "national-water-model"
 
+def test_timeout(setup_gcp):
+    assert setup_gcp.timeout == 120.0
+
 def test_max_processes(setup_gcp):
     count = max(cpu_count() - 2, 1)
     assert (setup_gcp.max_processes) == count
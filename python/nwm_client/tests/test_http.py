@@ -17,6 +17,9 @@ def setup_nwm():
 def test_bucket_name(setup_nwm):
     assert (setup_nwm.server) == "https://nomads.ncep.noaa.gov/pub/data/nccf/com/nwm/prod/"
 
+def test_timeout(setup_nwm):
+    assert setup_nwm.timeout == 120.0
+
 def test_max_processes(setup_nwm):
     count = max(cpu_count() - 2, 1)
     assert (setup_nwm.max_processes) == count
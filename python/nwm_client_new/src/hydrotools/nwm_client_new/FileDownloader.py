@@ -13,9 +13,12 @@ import ssl
 import aiohttp
 import aiofiles
 from pathlib import Path
-from typing import List, Tuple, Union
+import shutil
+import time
+from typing import List, Optional, Tuple, Union
 import warnings
 from http import HTTPStatus
+from hydrotools._restclient import HTTPArchive, TimeoutPolicy
 
 class FileDownloader:
     """Provides a convenient interface to download a list of files
@@ -27,7 +30,9 @@ class FileDownloader:
         output_directory: Union[str, Path] = Path("."), 
         create_directory: bool = False,
         ssl_context: ssl.SSLContext = ssl.create_default_context(),
-        limit: int = 10
+        limit: int = 10,
+        archive: Optional[HTTPArchive] = None,
+        timeout_policy: Optional[TimeoutPolicy] = None
         ) -> None:
         """Initialize File Downloader object with specified output directory.
         
@@ -42,6 +47,13 @@ class FileDownloader:
             SSL configuration context.
         limit: int, optional, default 10
             Number of simultaneous connections.
+        archive: hydrotools._restclient.HTTPArchive, optional, default None
+            In record mode, downloaded files are also written to the archive. In
+            replay mode, files are copied from the archive without network access.
+        timeout_policy: hydrotools._restclient.TimeoutPolicy, optional, default None
+            Connect, socket read, and per file time limits, and the time limit of
+            `FileDownloader.get_files`. Defaults to
+            `TimeoutPolicy(total=900)`.
             
         Returns
         -------
@@ -59,6 +71,12 @@ class FileDownloader:
         # Set limit
         self.limit = limit
 
+        # Set record/replay archive
+        self.archive = archive
+
+        # Set time limits
+        self.timeout_policy = timeout_policy or TimeoutPolicy(total=900)
+
     async def get_file(
         self,
         url: str,
@@ -81,23 +99,40 @@ class FileDownloader:
         -------
         None
         """
+        # Construct output file path
+        output_file = self.output_directory / filename
+
+        # Copy recorded file
+        if self.archive is not None and self.archive.replaying:
+            archived = await self.archive.replay("GET", url)
+            if archived.status != HTTPStatus.OK:
+                self._warn_status(archived.status, archived.url)
+                return
+            shutil.copyfile(archived.body_path, output_file)
+            return
+
         # Retrieve a single file
-        async with session.get(url, ssl=self.ssl_context, timeout=900) as response:
+        start = time.perf_counter()
+        async with session.get(
+            url,
+            ssl=self.ssl_context,
+            timeout=self.timeout_policy.client_timeout()
+            ) as response:
             # Warn if unable to locate file
             if response.status != HTTPStatus.OK:
-                status = HTTPStatus(response.status_code)
-                message = (
-                    f"HTTP Status: {status.value}" + 
-                    f" - {status.phrase}" + 
-                    f" - {status.description}\n" + 
-                    f"{response.url}"
-                    )
-                warnings.warn(message, RuntimeWarning)
+                if self.archive is not None:
+                    self.archive.save(
+                        "GET",
+                        url,
+                        status=response.status,
+                        body=await response.read(),
+                        headers=response.headers.items(),
+                        reason=response.reason,
+                        elapsed=time.perf_counter() - start
+                        )
+                self._warn_status(response.status, response.url)
                 return
 
-            # Construct output file path
-            output_file = self.output_directory / filename
-
             # Stream download
             async with aiofiles.open(output_file, 'wb') as fo:
                 while True:
@@ -106,6 +141,30 @@ class FileDownloader:
                         break
                     await fo.write(chunk)
 
+            # Record downloaded file
+            if self.archive is not None:
+                self.archive.save_file(
+                    "GET",
+                    url,
+                    status=response.status,
+                    body_path=output_file,
+                    headers=response.headers.items(),
+                    reason=response.reason,
+                    elapsed=time.perf_counter() - start
+                    )
+
+    @staticmethod
+    def _warn_status(status_code: int, url: str) -> None:
+        """Warn that a file could not be retrieved."""
+        status = HTTPStatus(status_code)
+        message = (
+            f"HTTP Status: {status.value}" + 
+            f" - {status.phrase}" + 
+            f" - {status.description}\n" + 
+            f"{url}"
+            )
+        warnings.warn(message, RuntimeWarning)
+
     async def get_files(self, src_dst_list: List[Tuple[str,str]]) -> None:
         """Asynchronously download multiple files.
         
@@ -119,11 +178,20 @@ class FileDownloader:
         Returns
         -------
         None
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If downloads are outstanding once `TimeoutPolicy.batch` seconds have
+            passed. Outstanding downloads are cancelled.
         """
         # Retrieve each file
         connector = aiohttp.TCPConnector(limit=self.limit)
         async with aiohttp.ClientSession(connector=connector) as session:
-            await asyncio.gather(*[self.get_file(url, filename, session) for url, filename in src_dst_list])
+            await asyncio.wait_for(
+                asyncio.gather(*[self.get_file(url, filename, session) for url, filename in src_dst_list]),
+                timeout=self.timeout_policy.batch
+                )
 
     def get(self, src_dst_list: List[Tuple[str,str]], overwrite: bool = False) -> None:
         """Setup event loop and asynchronously download multiple files. If 
@@ -207,3 +275,19 @@ class FileDownloader:
     @limit.setter
     def limit(self, limit: int) -> None:
         self._limit = limit
+
+    @property
+    def archive(self) -> Optional[HTTPArchive]:
+        return self._archive
+
+    @archive.setter
+    def archive(self, archive: Optional[HTTPArchive]) -> None:
+        self._archive = archive
+
+    @property
+    def timeout_policy(self) -> TimeoutPolicy:
+        return self._timeout_policy
+
+    @timeout_policy.setter
+    def timeout_policy(self, timeout_policy: TimeoutPolicy) -> None:
+        self._timeout_policy = timeout_policy
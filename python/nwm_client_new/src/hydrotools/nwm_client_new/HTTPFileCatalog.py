@@ -16,7 +16,9 @@ import asyncio
 import aiohttp
 import ssl
 from bs4 import BeautifulSoup
-from typing import List
+import time
+from typing import List, Optional
+from hydrotools._restclient import HTTPArchive
 
 class HTTPFileCatalog(NWMFileCatalog):
     """An HTTP client class for NWM data.
@@ -27,7 +29,8 @@ class HTTPFileCatalog(NWMFileCatalog):
     def __init__(
         self,
         server: str,
-        ssl_context: ssl.SSLContext = ssl.create_default_context()
+        ssl_context: ssl.SSLContext = ssl.create_default_context(),
+        archive: Optional[HTTPArchive] = None
         ) -> None:
         """Initialize HTTP File Catalog of NWM data source.
 
@@ -38,6 +41,9 @@ class HTTPFileCatalog(NWMFileCatalog):
             "https://nomads.ncep.noaa.gov/pub/data/nccf/com/nwm/prod/"
         ssl_context : ssl.SSLContext, optional, default context
             SSL configuration context.
+        archive : hydrotools._restclient.HTTPArchive, optional, default None
+            Record directory listings to, or replay directory listings from, a 
+            local archive. Replay requires no network access.
             
         Returns
         -------
@@ -50,10 +56,14 @@ class HTTPFileCatalog(NWMFileCatalog):
         # Setup SSL context
         self.ssl_context = ssl_context
 
+        # Set record/replay archive
+        self.archive = archive
+
     @staticmethod
     async def get_html(
         url: str,
-        ssl_context: ssl.SSLContext = ssl.create_default_context()
+        ssl_context: ssl.SSLContext = ssl.create_default_context(),
+        archive: Optional[HTTPArchive] = None
         ) -> str:
         """Retrieve an HTML document.
 
@@ -63,16 +73,41 @@ class HTTPFileCatalog(NWMFileCatalog):
             Path to HTML document
         ssl_context : ssl.SSLContext, optional, default context
             SSL configuration context.
+        archive : hydrotools._restclient.HTTPArchive, optional, default None
+            Record / replay archive.
 
         Returns
         -------
         HTML document retrieved from url.
         """
+        # Replay recorded document
+        if archive is not None and archive.replaying:
+            archived = await archive.replay("GET", url)
+            html_doc = archived.to_response().text()
+
+            # Raise for no results found
+            if archived.status >= 400:
+                raise FileNotFoundError(html_doc)
+            return html_doc
+
         async with aiohttp.ClientSession() as session:
+            start = time.perf_counter()
             async with session.get(url, ssl=ssl_context) as response:
                 # Get html content
                 html_doc = await response.text()
 
+                # Record document
+                if archive is not None:
+                    archive.save(
+                        "GET",
+                        url,
+                        status=response.status,
+                        body=await response.read(),
+                        headers=response.headers.items(),
+                        reason=response.reason,
+                        elapsed=time.perf_counter() - start
+                        )
+
                 # Raise for no results found
                 if response.status >= 400:
                     raise FileNotFoundError(html_doc)
@@ -116,7 +151,8 @@ class HTTPFileCatalog(NWMFileCatalog):
         directory = self.server + prefix
 
         # Get directory listing
-        html_doc = asyncio.run(self.get_html(directory, self.ssl_context))
+        html_doc = asyncio.run(
+            self.get_html(directory, self.ssl_context, self.archive))
 
         # Parse content
         soup = BeautifulSoup(html_doc, 'html.parser')
@@ -148,4 +184,12 @@ class HTTPFileCatalog(NWMFileCatalog):
 
     @ssl_context.setter
     def ssl_context(self, ssl_context: ssl.SSLContext) -> None:
-        self._ssl_context = ssl_context
\ No newline at end of file
+        self._ssl_context = ssl_context
+
+    @property
+    def archive(self) -> Optional[HTTPArchive]:
+        return self._archive
+
+    @archive.setter
+    def archive(self, archive: Optional[HTTPArchive]) -> None:
+        self._archive = archive
\ No newline at end of file
@@ -10,7 +10,7 @@ NWMFileClient
 """
 
 from .NWMClient import NWMClient, QueryError, StoreNotFoundError
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Optional
 from pathlib import Path
 from .NWMClientDefaults import _NWMClientDefault, MeasurementUnitSystem
 from .ParquetStore import ParquetStore
@@ -21,6 +21,7 @@ import ssl
 import dask.dataframe as dd
 from .FileDownloader import FileDownloader
 from .NWMFileProcessor import NWMFileProcessor
+from hydrotools._restclient import HTTPArchive
 import numpy.typing as npt
 import warnings
 import shutil
@@ -34,7 +35,8 @@ class NWMFileClient(NWMClient):
         location_metadata_mapping: pd.DataFrame = _NWMClientDefault.CROSSWALK,
         ssl_context: ssl.SSLContext = _NWMClientDefault.SSL_CONTEXT,
         cleanup_files: bool = False,
-        unit_system: MeasurementUnitSystem = _NWMClientDefault.UNIT_SYSTEM
+        unit_system: MeasurementUnitSystem = _NWMClientDefault.UNIT_SYSTEM,
+        archive: Optional[HTTPArchive] = None
         ) -> None:
         """Client class for retrieving data as dataframes from a remote 
         file-based source of National Water Model data.
@@ -58,6 +60,10 @@ class NWMFileClient(NWMClient):
             The default measurement_unit for NWM streamflow data are cubic meter per second, 
             meter per second, and meter. Setting this option to MeasurementUnitSystem.US will convert the units 
             to cubic foot per second, foot per second, or foot respectively.
+        archive: hydrotools._restclient.HTTPArchive, optional, default None
+            Record downloaded files to, or replay downloads from, a local archive. 
+            Use with a catalog constructed with the same archive (e.g. 
+            HTTPFileCatalog(server, archive=archive)) to run without network access.
 
         Returns
         -------
@@ -89,6 +95,9 @@ class NWMFileClient(NWMClient):
         # Set unit system
         self.unit_system = unit_system
 
+        # Set record/replay archive
+        self.archive = archive
+
     def get_files(
         self,
         configuration: str,
@@ -137,7 +146,8 @@ class NWMFileClient(NWMClient):
         downloader = FileDownloader(
             output_directory=subdirectory,
             create_directory=True,
-            ssl_context=self.ssl_context
+            ssl_context=self.ssl_context,
+            archive=self.archive
             )
 
         # Download files
@@ -372,3 +382,11 @@ class NWMFileClient(NWMClient):
     @cleanup_files.setter
     def cleanup_files(self, cleanup_files: bool) -> None:
         self._cleanup_files = cleanup_files
+
+    @property
+    def archive(self) -> Optional[HTTPArchive]:
+        return self._archive
+
+    @archive.setter
+    def archive(self, archive: Optional[HTTPArchive]) -> None:
+        self._archive = archive
@@ -1,6 +1,7 @@
 import pytest
 from hydrotools.nwm_client_new.FileDownloader import FileDownloader
 from tempfile import TemporaryDirectory
+from pathlib import Path
 
 def test_parameters():
     with TemporaryDirectory() as td:
@@ -9,6 +10,16 @@ def test_parameters():
         assert not downloader.create_directory
         assert downloader.ssl_context
         assert downloader.limit == 10
+        assert downloader.timeout_policy.total == 900
+
+def test_timeout_policy():
+    from hydrotools._restclient import TimeoutPolicy
+
+    with TemporaryDirectory() as td:
+        policy = TimeoutPolicy(connect=5, sock_read=30, total=None, batch=3600)
+        downloader = FileDownloader(output_directory=td, timeout_policy=policy)
+        assert downloader.timeout_policy is policy
+        assert downloader.timeout_policy.client_timeout().sock_read == 30
 
 @pytest.mark.slow
 def test_get():
@@ -32,3 +43,25 @@ def test_overwrite_warning():
             downloader.get(
                 [("https://pandas.pydata.org/docs/user_guide/index.html","index.html")]
                 )
+
+def test_replay():
+    from hydrotools._restclient import HTTPArchive
+    url = "https://www.fake.gov/nwm.t00z.analysis_assim.channel_rt.tm00.conus.nc"
+
+    with TemporaryDirectory() as td:
+        # Record exchanges
+        archive = HTTPArchive(Path(td) / "archive", mode="record")
+        archive.save("GET", url, status=200, body=b"netcdf")
+        archive.save("GET", url + ".missing", status=404)
+
+        # Replay without network access
+        downloader = FileDownloader(
+            output_directory=Path(td) / "output",
+            create_directory=True,
+            archive=HTTPArchive(archive.path)
+            )
+        with pytest.warns(RuntimeWarning):
+            downloader.get([(url, "a.nc"), (url + ".missing", "b.nc")])
+
+        assert (downloader.output_directory / "a.nc").read_bytes() == b"netcdf"
+        assert not (downloader.output_directory / "b.nc").exists()
@@ -1,4 +1,10 @@
-from hydrotools._restclient import RestClient
+from hydrotools._restclient import (
+    ConnectionPool,
+    HTTPArchive,
+    Instrumentation,
+    RateLimiter,
+    RestClient,
+)
 import pandas as pd
 import geopandas as gpd
 
@@ -7,7 +13,7 @@ from . import url_builders
 from .types import GeographicScale, GeographicContext, Year, utilities, field_name_map
 
 # typing imports
-from typing import Union
+from typing import Optional, Union
 from pathlib import Path
 
 
@@ -16,10 +22,24 @@ class SVIClient:
         self,
         enable_cache: bool = True,
         cache_filename: Union[str, Path] = "svi_client_cache",
+        cache_compression: Optional[str] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        archive: Optional[HTTPArchive] = None,
+        connection_pool: Optional[ConnectionPool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        spill_threshold: Optional[int] = None,
+        background_loop: bool = False,
     ) -> None:
         self._rest_client = RestClient(
             cache_filename=cache_filename,
             enable_cache=enable_cache,
+            cache_compression=cache_compression,
+            instrumentation=instrumentation,
+            archive=archive,
+            connection_pool=connection_pool,
+            rate_limiter=rate_limiter,
+            spill_threshold=spill_threshold,
+            background_loop=background_loop,
         )
 
     def get(